@@ -47,14 +47,104 @@ INSTALLED_APPS = [
 # settings.py
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'CollegeApp.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ]
 }
 
+# Cache xác thực token trong tiến trình (CollegeApp/authentication.py)
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 60,  # giây
+}
+
+# Cache dùng chung: số thế hệ model và response danh mục (CollegeApp/generations.py, catalog.py).
+# LocMem chỉ thuộc một tiến trình; chạy nhiều worker thì dùng Redis/Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'college',
+    }
+}
+
+# Số thế hệ model (CollegeApp/generations.py). Với cache riêng từng tiến trình (LocMem), dữ liệu
+# dẫn xuất (danh mục, đồ thị tiên quyết, autocomplete) cũ tối đa LOCAL_TTL giây ở các worker khác.
+GENERATIONS = {
+    'LOCAL_TTL': 300,  # giây
+}
+
+# API danh mục công khai (CollegeApp/catalog.py)
+CATALOG_API = {
+    'CACHE_TTL': 86400,  # giây
+    'MAX_AGE': 60,  # Cache-Control max-age, giây
+}
+
+# Trang danh sách admin cho bảng lớn (CollegeApp/admin_changelist.py)
+ADMIN_CHANGELIST = {
+    'ESTIMATE_THRESHOLD': 100000,  # không lọc: dùng số dòng ước lượng của bảng từ ngưỡng này
+    'FILTERED_COUNT_LIMIT': 10000,  # có lọc: đếm tối đa chừng này dòng
+    'FILTER_PAGE_SIZE': 20,  # số lựa chọn mỗi trang của bộ lọc quan hệ
+}
+
+# Ghi trễ đăng ký tư vấn công khai qua spool trên đĩa (CollegeApp/ingest.py)
+REGISTRATION_WRITE_BEHIND = {
+    'ENABLED': False,
+    'SPOOL_DIR': BASE_DIR / 'var' / 'registration_spool',
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL': 2.0,  # giây
+    'FSYNC': True,
+    'RECOVER_ON_START': True,
+}
+
+# Tài liệu OpenAPI sinh sẵn theo phiên bản mã nguồn (CollegeApp/openapi.py)
+OPENAPI_SCHEMA = {
+    'CACHE_DIR': BASE_DIR / 'var' / 'openapi',
+    'VERSION': None,  # chuỗi phiên bản khi deploy (vd. mã commit); None = băm mã nguồn
+}
+
+# Đo SQL và thời gian từng request, log request chậm (CollegeApp/profiling.py)
+REQUEST_PROFILING = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 0.05,  # tỉ lệ request được đo chi tiết
+    'SLOW_REQUEST_MS': 500,
+    'DUPLICATE_THRESHOLD': 10,  # số lần một câu SQL lặp lại trong request để coi là N+1
+    'EXPLAIN': True,
+    'LOG_PARAMS': False,  # tham số SQL có token, email, CCCD: chỉ bật khi gỡ lỗi cục bộ
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'plain'},
+    },
+    'loggers': {
+        'CollegeApp': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Xuất CSV/XLSX dạng luồng (CollegeApp/exports.py)
+EXPORTS = {
+    'CHUNK_SIZE': 2000,  # số dòng mỗi truy vấn keyset
+}
+
+# Phát hiện đăng ký tư vấn trùng (CollegeApp/dedup.py)
+REGISTRATION_DEDUP = {
+    'ENABLED': True,
+    'WINDOW_DAYS': 30,
+    'POLICY': 'merge',  # 'merge' hoặc 'flag'
+    'BLOOM_CAPACITY': 200000,
+    'BLOOM_ERROR_RATE': 0.01,
+    'REBUILD_INTERVAL': 600,  # giây
+}
+
 MIDDLEWARE = [
+    'CollegeApp.profiling.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -122,6 +212,11 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Băm mật khẩu mặc định trong pool tiến trình (CollegeApp/hashing.py)
+# None = số lõi CPU, 0 = băm ngay trong tiến trình xử lý request
+PASSWORD_HASHING_WORKERS = None
+PASSWORD_HASHING_BATCH_SIZE = 16
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -140,6 +235,23 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Ảnh người dùng / thư viện ảnh (User.user_photo, Image.image_file lưu đường dẫn trong MEDIA_ROOT)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Ảnh thu nhỏ (CollegeApp/thumbnails.py)
+THUMBNAILS = {
+    'CACHE_DIR': MEDIA_ROOT / 'thumbs',
+    'WORKERS': None,  # None = số lõi CPU, 0 = tạo ngay trong tiến trình xử lý request
+    'VARIANTS': {
+        'small': (50, 50, 'crop'),
+        'medium': (320, 320, 'fit'),
+        'large': (1024, 1024, 'fit'),
+    },
+    'FORMAT': 'JPEG',
+    'QUALITY': 82,
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
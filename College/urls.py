@@ -14,22 +14,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include, re_path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
 from CollegeApp.admin import admin_site
+from CollegeApp.openapi import precomputed_schema_view
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="College API",
-        default_version='v1',
-        description="APIs for CollegeApp",
-        contact=openapi.Contact(email="https://sgc.edu.vn/"),
-        license=openapi.License(name="Cao Đẳng Sài Gòn Gia Định@2004"),
-    ),
+# Schema sinh một lần cho mỗi phiên bản mã nguồn và phục vụ từ bộ nhớ (CollegeApp/openapi.py)
+schema_view = precomputed_schema_view(
     public=True,
     permission_classes=(permissions.AllowAny,),
 )
@@ -38,12 +33,16 @@ urlpatterns = [
     path('admin/', admin_site.urls),
     path('', include('CollegeApp.urls')),
     re_path(r'^swagger(?P<format>\.json|\.yaml)$',
-            schema_view.without_ui(cache_timeout=0),
+            schema_view.without_ui(),
             name='schema-json'),
     re_path(r'^swagger/$',
-            schema_view.with_ui('swagger', cache_timeout=0),
+            schema_view.with_ui('swagger'),
             name='schema-swagger-ui'),
     re_path(r'^redoc/$',
-            schema_view.with_ui('redoc', cache_timeout=0),
+            schema_view.with_ui('redoc'),
             name='schema-redoc'),
 ]
+
+if settings.DEBUG:
+    # Máy chủ web phục vụ MEDIA_ROOT khi chạy thật
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -5,16 +5,53 @@ from django.utils.html import format_html  # Import format_html
 from .models import *
 from django import forms
 from django.urls import path
+from .admin_autocomplete import CachedAutocompleteJsonView
+from .admin_changelist import ScalableModelAdmin
+from .curriculum import check_prerequisite_links
+from .exports import REGISTRATION_COLUMNS, STUDENT_COLUMNS, export_response
+from .search import search_users
+from .thumbnails import thumbnail_url
 
 
 class CollegeAdminSite(admin.AdminSite):
     site_header = 'CollegeAdminSite'
 
+    def register(self, model_or_iterable, admin_class=None, **options):
+        # Model đăng ký không kèm ModelAdmin cũng có changelist cho bảng lớn (admin_changelist.py)
+        super().register(model_or_iterable, admin_class or ScalableModelAdmin, **options)
+
+    def autocomplete_view(self, request):
+        return CachedAutocompleteJsonView.as_view(admin_site=self)(request)
+
 
 admin_site = CollegeAdminSite(name='CollegeAdminSite')
 
 
-class UserAdmin(admin.ModelAdmin):
+class SearchIndexAdminMixin:
+    """Ô tìm kiếm dùng chỉ mục UserSearchToken (không phân biệt dấu) thay cho LIKE '%...%'."""
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_users(search_term, queryset), False
+
+
+class ExportActionsMixin:
+    """Xuất các dòng đã chọn (hoặc mọi kết quả lọc) ra CSV/XLSX dạng luồng (exports.py)."""
+    export_columns = ()
+    export_name = 'export'
+    actions = ['export_csv', 'export_xlsx']
+
+    @admin.action(description="Xuất CSV các dòng đã chọn")
+    def export_csv(self, request, queryset):
+        return export_response(queryset, self.export_columns, 'csv', self.export_name)
+
+    @admin.action(description="Xuất Excel (XLSX) các dòng đã chọn")
+    def export_xlsx(self, request, queryset):
+        return export_response(queryset, self.export_columns, 'xlsx', self.export_name)
+
+
+class UserAdmin(SearchIndexAdminMixin, ScalableModelAdmin):
     list_display = [
         'first_name', 'last_name', 'email', 'role',
         'is_active', 'phone', 'gender', 'display_user_photo'  # Thêm phương thức display_user_photo
@@ -26,10 +63,10 @@ class UserAdmin(admin.ModelAdmin):
     # Phương thức để hiển thị ảnh thumbnail
     def display_user_photo(self, obj):
         if obj.user_photo:
-            # Giả sử user_photo lưu URL đầy đủ hoặc đường dẫn tương đối mà STATIC_URL/MEDIA_URL có thể xử lý
+            # Biến thể 50x50 thay vì ảnh gốc (thumbnails.py)
             return format_html(
                 '<img src="{}" style="width: 50px; height: 50px; object-fit: cover; border-radius: 5px;" />',
-                obj.user_photo)
+                thumbnail_url(obj.user_photo, 'small'))
         return "Không có ảnh"
 
     # Đặt tên cột hiển thị cho phương thức
@@ -43,28 +80,32 @@ class UserAdmin(admin.ModelAdmin):
 
 
 
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(ExportActionsMixin, SearchIndexAdminMixin, ScalableModelAdmin):
     list_display = ['student_code', 'first_name', 'last_name', 'major', 'academic_year',
                     'student_status']
     search_fields = ['student_code', 'first_name', 'last_name', 'national_id_card']
     list_filter = ['student_status', 'major', 'academic_year', 'department']
+    autocomplete_fields = ['program', 'major', 'academic_year', 'department', 'student_class']
+    export_columns = STUDENT_COLUMNS
+    export_name = 'sinh-vien'
 
     class Meta:
         model = Student
         fields = '__all__'
 
 
-class FacultyAdmin(admin.ModelAdmin):  # Thêm FacultyAdmin
+class FacultyAdmin(SearchIndexAdminMixin, ScalableModelAdmin):  # Thêm FacultyAdmin
     list_display = ['faculty_code', 'first_name', 'last_name', 'type', 'department', 'position']
     search_fields = ['faculty_code', 'first_name', 'last_name', 'national_id_card']
     list_filter = ['type', 'department', 'is_department_head']
+    autocomplete_fields = ['department']
 
     class Meta:
         model = Faculty
         fields = '__all__'
 
 
-class AdminModelAdmin(admin.ModelAdmin):  # Đổi tên để tránh trùng với model Admin
+class AdminModelAdmin(SearchIndexAdminMixin, ScalableModelAdmin):  # Đổi tên để tránh trùng với model Admin
     list_display = ['admin_code', 'first_name', 'last_name', 'email']
     search_fields = ['admin_code', 'first_name', 'last_name', 'email']
     readonly_fields = ['date_joined']  # Admin có thể tự chỉnh sửa các thông tin khác
@@ -74,14 +115,40 @@ class AdminModelAdmin(admin.ModelAdmin):  # Đổi tên để tránh trùng vớ
         fields = '__all__'
 
 
-class MajorAdmin(admin.ModelAdmin):  # Đổi tên để tránh trùng với model Admin
+class MajorAdmin(ScalableModelAdmin):  # Đổi tên để tránh trùng với model Admin
     list_display = ['name', 'code', 'department']
+    search_fields = ['^name', '^code']
+    autocomplete_fields = ['department', 'program', 'album']
 
     class Meta:
         model = Major
         fields = '__all__'
 
 
+class CourseAdminForm(forms.ModelForm):
+    class Meta:
+        model = Course
+        fields = '__all__'
+
+    def clean_prerequisites(self):
+        prerequisites = self.cleaned_data['prerequisites']
+        if self.instance.pk is not None:
+            check_prerequisite_links([(self.instance.pk, course.pk) for course in prerequisites])
+        return prerequisites
+
+
+class CourseAdmin(ScalableModelAdmin):
+    form = CourseAdminForm
+    list_display = ['course_code', 'title', 'credits', 'course_type', 'department']
+    search_fields = ['^course_code', '^title']
+    # Ô chọn tìm kiếm thay cho <select> chứa toàn bộ giảng viên / môn học / ngành
+    autocomplete_fields = ['department', 'lecturers', 'prerequisites', 'major']
+
+    class Meta:
+        model = Course
+        fields = '__all__'
+
+
 # Đăng ký các model với admin_site của bạn
 admin_site.register(User, UserAdmin)
 admin_site.register(Student, StudentAdmin)
@@ -89,15 +156,76 @@ admin_site.register(Faculty, FacultyAdmin)  # Đăng ký FacultyAdmin
 admin_site.register(Admin, AdminModelAdmin)  # Đăng ký AdminModelAdmin
 
 # Đăng ký các model khác (nếu cần)
-admin_site.register(Album)
-admin_site.register(Image)
-admin_site.register(Department)
-admin_site.register(Program)
+admin_site.register(Album, search_fields=['^title'])
+admin_site.register(Department, search_fields=['^name', '^code'])
+admin_site.register(Program, search_fields=['^code', '^name'])
 admin_site.register(AdmissionRequirement)
 admin_site.register(AdmissionMethod)
 admin_site.register(Major, MajorAdmin)
-admin_site.register(Course)
-admin_site.register(AcademicYear)
-admin_site.register(Class)
+admin_site.register(Course, CourseAdmin)
+admin_site.register(AcademicYear, search_fields=['^name'])
+admin_site.register(Class, search_fields=['^class_name'])
 admin_site.register(Semester)
-admin_site.register(CourseOffering)
\ No newline at end of file
+admin_site.register(CourseOffering)
+admin_site.register(Room)
+
+
+class GradeAdmin(ScalableModelAdmin):
+    list_display = ['student', 'offering', 'score', 'letter', 'grade_point', 'credits', 'updated_at']
+    list_select_related = ['student', 'offering__course', 'offering__semester__academic_year']
+    raw_id_fields = ['student', 'offering']
+    readonly_fields = ['letter', 'grade_point', 'credits']
+
+
+admin_site.register(Grade, GradeAdmin)
+
+
+class ImageAdmin(ScalableModelAdmin):
+    list_display = ['title', 'display_thumbnail', 'uploaded_at']
+    search_fields = ['title', 'image_file']
+
+    def display_thumbnail(self, obj):
+        if obj.image_file:
+            return format_html('<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />',
+                               thumbnail_url(obj.image_file, 'small'))
+        return "Không có ảnh"
+
+    display_thumbnail.short_description = 'Ảnh'
+
+
+admin_site.register(Image, ImageAdmin)
+
+
+class StudentDirectoryEntryAdmin(ScalableModelAdmin):
+    """Danh bạ chỉ đọc: lọc và tìm trên bảng phẳng, không JOIN (directory.py)."""
+    list_display = ['student_code', 'last_name', 'first_name', 'email', 'major_name', 'academic_year_name',
+                    'student_class_name', 'student_status']
+    list_filter = ['student_status', 'is_active']
+    search_fields = ['=student_code', '^last_name', '^email']
+    ordering = ['student_code']
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+admin_site.register(StudentDirectoryEntry, StudentDirectoryEntryAdmin)
+
+
+class AdvisoryRegistrationAdmin(ExportActionsMixin, ScalableModelAdmin):
+    list_display = ['full_name', 'phone_number', 'email', 'major_of_interest', 'has_graduated', 'status',
+                    'registration_date']
+    list_filter = ['status', 'has_graduated', 'major_of_interest']
+    search_fields = ['^phone_number', '^email', '^full_name']
+    readonly_fields = ['registration_date', 'submission_count', 'last_submitted_at', 'duplicate_of']
+    export_columns = REGISTRATION_COLUMNS
+    export_name = 'dang-ky-tu-van'
+
+
+admin_site.register(AdvisoryRegistration, AdvisoryRegistrationAdmin)
@@ -0,0 +1,52 @@
+# CollegeApp/admin_autocomplete.py
+"""
+Endpoint autocomplete của CollegeAdminSite (ô chọn khóa ngoại / M2M trong form
+admin khai báo bằng autocomplete_fields).
+
+Khác AutocompleteJsonView mặc định của Django:
+  - mỗi trang lấy paginate_by + 1 dòng để biết còn trang sau, không COUNT(*);
+  - kết quả được cache theo (trường nguồn, từ khóa, trang, số thế hệ của model
+    đích - generations.py), nên lần gõ lặp lại không chạm DB và mọi thay đổi của
+    model đích làm cache cũ hết hiệu lực.
+Quyền xem vẫn được kiểm tra ở mỗi yêu cầu trước khi đọc cache. ModelAdmin của
+model đích nên dùng search_fields tiền tố ('^name') trên cột có index.
+"""
+import hashlib
+
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+
+from .generations import get_generation
+
+CACHE_TTL = 3600
+
+
+class CachedAutocompleteJsonView(AutocompleteJsonView):
+    def get(self, request, *args, **kwargs):
+        self.term, self.model_admin, self.source_field, to_field_name = self.process_request(request)
+        if not self.has_perm(request):
+            raise PermissionDenied
+        try:
+            page = max(1, int(request.GET.get('page') or 1))
+        except ValueError:
+            page = 1
+
+        model = self.model_admin.model
+        raw = repr((self.source_field.model._meta.label_lower, self.source_field.name, to_field_name,
+                    self.term, page, get_generation(model)))
+        key = f'admin-autocomplete:{model._meta.label_lower}:{hashlib.sha1(raw.encode()).hexdigest()}'
+        data = cache.get(key)
+        if data is None:
+            queryset = self.get_queryset()
+            if not queryset.ordered:
+                queryset = queryset.order_by('pk')
+            start = (page - 1) * self.paginate_by
+            rows = list(queryset[start:start + self.paginate_by + 1])
+            data = {
+                'results': [self.serialize_result(obj, to_field_name) for obj in rows[:self.paginate_by]],
+                'pagination': {'more': len(rows) > self.paginate_by},
+            }
+            cache.set(key, data, CACHE_TTL)
+        return JsonResponse(data)
@@ -0,0 +1,247 @@
+# CollegeApp/admin_changelist.py
+"""
+Trang danh sách (changelist) của admin cho bảng lớn.
+
+  - ScalableModelAdmin: tự select_related các cột khóa ngoại trong list_display,
+    prefetch các quan hệ khai báo trong list_prefetch_related (sau khi cắt trang),
+    không đếm toàn bảng lần hai (show_full_result_count = False) và thay bộ lọc
+    quan hệ mặc định bằng PaginatedRelatedFieldListFilter.
+  - EstimatedCountPaginator: khi không lọc, số dòng lấy từ thống kê của bảng
+    (information_schema.TABLES / pg_class) nếu vượt ESTIMATE_THRESHOLD; khi có lọc,
+    chỉ đếm tối đa FILTERED_COUNT_LIMIT dòng. Các số này chỉ để hiển thị ("≈N",
+    "N+"); trang hiện tại được đọc thêm một dòng (LIMIT + 1) để biết còn trang sau,
+    nên mọi trang vẫn tới được dù số ước lượng thấp hơn thực tế.
+  - PaginatedRelatedFieldListFilter: thanh lọc chỉ nạp một trang lựa chọn, có ô tìm
+    theo tiền tố trên cột đã đánh index, thay vì nạp cả bảng liên quan.
+
+Cấu hình trong settings:
+    ADMIN_CHANGELIST = {
+        'ESTIMATE_THRESHOLD': 100000,
+        'FILTERED_COUNT_LIMIT': 10000,
+        'FILTER_PAGE_SIZE': 20,
+    }
+"""
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.main import PAGE_VAR
+from django.contrib.auth.models import Permission
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections, models
+from django.utils.functional import cached_property
+
+
+def get_config():
+    config = {
+        'ESTIMATE_THRESHOLD': 100000,
+        'FILTERED_COUNT_LIMIT': 10000,
+        'FILTER_PAGE_SIZE': 20,
+    }
+    config.update(getattr(settings, 'ADMIN_CHANGELIST', {}))
+    return config
+
+
+def estimated_row_count(model, using='default'):
+    """Số dòng ước lượng từ thống kê của cơ sở dữ liệu; None nếu backend không có."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute("SELECT TABLE_ROWS FROM information_schema.TABLES "
+                           "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", [table])
+        elif connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    `count` = max(số ước lượng / giới hạn, số dòng chắc chắn có tới hết trang hiện tại
+    cộng một dòng của trang sau). ScalableModelAdmin.get_paginator gán current_page.
+    """
+    current_page = 1
+
+    @cached_property
+    def _current_rows(self):
+        # Trang hiện tại thêm một dòng: có dòng thừa nghĩa là còn trang sau
+        bottom = (self.current_page - 1) * self.per_page
+        return list(self.object_list[bottom:bottom + self.per_page + 1])
+
+    @cached_property
+    def _counted(self):
+        """(số dòng, kiểu): kiểu là 'exact', 'estimate' hoặc 'at_least'."""
+        queryset = self.object_list
+        if not isinstance(queryset, models.QuerySet):
+            return super().count, 'exact'
+        config = get_config()
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, using=queryset.db)
+            if estimate is not None and estimate >= config['ESTIMATE_THRESHOLD']:
+                return estimate, 'estimate'
+            return queryset.count(), 'exact'
+        # Có lọc: COUNT trên truy vấn con có LIMIT, dừng sớm khi quá nhiều kết quả
+        limit = config['FILTERED_COUNT_LIMIT']
+        count = queryset.order_by()[:limit].count()
+        return count, 'at_least' if count >= limit else 'exact'
+
+    @cached_property
+    def _resolved(self):
+        count, kind = self._counted
+        if kind == 'exact' or not isinstance(self.object_list, models.QuerySet):
+            return count, kind
+        bottom = (self.current_page - 1) * self.per_page
+        rows = len(self._current_rows)
+        if rows > self.per_page:
+            reached = bottom + rows  # còn ít nhất một dòng ở trang sau
+            return (reached, 'at_least') if reached > count else (count, kind)
+        if rows or self.current_page == 1:
+            return bottom + rows, 'exact'  # trang cuối: biết chính xác số dòng
+        return min(count, bottom), kind  # trang vượt quá dữ liệu: không hợp lệ
+
+    @property
+    def count(self):
+        return self._resolved[0]
+
+    @property
+    def display_count(self):
+        """Số dòng để hiển thị: '1234', '≈1234' hoặc '10000+'."""
+        count, kind = self._resolved
+        return {'exact': '{}', 'estimate': '≈{}', 'at_least': '{}+'}[kind].format(count)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if number == self.current_page and isinstance(self.object_list, models.QuerySet):
+            return self._get_page(self._current_rows[:self.per_page], number, self)
+        return super().page(number)
+
+
+class PaginatedRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    """
+    Bộ lọc khóa ngoại / M2M chỉ hiển thị FILTER_PAGE_SIZE lựa chọn mỗi trang. Ô tìm
+    kiếm lọc theo tiền tố trên `search_field` của model liên quan: thuộc tính
+    `admin_filter_search_field` của model nếu có, nếu không là cột đầu tiên trong
+    Meta.ordering.
+    """
+    template = 'admin/college/paginated_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.search_param = f'{field_path}__filter_q'
+        self.page_param = f'{field_path}__filter_page'
+        self.search_value = str(params.get(self.search_param) or '').strip()
+        try:
+            self.page = max(1, int(params.get(self.page_param) or 1))
+        except (TypeError, ValueError):
+            self.page = 1
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def expected_parameters(self):
+        return super().expected_parameters() + [self.search_param, self.page_param]
+
+    @staticmethod
+    def search_field(related_model):
+        name = getattr(related_model, 'admin_filter_search_field', None)
+        if name is None:
+            ordering = [item.lstrip('-') for item in related_model._meta.ordering if isinstance(item, str)]
+            name = ordering[0] if ordering else None
+        if name is not None and isinstance(related_model._meta.get_field(name), models.CharField):
+            return name
+        return None
+
+    def field_choices(self, field, request, model_admin):
+        related_model = field.remote_field.model
+        search_field = self.search_field(related_model)
+        queryset = related_model._default_manager.all()
+        if search_field:
+            queryset = queryset.order_by(search_field, 'pk')
+            if self.search_value:
+                queryset = queryset.filter(**{f'{search_field}__istartswith': self.search_value})
+        else:
+            queryset = queryset.order_by('pk')
+        page_size = get_config()['FILTER_PAGE_SIZE']
+        start = (self.page - 1) * page_size
+        objects = list(queryset[start:start + page_size + 1])
+        self.has_more = len(objects) > page_size
+        self.searchable = search_field is not None
+        choices = [(obj.pk, str(obj)) for obj in objects[:page_size]]
+        # Lựa chọn đang áp dụng luôn được hiển thị dù không nằm trong trang
+        if self.lookup_val and all(str(pk) != str(self.lookup_val) for pk, _ in choices):
+            selected = related_model._default_manager.filter(pk=self.lookup_val).first()
+            if selected is not None:
+                choices.insert(0, (selected.pk, str(selected)))
+        return choices
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        self.used_parameters.pop(self.search_param, None)
+        self.used_parameters.pop(self.page_param, None)
+        return super().queryset(request, queryset)
+
+    def choices(self, changelist):
+        # Tham số hiện tại của trang để ô tìm kiếm giữ nguyên các bộ lọc khác
+        self.form_params = [(key, value) for key, value in changelist.params.items()
+                            if key not in (self.search_param, self.page_param, 'p')]
+        self.more_query_string = (changelist.get_query_string({self.page_param: self.page + 1})
+                                  if self.has_more else None)
+        self.previous_query_string = (changelist.get_query_string({self.page_param: self.page - 1})
+                                      if self.page > 1 else None)
+        yield from super().choices(changelist)
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """ModelAdmin mặc định của CollegeAdminSite (xem đầu module)."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_prefetch_related = ()
+    change_list_template = 'admin/college/change_list.html'  # số dòng hiển thị "≈N" / "N+"
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        paginator = super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+        if isinstance(paginator, EstimatedCountPaginator):
+            try:
+                paginator.current_page = max(1, int(request.GET.get(PAGE_VAR, 1)))
+            except ValueError:
+                pass
+        return paginator
+
+    def get_list_select_related(self, request):
+        if self.list_select_related:
+            return self.list_select_related
+        related = []
+        for name in self.get_list_display(request):
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_one or field.one_to_one:
+                related.append(name)
+        return related or False
+
+    def get_list_filter(self, request):
+        filters = []
+        for item in super().get_list_filter(request):
+            if isinstance(item, str):
+                try:
+                    field = self.model._meta.get_field(item)
+                except FieldDoesNotExist:
+                    field = None
+                if field is not None and field.is_relation and not field.auto_created:
+                    item = (item, PaginatedRelatedFieldListFilter)
+            filters.append(item)
+        return filters
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.list_prefetch_related:
+            queryset = queryset.prefetch_related(*self.list_prefetch_related)
+        return queryset
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        # user_permissions của các model kế thừa User: str(permission) cần content_type
+        if db_field.remote_field.model is Permission and 'queryset' not in kwargs:
+            kwargs['queryset'] = Permission.objects.select_related('content_type')
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
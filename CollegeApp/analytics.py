@@ -0,0 +1,114 @@
+# CollegeApp/analytics.py
+"""
+Thống kê học lực theo nhóm sinh viên (ngành, niên khóa, khoa) bằng NumPy.
+
+Một truy vấn values_list lấy hai cột (id nhóm, GPA) của mọi sinh viên cần thống
+kê; mảng kết quả được gom nhóm bằng np.unique / np.bincount nên không có vòng lặp
+Python trên từng sinh viên. Với mỗi nhóm tính: số sinh viên theo xếp loại
+(STANDING_THRESHOLDS), GPA trung bình, các phân vị và histogram GPA.
+"""
+import numpy as np
+from django.core.cache import cache
+from django.db.models import FloatField, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from .grading import NO_GPA_STANDING, STANDING_THRESHOLDS
+from .models import AcademicYear, Department, Major, Student
+
+GROUPS = {
+    'major': ('major_id', Major, 'name'),
+    'academic_year': ('academic_year_id', AcademicYear, 'name'),
+    'department': ('department_id', Department, 'name'),
+}
+PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_EDGES = np.linspace(0.0, 4.0, 17)  # 16 khoảng rộng 0.25
+CACHE_TTL = 300
+NO_GPA = -1.0
+
+# Nhãn theo thứ tự của STANDING_THRESHOLDS (cao xuống thấp); np.digitize cần ngưỡng tăng dần
+STANDING_LABELS = [label for _, label in STANDING_THRESHOLDS] + [NO_GPA_STANDING]
+_BINS = np.array(sorted(minimum for minimum, _ in STANDING_THRESHOLDS)[1:])
+
+
+def load_columns(group_by, student_status=None):
+    """(mảng id nhóm int64, mảng GPA float64 với NaN khi chưa có GPA) trong một truy vấn."""
+    field = GROUPS[group_by][0]
+    students = Student.objects.all()
+    if student_status:
+        students = students.filter(student_status__in=student_status)
+    rows = list(students.order_by()
+                .annotate(gpa_value=Coalesce(Cast('GPA', FloatField()), Value(NO_GPA)))
+                .values_list(field, 'gpa_value'))
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    data = np.array(rows, dtype=np.float64)
+    gpa = data[:, 1]
+    gpa[gpa < 0] = np.nan
+    return data[:, 0].astype(np.int64), gpa
+
+
+def standing_report(keys, gpa):
+    """Thống kê theo nhóm từ hai mảng cùng độ dài. Trả về {id nhóm: {...}}."""
+    if keys.size == 0:
+        return {}
+    groups, inverse = np.unique(keys, return_inverse=True)
+    group_count = groups.size
+    has_gpa = ~np.isnan(gpa)
+
+    # Xếp loại: chỉ số ngưỡng, sinh viên chưa có GPA vào cột cuối
+    buckets = np.full(gpa.shape, len(STANDING_LABELS) - 1, dtype=np.int64)
+    buckets[has_gpa] = _BINS.size - np.digitize(gpa[has_gpa], _BINS)
+    standing = np.bincount(inverse * len(STANDING_LABELS) + buckets,
+                           minlength=group_count * len(STANDING_LABELS)).reshape(group_count, -1)
+
+    totals = np.bincount(inverse, minlength=group_count)
+    graded = np.bincount(inverse[has_gpa], minlength=group_count)
+    sums = np.bincount(inverse[has_gpa], weights=gpa[has_gpa], minlength=group_count)
+    means = np.divide(sums, graded, out=np.full(group_count, np.nan), where=graded > 0)
+
+    bins = np.clip(np.digitize(gpa[has_gpa], HISTOGRAM_EDGES[1:-1]), 0, HISTOGRAM_EDGES.size - 2)
+    histogram = np.bincount(inverse[has_gpa] * (HISTOGRAM_EDGES.size - 1) + bins,
+                            minlength=group_count * (HISTOGRAM_EDGES.size - 1)).reshape(group_count, -1)
+
+    # Phân vị: sắp theo (nhóm, GPA) một lần rồi cắt theo từng nhóm
+    order = np.lexsort((gpa[has_gpa], inverse[has_gpa]))
+    sorted_gpa = gpa[has_gpa][order]
+    offsets = np.concatenate(([0], np.cumsum(graded)))
+
+    report = {}
+    for index, group_id in enumerate(groups.tolist()):
+        values = sorted_gpa[offsets[index]:offsets[index + 1]]
+        report[group_id] = {
+            'students': int(totals[index]),
+            'with_gpa': int(graded[index]),
+            'mean_gpa': None if np.isnan(means[index]) else round(float(means[index]), 3),
+            'percentiles': ({str(p): round(float(v), 3) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+                            if values.size else {}),
+            'standing': {label: int(count) for label, count in zip(STANDING_LABELS, standing[index])},
+            'histogram': histogram[index].tolist(),
+        }
+    return report
+
+
+def standing_by_group(group_by, student_status=None):
+    """Báo cáo đầy đủ (kèm tên nhóm), được cache CACHE_TTL giây."""
+    key = f"analytics:standing:{group_by}:{','.join(sorted(student_status or []))}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    keys, gpa = load_columns(group_by, student_status)
+    report = standing_report(keys, gpa)
+    _, model, name_field = GROUPS[group_by]
+    names = dict(model.objects.filter(pk__in=list(report)).values_list('pk', name_field))
+    result = {
+        'group_by': group_by,
+        'generated_at': timezone.now().isoformat(),
+        'histogram_edges': [round(float(edge), 2) for edge in HISTOGRAM_EDGES],
+        'standing_labels': STANDING_LABELS,
+        'overall': standing_report(np.zeros_like(keys), gpa).get(0, {}),
+        'groups': [dict(id=group_id, name=names.get(group_id), **stats) for group_id, stats in report.items()],
+    }
+    cache.set(key, result, CACHE_TTL)
+    return result
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CollegeappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'CollegeApp'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401  (đăng ký system check và các receiver)
@@ -0,0 +1,115 @@
+# CollegeApp/authentication.py
+"""
+TokenAuthentication có bộ nhớ đệm LRU trong tiến trình.
+
+Mỗi request có token vốn phải JOIN authtoken_token với bảng User. Ở đây kết quả
+được giữ trong một LRU theo token, có TTL và giới hạn kích thước. Mục trong cache
+bị xóa khi User được lưu (đổi mật khẩu, khóa tài khoản...) hoặc Token bị xóa
+(xem signals.py). Thay đổi bằng queryset.update() hoặc từ tiến trình khác không
+phát signal tới đây nên chỉ hết hiệu lực sau TTL.
+
+Cấu hình trong settings:
+    TOKEN_AUTH_CACHE = {'MAX_SIZE': 10000, 'TTL': 60}
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (hết hạn lúc, user, token)
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, user, token = entry
+            if expires <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user, token
+
+    def set(self, key, user, token):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, user, token)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, user, _ = self._entries.pop(key)
+        keys = self._keys_by_user.get(user.pk)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user.pk]
+
+    def invalidate_key(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                self.invalidations += 1
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+_config = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+token_cache = TokenCache(max_size=_config.get('MAX_SIZE', 10000), ttl=_config.get('TTL', 60))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            # Token sai hoặc tài khoản bị khóa vẫn ném AuthenticationFailed như cũ
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user, token)
+        else:
+            user, token = cached
+        # Mỗi request nhận bản sao riêng, không sửa chung đối tượng trong cache
+        return copy.copy(user), token
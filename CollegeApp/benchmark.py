@@ -0,0 +1,349 @@
+# CollegeApp/benchmark.py
+"""
+Benchmark các API chính trên dữ liệu giả lập của seeding.py (lệnh bench_api).
+
+Mỗi kịch bản trong SCENARIOS dựng một request từ dữ liệu chuẩn bị sẵn (Fixtures:
+token, email, id đăng ký...) và random.Random riêng của từng luồng, nên cùng seed
+cho cùng chuỗi request. Request được gửi qua một trong hai transport:
+  - InProcessTransport: django.test.Client ngay trong tiến trình, đi qua đủ
+    middleware; số câu SQL mỗi request đếm bằng connection.execute_wrapper;
+  - HttpTransport: HTTP thật tới server đang chạy (runserver, gunicorn...); số câu
+    SQL đọc từ header Server-Timing của profiling.py nếu request được lấy mẫu.
+Kết quả (p50/p95/p99, thông lượng, lỗi, số câu SQL) được ghi thành JSON kèm commit,
+cơ sở dữ liệu và quy mô dữ liệu để so sánh giữa các commit (compare()).
+"""
+import datetime
+import itertools
+import json
+import platform
+import random
+import re
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from . import seeding
+from .models import AdvisoryRegistration, Class, Major, Program, Student, User
+
+TOKEN_SAMPLE = 200  # số sinh viên được cấp sẵn token (kịch bản đổi mật khẩu)
+ID_SAMPLE = 2000  # số đăng ký tư vấn dùng cho kịch bản xem chi tiết
+_QUERIES_DESC = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class InProcessTransport:
+    name = 'in-process'
+
+    def __init__(self, host='localhost'):
+        self.host = host
+        self._local = threading.local()
+
+    def request(self, method, path, data=None, token=None):
+        """(mã trạng thái, số câu SQL) của một request."""
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client(SERVER_NAME=self.host)
+        extra = {'HTTP_AUTHORIZATION': f'Token {token}'} if token else {}
+        count = 0
+
+        def counter(execute, sql, params, many, context):
+            nonlocal count
+            count += 1
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(counter))
+            response = client.generic(method, path, json.dumps(data) if data is not None else '',
+                                      content_type='application/json', **extra)
+        return response.status_code, count
+
+    def close(self):
+        # Mỗi luồng mở kết nối cơ sở dữ liệu riêng
+        connection.close()
+
+
+class HttpTransport:
+    name = 'http'
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method, path, data=None, token=None):
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(f'{self.base_url}{path}', data=body, method=method)
+        request.add_header('Content-Type', 'application/json')
+        if token:
+            request.add_header('Authorization', f'Token {token}')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                status, headers = response.status, response.headers
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            status, headers = exc.code, exc.headers
+        match = _QUERIES_DESC.search(headers.get('Server-Timing') or '')
+        return status, int(match.group(1)) if match else None
+
+    def close(self):
+        pass
+
+
+class Fixtures:
+    """Dữ liệu cho các kịch bản, đọc một lần trước khi đo."""
+
+    def __init__(self):
+        domain = f'@{seeding.EMAIL_DOMAIN}'
+        self.student_emails = list(Student.objects.filter(email__endswith=domain)
+                                   .order_by('pk').values_list('email', flat=True))
+        if not self.student_emails or not User.objects.filter(email=seeding.ADMIN_EMAIL).exists():
+            raise BenchmarkError("Chưa có dữ liệu giả lập; chạy lệnh seed_college trước.")
+        self.admin_token = self.token(seeding.ADMIN_EMAIL)
+        self.student_tokens = [self.token(email) for email in self.student_emails[:TOKEN_SAMPLE]]
+        self.registration_ids = list(AdvisoryRegistration.objects.filter(email__endswith=domain)
+                                     .order_by('-pk').values_list('pk', flat=True)[:ID_SAMPLE])
+        self.major_ids = list(Major.objects.filter(code__startswith=seeding.PREFIX).values_list('pk', flat=True))
+        self.program_ids = list(Program.objects.filter(code__startswith=seeding.PREFIX).values_list('pk', flat=True))
+        self.classes = list(Class.objects.filter(class_name__startswith=seeding.PREFIX)
+                            .values_list('pk', 'major_id', 'academic_year_id', 'department_id'))
+        self.run_id = uuid.uuid4().hex[:6]  # tài khoản tạo mới không trùng giữa các lần chạy
+        self._numbers = itertools.count()
+
+    @staticmethod
+    def token(email):
+        user = User.objects.get(email=email)
+        return Token.objects.get_or_create(user=user)[0].key
+
+    def next_number(self):
+        return next(self._numbers)
+
+    def dataset(self):
+        """Quy mô dữ liệu giả lập, ghi kèm kết quả."""
+        domain = f'@{seeding.EMAIL_DOMAIN}'
+        return {
+            'students': Student.objects.filter(email__endswith=domain).count(),
+            'registrations': AdvisoryRegistration.objects.filter(email__endswith=domain).count(),
+            'majors': len(self.major_ids),
+            'classes': len(self.classes),
+        }
+
+
+# Kịch bản: (fixtures, rng) -> (method, path, data, token, các mã trạng thái hợp lệ)
+
+def login(fixtures, rng):
+    data = {'email': rng.choice(fixtures.student_emails), 'password': seeding.PASSWORD}
+    return 'POST', reverse('login'), data, None, {200}
+
+
+def create_student(fixtures, rng):
+    number = fixtures.next_number()
+    class_id, major_id, year_id, department_id = rng.choice(fixtures.classes)
+    email = f'new-{fixtures.run_id}-{number}@{seeding.EMAIL_DOMAIN}'
+    data = {
+        'first_name': rng.choice(seeding.FIRST_NAMES), 'last_name': rng.choice(seeding.LAST_NAMES),
+        'nationality': 'Việt Nam', 'national_id_card': f'{rng.randrange(10 ** 11, 10 ** 12)}',
+        'date_of_birth': '2005-01-01', 'email': email, 'phone': f'09{rng.randrange(10 ** 7, 10 ** 8)}',
+        'gender': rng.choice(['M', 'F']), 'address': '1 đường số 1', 'district': 'Quận 1',
+        'city': 'TP. Hồ Chí Minh', 'student_code': f'{seeding.PREFIX}N{fixtures.run_id}{number:05d}',
+        'parent_name': rng.choice(seeding.LAST_NAMES), 'parent_phone': f'09{rng.randrange(10 ** 7, 10 ** 8)}',
+        'program': rng.choice(fixtures.program_ids), 'major': major_id, 'academic_year': year_id,
+        'department': department_id, 'student_class': class_id,
+    }
+    return 'POST', reverse('creat_student_account-list'), data, fixtures.admin_token, {201}
+
+
+def registration_create(fixtures, rng):
+    data = {
+        'full_name': f'{rng.choice(seeding.LAST_NAMES)} {rng.choice(seeding.FIRST_NAMES)}',
+        'phone_number': f'09{rng.randrange(10 ** 7, 10 ** 8)}',
+        'email': f'dk-{uuid.UUID(int=rng.getrandbits(128)).hex[:12]}@{seeding.EMAIL_DOMAIN}',
+        'address': '1 đường số 1', 'major_of_interest_id': rng.choice(fixtures.major_ids),
+        'has_graduated': rng.choice(AdvisoryRegistration.GRADUATED_CHOICES)[0],
+    }
+    # 202 khi bật REGISTRATION_WRITE_BEHIND
+    return 'POST', reverse('create-registrations-list'), data, None, {201, 202}
+
+
+def registration_list(fixtures, rng):
+    return 'GET', f"{reverse('view-registrations-list')}?page_size=50", None, None, {200}
+
+
+def registration_detail(fixtures, rng):
+    pk = rng.choice(fixtures.registration_ids)
+    return 'GET', reverse('detail-registrations-detail', args=[pk]), None, None, {200}
+
+
+def change_password(fixtures, rng):
+    # Đổi sang chính mật khẩu cũ để các lần chạy sau vẫn đăng nhập được
+    data = {'old_password': seeding.PASSWORD, 'new_password': seeding.PASSWORD,
+            'confirm_new_password': seeding.PASSWORD}
+    return 'PUT', reverse('change-password'), data, rng.choice(fixtures.student_tokens), {200}
+
+
+SCENARIOS = {
+    'login': login,
+    'create_student': create_student,
+    'registration_create': registration_create,
+    'registration_list': registration_list,
+    'registration_detail': registration_detail,
+    'change_password': change_password,
+}
+
+
+def percentile(values, p):
+    """Phần tử thứ hạng gần nhất của danh sách đã sắp xếp."""
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+
+def run_scenario(transport, fixtures, name, requests, concurrency=1, warmup=0, seed=0):
+    """Gửi `requests` request của kịch bản `name` từ `concurrency` luồng; trả về dict kết quả."""
+    build = SCENARIOS[name]
+    latencies, query_counts, statuses = [], [], Counter()
+    errors = 0
+    lock = threading.Lock()
+    gate = threading.Barrier(concurrency) if concurrency > 1 else None
+
+    def send(rng):
+        method, path, data, token, expected = build(fixtures, rng)
+        began = time.perf_counter()
+        try:
+            status, queries = transport.request(method, path, data, token)
+        except Exception as exc:
+            status, queries = f'error:{type(exc).__name__}', None
+        return time.perf_counter() - began, status, queries, status in expected
+
+    def worker(index, count):
+        nonlocal errors
+        rng = random.Random(f'{seed}:{name}:{index}')
+        try:
+            for _ in range(warmup if index == 0 else 0):
+                send(rng)
+            if gate is not None:
+                gate.wait()
+            for _ in range(count):
+                elapsed, status, queries, ok = send(rng)
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[str(status)] += 1
+                    errors += not ok
+                    if queries is not None:
+                        query_counts.append(queries)
+        finally:
+            if gate is not None:
+                transport.close()
+
+    counts = [requests // concurrency + (index < requests % concurrency) for index in range(concurrency)]
+    began = time.perf_counter()
+    if gate is None:
+        worker(0, requests)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(worker, range(concurrency), counts))
+    elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    return {
+        'scenario': name,
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'statuses': dict(sorted(statuses.items())),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(requests / elapsed, 1) if elapsed else 0,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0,
+            'p50': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99': round(percentile(latencies, 0.99) * 1000, 2),
+            'max': round(latencies[-1] * 1000, 2) if latencies else 0,
+        },
+        'queries': {
+            'mean': round(sum(query_counts) / len(query_counts), 2),
+            'max': max(query_counts),
+            'sampled': len(query_counts),
+        } if query_counts else None,
+    }
+
+
+def git_commit():
+    """Mã commit hiện tại (thêm '-dirty' nếu cây làm việc có thay đổi); None nếu không có git."""
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=settings.BASE_DIR, capture_output=True, text=True,
+                              check=True, timeout=30).stdout.strip()
+    try:
+        commit = git('rev-parse', '--short', 'HEAD')
+        dirty = git('status', '--porcelain', '--untracked-files=no')
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return f'{commit}-dirty' if dirty else commit
+
+
+def metadata(transport, fixtures, **options):
+    return {
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'transport': transport.name,
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'dataset': fixtures.dataset(),
+        **options,
+    }
+
+
+def save_report(report, directory):
+    """Ghi báo cáo thành <thời điểm>-<commit>.json trong directory; trả về đường dẫn."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = directory / f"{stamp}-{report['meta']['commit'] or 'nogit'}.json"
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    return path
+
+
+def load_report(path):
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def latest_report(directory, exclude=None):
+    """Báo cáo mới nhất trong directory (tên file bắt đầu bằng thời điểm), bỏ qua `exclude`."""
+    paths = sorted(path for path in Path(directory).glob('*.json') if path != exclude)
+    return paths[-1] if paths else None
+
+
+def compare(current, baseline):
+    """[(kịch bản, chỉ số, trước, sau, % thay đổi)] cho các kịch bản có ở cả hai báo cáo."""
+    before = {result['scenario']: result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        old = before.get(result['scenario'])
+        if old is None:
+            continue
+        pairs = [('p50_ms', old['latency_ms']['p50'], result['latency_ms']['p50']),
+                 ('p95_ms', old['latency_ms']['p95'], result['latency_ms']['p95']),
+                 ('p99_ms', old['latency_ms']['p99'], result['latency_ms']['p99']),
+                 ('rps', old['throughput_rps'], result['throughput_rps'])]
+        if old['queries'] and result['queries']:
+            pairs.append(('queries', old['queries']['mean'], result['queries']['mean']))
+        for metric, was, now in pairs:
+            change = (now - was) / was * 100 if was else None
+            rows.append((result['scenario'], metric, was, now, change))
+    return rows
@@ -0,0 +1,288 @@
+# CollegeApp/bulk_import.py
+"""
+Nhập hàng loạt tài khoản Sinh viên / Cán bộ từ file CSV hoặc JSONL.
+
+File được đọc theo dòng (không nạp toàn bộ vào bộ nhớ), kiểm tra theo từng lô
+và ghi bảng cha (User) lẫn bảng con (Student/Faculty) bằng INSERT nhiều dòng,
+mỗi lô nằm trong một transaction.
+"""
+import csv
+import io
+import json
+import time
+from collections import Counter
+from itertools import islice
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DatabaseError, connections, transaction
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from .hashing import submit_passwords
+from .models import Class, User
+from .directory import refresh_students
+from .search import index_users
+from .serializers import (FacultyCreateSerializer, StudentCreateSerializer,
+                          apply_account_defaults)
+
+# loại tài khoản -> (serializer, trường mã duy nhất, vai trò)
+ACCOUNT_KINDS = {
+    'student': (StudentCreateSerializer, 'student_code', 'SINH_VIEN'),
+    'faculty': (FacultyCreateSerializer, 'faculty_code', 'CBCNV'),
+}
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+
+def iter_rows(stream, fmt):
+    """
+    Sinh ra từng cặp (số dòng, dict) từ một luồng văn bản.
+    Các ô rỗng bị bỏ qua để trường không bắt buộc nhận giá trị mặc định.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {k.strip(): v.strip() for k, v in row.items()
+                                    if k is not None and v not in (None, '')}
+    elif fmt == 'jsonl':
+        for line_no, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                row = exc
+            yield line_no, row
+    else:
+        raise ValueError(f"Định dạng không hỗ trợ: {fmt}")
+
+
+def open_text(binary_file):
+    """Bọc file nhị phân (ví dụ file upload) thành luồng văn bản UTF-8."""
+    return io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+
+
+def guess_format(filename):
+    return 'jsonl' if filename and filename.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+class ImportReport:
+    def __init__(self):
+        self.total = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    def add_error(self, line, detail):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': detail})
+
+    @property
+    def rows_per_second(self):
+        return round(self.total / self.elapsed, 1) if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'created': self.created,
+            'failed': self.failed,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'rows_per_second': self.rows_per_second,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+class AccountImporter:
+    """
+    Nhập tài khoản theo lô.
+
+    Mỗi lô: kiểm tra dữ liệu bằng serializer tạo tài khoản (các khóa ngoại
+    được nạp sẵn bằng một truy vấn cho mỗi bảng liên quan), kiểm tra trùng
+    email/mã bằng một truy vấn, rồi ghi User và bảng con bằng INSERT nhiều dòng.
+    Mật khẩu của một lô được băm trong pool tiến trình trong lúc lô kế tiếp
+    đang được kiểm tra.
+    """
+
+    def __init__(self, kind, chunk_size=DEFAULT_CHUNK_SIZE, using='default'):
+        if kind not in ACCOUNT_KINDS:
+            raise ValueError(f"Loại tài khoản không hợp lệ: {kind}")
+        self.serializer_class, self.code_field, self.role = ACCOUNT_KINDS[kind]
+        self.model = self.serializer_class.Meta.model
+        self.chunk_size = max(1, int(chunk_size))
+        self.using = using
+
+    def run(self, rows, progress=None):
+        """
+        `rows` là iterable các cặp (số dòng, dict). `progress(report, chunk_errors)`
+        được gọi sau mỗi lô nếu được truyền vào.
+        """
+        report = ImportReport()
+        rows = iter(rows)
+        # Lô trước đang chờ băm mật khẩu trong pool, trong khi lô sau được kiểm tra
+        pending = None
+        errors_before = 0
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            taken = ({data['email'].lower() for _, data in pending[0]},
+                     {data[self.code_field] for _, data in pending[0]}) if pending else (set(), set())
+            valid = self._validate_chunk(chunk, report, taken)
+            hashes = submit_passwords([data['national_id_card'] for _, data in valid])
+            if pending is not None:
+                self._write(*pending, report)
+                errors_before = self._progress(report, progress, errors_before)
+            pending = (valid, hashes)
+        if pending is not None:
+            self._write(*pending, report)
+            self._progress(report, progress, errors_before)
+        report.elapsed = time.monotonic() - report.started
+        return report
+
+    def _progress(self, report, progress, errors_before):
+        report.elapsed = time.monotonic() - report.started
+        if progress is not None:
+            progress(report, report.errors[errors_before:])
+        return len(report.errors)
+
+    # -- Kiểm tra dữ liệu ----------------------------------------------------
+
+    def _build_serializer(self, chunk):
+        serializer = self.serializer_class(context={'related_cache': {}})
+        fields = serializer.fields
+        for field in fields.values():
+            # Ràng buộc duy nhất được kiểm tra một lần cho cả lô
+            field.validators = [v for v in field.validators if not isinstance(v, UniqueValidator)]
+
+        cache = serializer.context['related_cache']
+        for name, field in fields.items():
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and not field.read_only:
+                pks = {row[name] for _, row in chunk if isinstance(row, dict) and row.get(name) not in (None, '')}
+                model = field.get_queryset().model
+                valid = set()
+                for pk in pks:
+                    try:
+                        valid.add(model._meta.pk.to_python(pk))
+                    except (TypeError, ValueError, DjangoValidationError):
+                        continue
+                cache[name] = field.get_queryset().in_bulk(valid) if valid else {}
+        return serializer
+
+    def _validate_chunk(self, chunk, report, taken):
+        serializer = self._build_serializer(chunk)
+        valid = []
+        for line, row in chunk:
+            report.total += 1
+            if not isinstance(row, dict):
+                report.add_error(line, {'non_field_errors': [f"Dòng không hợp lệ: {row}"]})
+                continue
+            try:
+                valid.append((line, serializer.run_validation(row)))
+            except serializers.ValidationError as exc:
+                report.add_error(line, exc.detail)
+        return self._check_unique(valid, report, taken)
+
+    def _check_unique(self, rows, report, taken):
+        emails = {data['email'] for _, data in rows}
+        codes = {data[self.code_field] for _, data in rows}
+        # `taken`: email/mã của lô trước chưa được ghi xuống cơ sở dữ liệu
+        taken_emails = {e.lower() for e in User.objects.using(self.using)
+                        .filter(email__in=emails).values_list('email', flat=True)} | taken[0]
+        taken_codes = set(self.model.objects.using(self.using)
+                          .filter(**{f'{self.code_field}__in': codes})
+                          .values_list(self.code_field, flat=True)) | taken[1]
+
+        unique_rows = []
+        for line, data in rows:
+            email, code = data['email'].lower(), data[self.code_field]
+            detail = {}
+            if email in taken_emails:
+                detail['email'] = ["Email đã tồn tại."]
+            if code in taken_codes:
+                detail[self.code_field] = ["Mã đã tồn tại."]
+            if detail:
+                report.add_error(line, detail)
+                continue
+            taken_emails.add(email)
+            taken_codes.add(code)
+            unique_rows.append((line, data))
+        return unique_rows
+
+    # -- Ghi dữ liệu ---------------------------------------------------------
+
+    def _write(self, rows, hashes, report):
+        if not rows:
+            return
+        try:
+            passwords = hashes.result()
+        except Exception as exc:
+            for line, _ in rows:
+                report.add_error(line, {'password': [f"Không băm được mật khẩu: {exc}"]})
+            return
+        objs = []
+        for (_, data), password in zip(rows, passwords):
+            apply_account_defaults(data, self.role)
+            data['password'] = password
+            objs.append(self.model(**data))
+        try:
+            with transaction.atomic(using=self.using):
+                insert_accounts(self.model, objs, using=self.using)
+        except DatabaseError as exc:
+            for line, _ in rows:
+                report.add_error(line, {'non_field_errors': [f"Lỗi ghi cơ sở dữ liệu: {exc}"]})
+            return
+        report.created += len(objs)
+
+
+def insert_accounts(model, objs, using='default'):
+    """
+    INSERT nhiều dòng cho model kế thừa nhiều bảng từ User.
+
+    bulk_create() không hỗ trợ kế thừa nhiều bảng, nên ghi bảng User bằng
+    bulk_create rồi ghi bảng con bằng INSERT của chính Django (như Model.save_base)
+    với khóa chính là user_ptr vừa tạo. Cần được gọi trong transaction.
+    """
+    parent_fields = [f for f in User._meta.concrete_fields if not f.primary_key]
+    parents = []
+    for obj in objs:
+        parent = User()
+        for field in parent_fields:
+            setattr(parent, field.attname, getattr(obj, field.attname))
+        parents.append(parent)
+    User.objects.using(using).bulk_create(parents)
+
+    if any(parent.pk is None for parent in parents):
+        # MySQL không trả về khóa chính từ INSERT nhiều dòng
+        ids = dict(User.objects.using(using)
+                   .filter(email__in=[p.email for p in parents])
+                   .values_list('email', 'pk'))
+        for parent in parents:
+            parent.pk = ids[parent.email]
+
+    for obj, parent in zip(objs, parents):
+        for field in parent_fields:
+            # giá trị do pre_save tạo ra (auto_now_add...)
+            setattr(obj, field.attname, getattr(parent, field.attname))
+        obj.id = parent.pk
+        obj.pk = parent.pk
+        obj._state.adding = False
+        obj._state.db = using
+
+    fields = model._meta.local_concrete_fields
+    ops = connections[using].ops
+    batch_size = max(ops.bulk_batch_size(fields, objs), 1)
+    for start in range(0, len(objs), batch_size):
+        model._base_manager.using(using)._insert(objs[start:start + batch_size], fields=fields, using=using)
+    # _insert không phát signal post_save: cập nhật chỉ mục tìm kiếm theo lô
+    index_users(objs, using=using)
+    if hasattr(model, 'student_class'):
+        # Sĩ số lớp: một UPDATE F() cho mỗi lớp có sinh viên mới
+        Class.adjust_counts(Counter(obj.student_class_id for obj in objs), using=using)
+        refresh_students([obj.pk for obj in objs], using=using)
+    return objs
@@ -0,0 +1,87 @@
+# CollegeApp/catalog.py
+"""
+Response đọc danh mục (khoa, chương trình, ngành, môn học, đối tượng và cách thức
+tuyển sinh) có ETag/Last-Modified và được cache phía máy chủ.
+
+ETag là băm của (view, action, pk, query string, scheme và host của request, số thế
+hệ của các model mà view phụ thuộc); scheme và host có mặt vì response chứa URL tuyệt
+đối (ảnh thu nhỏ, liên kết phân trang). Vì vậy:
+  - yêu cầu có If-None-Match / If-Modified-Since khớp được trả 304 chỉ sau một lần
+    đọc cache, không chạm DB;
+  - dữ liệu đã tuần tự hóa được cache theo chính ETag, nên chỉ lần đọc đầu tiên sau
+    mỗi thay đổi mới truy vấn DB; khi model thay đổi, khóa cũ không còn được dùng.
+Với cache riêng từng tiến trình, số thế hệ hết hạn sau GENERATIONS['LOCAL_TTL'] giây
+(generations.py), nên ETag và dữ liệu cache cũ cũng chỉ sống tối đa chừng đó.
+
+Cấu hình trong settings:
+    CATALOG_API = {
+        'CACHE_TTL': 86400,  # giây giữ response trong cache
+        'MAX_AGE': 60,       # Cache-Control max-age gửi cho client
+    }
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .generations import get_generations, last_modified
+from .models import AdmissionMethod, AdmissionRequirement, Course, Department, Major, Program
+
+# Model danh mục: thay đổi của chúng làm tăng số thế hệ (signals.py)
+CATALOG_MODELS = (Department, Program, Major, Course, AdmissionRequirement, AdmissionMethod)
+
+
+def get_config():
+    config = {
+        'CACHE_TTL': 86400,
+        'MAX_AGE': 60,
+    }
+    config.update(getattr(settings, 'CATALOG_API', {}))
+    return config
+
+
+class CatalogCacheMixin:
+    """
+    Dành cho ReadOnlyModelViewSet. View khai báo `catalog_models`: các model có
+    dữ liệu xuất hiện trong response (mặc định là model của queryset).
+    """
+    catalog_models = None
+
+    def get_catalog_models(self):
+        return self.catalog_models or (self.get_queryset().model,)
+
+    def get_etag(self, generations):
+        query = sorted(self.request.query_params.lists())
+        raw = repr((type(self).__name__, self.action, self.kwargs.get(self.lookup_field), query,
+                    self.request.scheme, self.request.get_host(), generations))
+        return '"%s"' % hashlib.sha1(raw.encode()).hexdigest()
+
+    def cached_response(self, build):
+        config = get_config()
+        generations = list(get_generations(self.get_catalog_models()).values())
+        etag = self.get_etag(generations)
+        modified = last_modified(generations)
+
+        not_modified = get_conditional_response(self.request._request, etag=etag, last_modified=modified)
+        if not_modified is None:
+            key = f'catalog:{etag}'
+            data = cache.get(key)
+            if data is None:
+                data = build().data
+                cache.set(key, data, config['CACHE_TTL'])
+            response = Response(data)
+        else:
+            response = Response(status=not_modified.status_code)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(modified)
+        response['Cache-Control'] = f"public, max-age={config['MAX_AGE']}"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(lambda: super(CatalogCacheMixin, self).retrieve(request, *args, **kwargs))
@@ -0,0 +1,19 @@
+# CollegeApp/checks.py
+"""System check của CollegeApp (đăng ký trong apps.py)."""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .generations import cache_is_shared, get_config
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    # Số thế hệ (danh mục, đồ thị tiên quyết, autocomplete admin) cần cache dùng chung giữa các worker
+    if settings.DEBUG or cache_is_shared():
+        return []
+    return [Warning(
+        "CACHES['default'] chỉ thuộc từng tiến trình: với nhiều worker, thay đổi danh mục, môn học và "
+        f"quan hệ tiên quyết chỉ được các worker khác thấy sau tối đa {get_config()['LOCAL_TTL']} giây.",
+        hint="Dùng cache dùng chung (Redis/Memcached) hoặc giảm GENERATIONS['LOCAL_TTL'].",
+        id='CollegeApp.W001',
+    )]
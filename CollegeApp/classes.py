@@ -0,0 +1,57 @@
+# CollegeApp/classes.py
+"""
+Xếp / rút sinh viên khỏi lớp sinh hoạt theo lô.
+
+Class.number_of_students là bộ đếm phi chuẩn hóa: mọi thay đổi Student.student_class
+đi kèm một UPDATE F() trên lớp cũ và lớp mới trong cùng transaction (Student.save,
+post_delete, import tài khoản và các hàm dưới đây). Lệch số liệu (sửa tay trong DB...)
+được sửa bằng reconcile_counts().
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .directory import refresh_students
+from .models import Class, Student
+
+
+def _move(students, class_id, using):
+    """Chuyển các sinh viên (đã khóa dòng) sang class_id; trả về số sinh viên thực sự đổi lớp."""
+    rows = list(students.select_for_update().exclude(student_class_id=class_id)
+                .values_list('pk', 'student_class_id'))
+    if not rows:
+        return 0
+    Student.objects.using(using).filter(pk__in=[pk for pk, _ in rows]).update(student_class_id=class_id)
+    deltas = Counter()
+    for _, old_class_id in rows:
+        deltas[old_class_id] -= 1
+    deltas[class_id] += len(rows)
+    Class.adjust_counts(deltas, using=using)
+    refresh_students([pk for pk, _ in rows], using=using)
+    return len(rows)
+
+
+def assign_students(class_obj, student_ids, using='default'):
+    """Xếp các sinh viên vào lớp (kể cả đang ở lớp khác)."""
+    with transaction.atomic(using=using):
+        return _move(Student.objects.using(using).filter(pk__in=student_ids), class_obj.pk, using)
+
+
+def remove_students(class_obj, student_ids, using='default'):
+    """Rút các sinh viên khỏi lớp; sinh viên không thuộc lớp được bỏ qua."""
+    with transaction.atomic(using=using):
+        students = Student.objects.using(using).filter(pk__in=student_ids, student_class_id=class_obj.pk)
+        return _move(students, None, using)
+
+
+def reconcile_counts(using='default'):
+    """Đặt lại number_of_students theo số sinh viên thực tế trong một UPDATE; trả về số lớp bị lệch."""
+    actual = Coalesce(Subquery(
+        Student.objects.filter(student_class_id=OuterRef('pk')).order_by()
+        .values('student_class_id').annotate(total=Count('pk')).values('total'),
+        output_field=IntegerField()), Value(0))
+    # Chỉ ghi các lớp bị lệch; số dòng UPDATE trả về chính là số lớp đã sửa
+    return (Class.objects.using(using).exclude(number_of_students=actual)
+            .update(number_of_students=actual))
@@ -0,0 +1,85 @@
+# CollegeApp/conflicts.py
+"""
+Tra cứu trùng lịch (phòng, giảng viên, sinh viên) trong một học kỳ trên bảng
+OfferingTimeSlot.
+
+Hai khung giờ trùng nhau khi cùng thứ và hai đoạn tiết giao nhau
+(start <= end' AND end >= start'). Mọi khung giờ cần kiểm tra được gộp thành một
+điều kiện OR nên mỗi lần tra cứu chỉ là một truy vấn, dùng index
+(semester, room_key | lecturer, day, start_period).
+"""
+from collections import namedtuple
+
+from django.db.models import Q
+
+from .models import OfferingTimeSlot
+from .schedule import DAY_NAMES
+
+Conflict = namedtuple('Conflict', ['reason', 'slot'])
+
+REASON_LABELS = {
+    'room': 'trùng phòng',
+    'lecturer': 'trùng giảng viên',
+    'student': 'trùng lịch sinh viên',
+}
+
+
+def _overlapping(slots):
+    condition = Q()
+    for slot in slots:
+        condition |= Q(day=slot.day, start_period__lte=slot.end_period, end_period__gte=slot.start_period)
+    return condition
+
+
+def find_conflicts(semester_id, slots, room_key='', lecturer_id=None, student_id=None, exclude_offering=None):
+    """
+    Các khung giờ của lớp học phần khác trong học kỳ trùng với `slots` về phòng,
+    giảng viên hoặc lịch học của sinh viên (các lớp sinh viên đang đăng ký).
+    Trả về danh sách Conflict(reason, slot).
+    """
+    owners = Q()
+    if room_key:
+        owners |= Q(room_key=room_key)
+    if lecturer_id:
+        owners |= Q(lecturer_id=lecturer_id)
+    if student_id:
+        owners |= Q(offering__enrollments__student_id=student_id, offering__enrollments__status='ENROLLED')
+    if not slots or not owners:
+        return []
+
+    queryset = (OfferingTimeSlot.objects
+                .filter(_overlapping(slots), owners, semester_id=semester_id)
+                .select_related('offering')
+                .order_by('day', 'start_period', 'offering_id'))
+    if exclude_offering is not None:
+        queryset = queryset.exclude(offering_id=exclude_offering)
+    if student_id:
+        queryset = queryset.distinct()
+
+    conflicts = []
+    for row in queryset:
+        if room_key and row.room_key == room_key:
+            conflicts.append(Conflict('room', row))
+        if lecturer_id and row.lecturer_id == lecturer_id:
+            conflicts.append(Conflict('lecturer', row))
+        if student_id and not ((room_key and row.room_key == room_key)
+                               or (lecturer_id and row.lecturer_id == lecturer_id)):
+            conflicts.append(Conflict('student', row))
+    return conflicts
+
+
+def offering_conflicts(offering, student_id=None):
+    """Trùng lịch của một lớp học phần đã lưu (dựa trên khung giờ đã tách của nó)."""
+    slots = list(offering.time_slots.all())
+    room = slots[0].room_key if slots else ''
+    return find_conflicts(offering.semester_id, slots, room_key=room, lecturer_id=offering.lecturer_id,
+                          student_id=student_id, exclude_offering=offering.pk)
+
+
+def describe_conflicts(conflicts):
+    return [
+        f"{REASON_LABELS[conflict.reason].capitalize()} với lớp {conflict.slot.offering.class_code} "
+        f"({DAY_NAMES.get(conflict.slot.day, conflict.slot.day)}, "
+        f"tiết {conflict.slot.start_period}-{conflict.slot.end_period})"
+        for conflict in conflicts
+    ]
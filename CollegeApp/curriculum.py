@@ -0,0 +1,200 @@
+# CollegeApp/curriculum.py
+"""
+Đồ thị môn học tiên quyết (Course.prerequisites) được biên dịch trong bộ nhớ.
+
+Toàn bộ cạnh tiên quyết được đọc từ bảng trung gian trong một truy vấn (thêm
+hai truy vấn phẳng cho danh sách môn học và bảng Course.major), sau đó tính sẵn:
+  - bao đóng bắc cầu của môn tiên quyết và môn phụ thuộc (bitset trên số nguyên),
+  - độ sâu (chuỗi tiên quyết dài nhất) để sắp xếp lộ trình,
+  - thứ tự topo của các môn trong từng ngành.
+Mọi tra cứu sau đó không cần truy vấn đệ quy.
+
+Đồ thị gắn với số thế hệ của Course và Major (generations.py): khi môn học, ngành
+hoặc quan hệ M2M thay đổi (signals.py), lần gọi get_graph() kế tiếp ở mọi tiến
+trình dùng chung cache sẽ dựng lại đồ thị. Dù vậy đồ thị cũng không được giữ quá
+GRAPH_TTL giây, phòng khi cache không dùng chung hoặc mất tín hiệu thay đổi.
+"""
+import threading
+import time
+from collections import deque
+
+from django.core.exceptions import ValidationError
+
+from .generations import get_generations
+from .models import Course, Major
+
+GRAPH_MODELS = (Course, Major)
+GRAPH_TTL = 300
+
+PrerequisiteLink = Course.prerequisites.through
+CourseMajorLink = Course.major.through
+
+
+def _bits(mask):
+    """Vị trí các bit 1 của một số nguyên."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class PrerequisiteGraph:
+    def __init__(self, courses, edges, memberships):
+        """
+        courses: [(id, course_code)], edges: [(môn, môn tiên quyết)],
+        memberships: [(môn, ngành)].
+        """
+        self.ids = [course_id for course_id, _ in sorted(courses, key=lambda c: (c[1], c[0]))]
+        self.index = {course_id: i for i, course_id in enumerate(self.ids)}
+        size = len(self.ids)
+        self.direct = [0] * size        # bitset môn tiên quyết trực tiếp
+        self.direct_rev = [0] * size    # bitset môn phụ thuộc trực tiếp
+        for course_id, prereq_id in edges:
+            if course_id in self.index and prereq_id in self.index:
+                course, prereq = self.index[course_id], self.index[prereq_id]
+                self.direct[course] |= 1 << prereq
+                self.direct_rev[prereq] |= 1 << course
+
+        self.majors = {}
+        for course_id, major_id in memberships:
+            if course_id in self.index:
+                self.majors.setdefault(major_id, 0)
+                self.majors[major_id] |= 1 << self.index[course_id]
+
+        self.order, self.cyclic = self._toposort(self.direct, self.direct_rev)
+        self.closure = self._close(self.direct, self.order)
+        self.closure_rev = self._close(self.direct_rev, list(reversed(self.order)))
+        self.depth = [0] * size
+        for node in self.order:
+            self.depth[node] = max((self.depth[p] + 1 for p in _bits(self.direct[node])), default=0)
+        # Môn nằm trên (hoặc phụ thuộc vào) chu trình được xếp cuối lộ trình
+        last = max(self.depth, default=0) + 1
+        for node in self.cyclic:
+            self.depth[node] = last
+
+    @staticmethod
+    def _toposort(incoming, outgoing):
+        """Thuật toán Kahn; nút còn lại (nằm trên chu trình) được trả về riêng."""
+        remaining = [bin(mask).count('1') for mask in incoming]
+        queue = deque(i for i, count in enumerate(remaining) if count == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for child in _bits(outgoing[node]):
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    queue.append(child)
+        cyclic = [i for i, count in enumerate(remaining) if count > 0]
+        return order, cyclic
+
+    def _close(self, direct, order):
+        closure = [0] * len(direct)
+        # Dữ liệu cũ có thể chứa chu trình: các nút không có trong thứ tự topo
+        # được tính bằng BFS trước, các nút còn lại dùng lại kết quả đó
+        for node in self.cyclic:
+            seen, frontier = 0, direct[node]
+            while frontier:
+                seen |= frontier
+                nxt = 0
+                for parent in _bits(frontier):
+                    nxt |= direct[parent]
+                frontier = nxt & ~seen
+            closure[node] = seen
+        for node in order:
+            mask = direct[node]
+            for parent in _bits(direct[node]):
+                mask |= closure[parent]
+            closure[node] = mask
+        return closure
+
+    # -- Tra cứu ---------------------------------------------------------------
+
+    def _ids(self, mask):
+        return [self.ids[i] for i in _bits(mask)]
+
+    def __contains__(self, course_id):
+        return course_id in self.index
+
+    def prerequisites(self, course_id, transitive=False):
+        node = self.index[course_id]
+        return self._ids(self.closure[node] if transitive else self.direct[node])
+
+    def dependants(self, course_id, transitive=False):
+        node = self.index[course_id]
+        return self._ids(self.closure_rev[node] if transitive else self.direct_rev[node])
+
+    def requires(self, course_id, prereq_id):
+        """course_id có cần (trực tiếp hoặc gián tiếp) prereq_id không."""
+        return bool(self.closure[self.index[course_id]] >> self.index[prereq_id] & 1)
+
+    def depth_of(self, course_id):
+        return self.depth[self.index[course_id]]
+
+    def cycle_errors(self, course_id, prereq_ids):
+        """Các môn trong prereq_ids mà nếu thêm làm tiên quyết của course_id sẽ tạo chu trình."""
+        bad = []
+        for prereq_id in prereq_ids:
+            if prereq_id == course_id:
+                bad.append(prereq_id)
+            elif prereq_id in self.index and course_id in self.index and self.requires(prereq_id, course_id):
+                bad.append(prereq_id)
+        return bad
+
+    def curriculum(self, major_id):
+        """
+        Các môn của ngành theo thứ tự topo: [(id, độ sâu, [id tiên quyết trực tiếp trong ngành])].
+        Môn có cùng độ sâu được xếp theo mã môn.
+        """
+        members = self.majors.get(major_id, 0)
+        nodes = sorted(_bits(members), key=lambda node: (self.depth[node], node))
+        return [(self.ids[node], self.depth[node], self._ids(self.direct[node] & members)) for node in nodes]
+
+
+def build_graph(using='default'):
+    courses = Course.objects.using(using).values_list('id', 'course_code')
+    edges = PrerequisiteLink.objects.using(using).values_list('from_course_id', 'to_course_id')
+    memberships = CourseMajorLink.objects.using(using).values_list('course_id', 'major_id')
+    return PrerequisiteGraph(list(courses), list(edges), list(memberships))
+
+
+_graph = (None, 0.0, None)  # (số thế hệ, thời điểm dựng, đồ thị)
+_graph_lock = threading.Lock()
+
+
+def _fresh(generation):
+    built_for, built_at, graph = _graph
+    return graph is not None and built_for == generation and time.monotonic() - built_at <= GRAPH_TTL
+
+
+def get_graph():
+    global _graph
+    generation = tuple(get_generations(GRAPH_MODELS).values())
+    if not _fresh(generation):
+        with _graph_lock:
+            if not _fresh(generation):
+                _graph = (generation, time.monotonic(), build_graph())
+    return _graph[2]
+
+
+def invalidate_graph():
+    """Bỏ bản đồ thị của tiến trình này (các tiến trình khác theo số thế hệ)."""
+    global _graph
+    _graph = (None, 0.0, None)
+
+
+def check_prerequisite_links(links, using='default'):
+    """
+    links: [(môn, môn tiên quyết)] sắp được thêm. Báo lỗi ValidationError nếu có cạnh
+    tạo thành vòng lặp tiên quyết.
+    """
+    # Kiểm tra trên dữ liệu mới nhất, không dùng bản cache của tiến trình
+    graph = build_graph(using=using)
+    bad = set()
+    for course_id, prereq_id in links:
+        bad.update(graph.cycle_errors(course_id, [prereq_id]))
+    if bad:
+        codes = Course.objects.using(using).filter(pk__in=bad).values_list('course_code', flat=True)
+        raise ValidationError(
+            "Không thể thêm môn tiên quyết %(codes)s: tạo thành vòng lặp tiên quyết.",
+            code='prerequisite_cycle', params={'codes': ', '.join(sorted(codes))})
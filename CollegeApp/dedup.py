@@ -0,0 +1,159 @@
+# CollegeApp/dedup.py
+"""
+Phát hiện đăng ký tư vấn trùng lặp theo số điện thoại / email đã chuẩn hóa.
+
+Một Bloom filter trong bộ nhớ chứa các khóa của những đăng ký trong cửa sổ thời
+gian (WINDOW_DAYS). Nếu cả số điện thoại lẫn email đều chắc chắn chưa có trong
+filter thì đăng ký là mới và không tốn thêm truy vấn nào; chỉ khi filter báo "có
+thể đã có" mới tra cứu trên index (phone_normalized / email_normalized).
+
+Filter thuộc từng tiến trình và được dựng lại định kỳ (REBUILD_INTERVAL) từ DB,
+nên đăng ký do tiến trình khác ghi trong khoảng đó có thể không bị phát hiện.
+
+Cấu hình trong settings:
+    REGISTRATION_DEDUP = {
+        'ENABLED': True,
+        'WINDOW_DAYS': 30,
+        'POLICY': 'merge',         # 'merge': gộp vào đăng ký cũ, 'flag': vẫn lưu nhưng đánh dấu duplicate_of
+        'BLOOM_CAPACITY': 200000,
+        'BLOOM_ERROR_RATE': 0.01,
+        'REBUILD_INTERVAL': 600,   # giây
+    }
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import AdvisoryRegistration
+
+
+def get_config():
+    config = {
+        'ENABLED': True,
+        'WINDOW_DAYS': 30,
+        'POLICY': 'merge',
+        'BLOOM_CAPACITY': 200000,
+        'BLOOM_ERROR_RATE': 0.01,
+        'REBUILD_INTERVAL': 600,
+    }
+    config.update(getattr(settings, 'REGISTRATION_DEDUP', {}))
+    return config
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        capacity = max(1, int(capacity))
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class DuplicateDetector:
+    def __init__(self, window_days, capacity, error_rate, rebuild_interval):
+        self.window = timedelta(days=window_days)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self._bloom = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def _keys(self, phone, email):
+        return [key for key in (phone and f'p:{phone}', email and f'e:{email}') if key]
+
+    def _filter(self):
+        if self._bloom is None or time.monotonic() - self._built_at > self.rebuild_interval:
+            with self._lock:
+                if self._bloom is None or time.monotonic() - self._built_at > self.rebuild_interval:
+                    bloom = BloomFilter(self.capacity, self.error_rate)
+                    rows = (AdvisoryRegistration.objects
+                            .filter(registration_date__gte=timezone.now() - self.window)
+                            .values_list('phone_normalized', 'email_normalized'))
+                    for phone, email in rows.iterator(chunk_size=5000):
+                        for key in self._keys(phone, email):
+                            bloom.add(key)
+                    self._bloom, self._built_at = bloom, time.monotonic()
+        return self._bloom
+
+    def might_exist(self, phone, email):
+        bloom = self._filter()
+        return any(key in bloom for key in self._keys(phone, email))
+
+    def remember(self, phone, email):
+        bloom = self._filter()
+        for key in self._keys(phone, email):
+            bloom.add(key)
+
+    def find_originals(self, pairs):
+        """
+        {(phone, email): đăng ký gốc gần nhất trong cửa sổ} cho các cặp mà Bloom filter
+        báo có thể đã có. Một truy vấn trên index cho cả danh sách.
+        """
+        candidates = [(phone, email) for phone, email in pairs if self.might_exist(phone, email)]
+        if not candidates:
+            return {}
+        phones = {phone for phone, _ in candidates if phone}
+        emails = {email for _, email in candidates if email}
+        rows = (AdvisoryRegistration.objects
+                .filter(Q(phone_normalized__in=phones) | Q(email_normalized__in=emails),
+                        registration_date__gte=timezone.now() - self.window,
+                        duplicate_of__isnull=True)
+                .order_by('-registration_date', '-id'))
+        by_phone, by_email = {}, {}
+        for row in rows:
+            by_phone.setdefault(row.phone_normalized, row)
+            by_email.setdefault(row.email_normalized, row)
+        found = {}
+        for phone, email in candidates:
+            original = by_phone.get(phone) or by_email.get(email)
+            if original is not None:
+                found[(phone, email)] = original
+        return found
+
+
+_detector = None
+
+
+def get_detector():
+    global _detector
+    if _detector is None:
+        config = get_config()
+        _detector = DuplicateDetector(config['WINDOW_DAYS'], config['BLOOM_CAPACITY'],
+                                      config['BLOOM_ERROR_RATE'], config['REBUILD_INTERVAL'])
+    return _detector
+
+
+def dedup_enabled():
+    return bool(get_config()['ENABLED'])
+
+
+def merge_into(original, count=1, major_id=None, address=None):
+    """Gộp `count` lần gửi mới vào đăng ký gốc bằng một UPDATE nguyên tử."""
+    updates = {
+        'submission_count': F('submission_count') + count,
+        'last_submitted_at': timezone.now(),
+    }
+    if original.major_of_interest_id is None and major_id:
+        updates['major_of_interest_id'] = major_id
+    if not original.address and address:
+        updates['address'] = address
+    AdvisoryRegistration.objects.filter(pk=original.pk).update(**updates)
@@ -0,0 +1,139 @@
+# CollegeApp/directory.py
+"""
+Đồng bộ bảng đọc StudentDirectoryEntry với Student/User và các bảng danh mục.
+
+Một dòng danh bạ được tính từ một truy vấn values() trên Student (JOIN User và các
+bảng liên quan một lần khi ghi) rồi ghi bằng bulk_create(update_conflicts=True):
+mỗi lô là một câu INSERT ... ON CONFLICT/ON DUPLICATE KEY UPDATE.
+
+Các đường ghi giữ bảng đồng bộ:
+  - post_save của Student/User (signals.py), bỏ qua khi update_fields không chạm
+    cột nào của danh bạ;
+  - import tài khoản hàng loạt (bulk_import.insert_accounts) và xếp lớp theo lô
+    (classes.py) gọi refresh_students();
+  - đổi tên / xóa ngành, chương trình, niên khóa, khoa, lớp: một UPDATE trên cột
+    tên phi chuẩn hóa (rename_related / clear_related);
+  - xóa sinh viên: khóa chính là OneToOne CASCADE.
+Các thay đổi bằng SQL trực tiếp được phát hiện bởi check_directory() và sửa bằng
+lệnh check_student_directory --fix hoặc rebuild_student_directory.
+"""
+from django.db.models import F
+
+from .models import AcademicYear, Class, Department, Major, Program, Student, StudentDirectoryEntry
+
+# cột danh bạ -> biểu thức trên Student
+SOURCE_FIELDS = {
+    'student_code': 'student_code',
+    'last_name': 'last_name',
+    'first_name': 'first_name',
+    'email': 'email',
+    'phone': 'phone',
+    'gender': 'gender',
+    'date_of_birth': 'date_of_birth',
+    'student_status': 'student_status',
+    'is_active': 'is_active',
+    'program_id': 'program_id',
+    'program_name': 'program__name',
+    'major_id': 'major_id',
+    'major_name': 'major__name',
+    'academic_year_id': 'academic_year_id',
+    'academic_year_name': 'academic_year__name',
+    'department_id': 'department_id',
+    'department_name': 'department__name',
+    'student_class_id': 'student_class_id',
+    'student_class_name': 'student_class__class_name',
+}
+# cột của Student/User mà thay đổi cần cập nhật danh bạ
+TRACKED_FIELDS = {'student_code', 'last_name', 'first_name', 'email', 'phone', 'gender', 'date_of_birth',
+                  'student_status', 'is_active', 'program', 'major', 'academic_year', 'department',
+                  'student_class'}
+# model liên quan -> (cột id, cột tên trong danh bạ, trường tên trên model)
+RELATED = {
+    Program: ('program_id', 'program_name', 'name'),
+    Major: ('major_id', 'major_name', 'name'),
+    AcademicYear: ('academic_year_id', 'academic_year_name', 'name'),
+    Department: ('department_id', 'department_name', 'name'),
+    Class: ('student_class_id', 'student_class_name', 'class_name'),
+}
+BATCH_SIZE = 1000
+
+
+def source_rows(students):
+    """Các dòng danh bạ (dict) tính từ một queryset Student."""
+    annotations = {name: F(source) for name, source in SOURCE_FIELDS.items() if name != source}
+    fields = [name for name, source in SOURCE_FIELDS.items() if name == source]
+    for row in students.order_by().annotate(**annotations).values('pk', *fields, *annotations):
+        row['student_id'] = row.pop('pk')
+        for _, name_field, _ in RELATED.values():
+            row[name_field] = row[name_field] or ''
+        yield row
+
+
+def _write(rows, using):
+    entries = [StudentDirectoryEntry(**row) for row in rows]
+    StudentDirectoryEntry.objects.using(using).bulk_create(
+        entries, batch_size=BATCH_SIZE, update_conflicts=True, unique_fields=['student'],
+        update_fields=[*SOURCE_FIELDS, 'synced_at'])
+    return len(entries)
+
+
+def refresh_students(student_ids, using='default'):
+    """Tính lại dòng danh bạ của các sinh viên (id không phải sinh viên được bỏ qua)."""
+    student_ids = list(student_ids)
+    written = 0
+    for start in range(0, len(student_ids), BATCH_SIZE):
+        chunk = student_ids[start:start + BATCH_SIZE]
+        written += _write(source_rows(Student.objects.using(using).filter(pk__in=chunk)), using)
+    return written
+
+
+def rebuild(using='default', chunk_size=BATCH_SIZE):
+    """Ghi lại toàn bộ danh bạ theo từng lô khóa chính; xóa dòng không còn sinh viên."""
+    written, last_pk = 0, 0
+    students = Student.objects.using(using).order_by('pk')
+    while True:
+        ids = list(students.filter(pk__gt=last_pk).values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            break
+        written += refresh_students(ids, using=using)
+        last_pk = ids[-1]
+    orphans = StudentDirectoryEntry.objects.using(using).exclude(
+        student_id__in=Student.objects.using(using).values('pk'))
+    removed, _ = orphans.delete()
+    return written, removed
+
+
+def rename_related(instance, using='default'):
+    id_field, name_field, source = RELATED[type(instance)]
+    return (StudentDirectoryEntry.objects.using(using).filter(**{id_field: instance.pk})
+            .exclude(**{name_field: getattr(instance, source)})
+            .update(**{name_field: getattr(instance, source)}))
+
+
+def clear_related(model, pk, using='default'):
+    # Lớp bị xóa: Student.student_class về NULL (SET_NULL, không phát signal)
+    id_field, name_field, _ = RELATED[model]
+    return (StudentDirectoryEntry.objects.using(using).filter(**{id_field: pk})
+            .update(**{id_field: None, name_field: ''}))
+
+
+def check_directory(using='default', chunk_size=BATCH_SIZE):
+    """
+    So sánh danh bạ với dữ liệu gốc theo từng lô khóa chính.
+    Trả về (id sinh viên thiếu hoặc lệch, id dòng thừa).
+    """
+    stale, last_pk = [], 0
+    entries = StudentDirectoryEntry.objects.using(using)
+    compared = ['student_id', *SOURCE_FIELDS]
+    students = Student.objects.using(using).order_by('pk')
+    while True:
+        ids = list(students.filter(pk__gt=last_pk).values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            break
+        expected = {row['student_id']: row for row in source_rows(students.filter(pk__in=ids))}
+        actual = {row['student_id']: row for row in entries.filter(student_id__in=ids).values(*compared)}
+        stale.extend(pk for pk in ids if actual.get(pk) != expected.get(pk))
+        last_pk = ids[-1]
+    orphans = list(entries.exclude(student_id__in=Student.objects.using(using).values('pk'))
+                   .values_list('student_id', flat=True))
+    return stale, orphans
@@ -0,0 +1,130 @@
+# CollegeApp/enrollment.py
+"""
+Giữ chỗ lớp học phần khi nhiều sinh viên đăng ký cùng lúc.
+
+Mỗi lần đăng ký chiếm một chỗ bằng một UPDATE có điều kiện:
+
+    UPDATE courseoffering SET current_students = current_students + 1
+    WHERE id = %s AND is_active AND current_students < max_students
+
+Cơ sở dữ liệu kiểm tra điều kiện trên giá trị mới nhất của dòng nên không có
+đọc-sửa-ghi trong Python và không thể vượt quá max_students. UPDATE chạy đầu
+tiên trong transaction ngắn (UPDATE, INSERT đăng ký, COMMIT) để khóa dòng lớp học
+phần được giữ ít nhất có thể; nếu INSERT thất bại thì chỗ đã chiếm được hoàn lại
+cùng transaction.
+
+Gửi lại cùng một yêu cầu (cùng idempotency_key, hoặc sinh viên đã có đăng ký
+đang hiệu lực ở lớp đó) trả về đăng ký cũ và không chiếm thêm chỗ.
+"""
+import random
+import time
+
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CourseOffering, Enrollment
+
+MAX_RETRIES = 3
+
+
+class EnrollmentError(Exception):
+    code = 'enrollment_error'
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+class OfferingUnavailable(EnrollmentError):
+    code = 'offering_unavailable'
+
+
+class OfferingFull(EnrollmentError):
+    code = 'offering_full'
+
+
+class IdempotencyConflict(EnrollmentError):
+    code = 'idempotency_conflict'
+
+
+def _existing(student_id, offering_id, idempotency_key, using):
+    """Đăng ký đã có cho lần gửi lại, hoặc None."""
+    if idempotency_key is not None:
+        found = Enrollment.objects.using(using).filter(idempotency_key=idempotency_key).first()
+        if found is not None:
+            if (found.student_id, found.offering_id) != (student_id, offering_id):
+                raise IdempotencyConflict("Idempotency key đã được dùng cho một yêu cầu khác.")
+            return found
+    return (Enrollment.objects.using(using)
+            .filter(student_id=student_id, offering_id=offering_id, status='ENROLLED')
+            .first())
+
+
+def _claim_seat(offering_id, using):
+    claimed = (CourseOffering.objects.using(using)
+               .filter(pk=offering_id, is_active=True, current_students__lt=F('max_students'))
+               .update(current_students=F('current_students') + 1))
+    if claimed:
+        return
+    # Không chiếm được chỗ: chỉ đọc lại để báo đúng lý do
+    offering = CourseOffering.objects.using(using).filter(pk=offering_id).values('is_active').first()
+    if offering is None or not offering['is_active']:
+        raise OfferingUnavailable("Lớp học phần không tồn tại hoặc đã đóng.")
+    raise OfferingFull("Lớp học phần đã đủ số lượng.")
+
+
+def _retry(func):
+    """Thử lại khi gặp deadlock / hết thời gian chờ khóa (OperationalError)."""
+    for attempt in range(MAX_RETRIES):
+        try:
+            return func()
+        except OperationalError:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(random.uniform(0.005, 0.02) * (attempt + 1))
+
+
+def enroll(student_id, offering_id, idempotency_key=None, using='default'):
+    """Đăng ký sinh viên vào lớp học phần. Trả về (enrollment, created)."""
+    existing = _existing(student_id, offering_id, idempotency_key, using)
+    if existing is not None:
+        return existing, False
+
+    def attempt():
+        with transaction.atomic(using=using):
+            _claim_seat(offering_id, using)
+            # Đã từng hủy: dùng lại dòng cũ (unique student + offering)
+            reopened = (Enrollment.objects.using(using)
+                        .filter(student_id=student_id, offering_id=offering_id, status='DROPPED')
+                        .update(status='ENROLLED', enrolled_at=timezone.now(), dropped_at=None,
+                                idempotency_key=idempotency_key))
+            if reopened:
+                return Enrollment.objects.using(using).get(student_id=student_id, offering_id=offering_id)
+            return Enrollment.objects.using(using).create(
+                student_id=student_id, offering_id=offering_id, idempotency_key=idempotency_key)
+
+    try:
+        return _retry(attempt), True
+    except IntegrityError:
+        # Một yêu cầu trùng chạy song song đã ghi trước; chỗ đã chiếm được hoàn lại
+        existing = _existing(student_id, offering_id, idempotency_key, using)
+        if existing is None:
+            raise
+        return existing, False
+
+
+def drop(student_id, offering_id, using='default'):
+    """Hủy đăng ký và trả lại chỗ. Trả về False nếu không có đăng ký đang hiệu lực."""
+    def attempt():
+        with transaction.atomic(using=using):
+            dropped = (Enrollment.objects.using(using)
+                       .filter(student_id=student_id, offering_id=offering_id, status='ENROLLED')
+                       .update(status='DROPPED', dropped_at=timezone.now()))
+            if dropped:
+                (CourseOffering.objects.using(using)
+                 .filter(pk=offering_id, current_students__gt=0)
+                 .update(current_students=F('current_students') - 1))
+            return bool(dropped)
+
+    return _retry(attempt)
@@ -0,0 +1,332 @@
+# CollegeApp/exports.py
+"""
+Xuất Student / AdvisoryRegistration ra CSV hoặc XLSX dưới dạng luồng.
+
+Dữ liệu được đọc theo từng lô CHUNK_SIZE dòng bằng keyset trên khóa chính
+(WHERE pk > khóa cuối của lô trước ORDER BY pk LIMIT n), mỗi lô là một truy vấn
+values_list nên bộ nhớ không phụ thuộc số dòng và không cần cursor phía server
+(MySQL không hỗ trợ). Dòng tiêu đề được gửi trước truy vấn đầu tiên.
+
+XLSX được ghi trực tiếp bằng zipfile (không cần openpyxl): mỗi sheet là một mục
+nén ghi nối tiếp, chuỗi ghi inline nên không phải giữ bảng sharedStrings. Quá
+MAX_SHEET_ROWS dòng thì sang sheet mới.
+
+Cấu hình trong settings:
+    EXPORTS = {
+        'CHUNK_SIZE': 2000,
+    }
+"""
+import csv
+import datetime
+import decimal
+import io
+import re
+import uuid
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+MAX_SHEET_ROWS = 1048576  # giới hạn số dòng một sheet của Excel
+
+# (tiêu đề cột, lookup trên model); trường có choices được xuất theo nhãn
+STUDENT_COLUMNS = [
+    ("Mã số sinh viên", 'student_code'),
+    ("Họ", 'last_name'),
+    ("Tên đệm và tên", 'first_name'),
+    ("Giới tính", 'gender'),
+    ("Ngày sinh", 'date_of_birth'),
+    ("Nơi sinh", 'place_of_birth'),
+    ("CCCD", 'national_id_card'),
+    ("Email", 'email'),
+    ("Số điện thoại", 'phone'),
+    ("Địa chỉ", 'address'),
+    ("Quận/Huyện", 'district'),
+    ("Thành phố/ Tỉnh", 'city'),
+    ("Phụ huynh", 'parent_name'),
+    ("SĐT phụ huynh", 'parent_phone'),
+    ("Chương trình", 'program__name'),
+    ("Ngành học", 'major__name'),
+    ("Niên khóa", 'academic_year__name'),
+    ("Khoa", 'department__name'),
+    ("Lớp sinh hoạt", 'student_class__class_name'),
+    ("Tình trạng", 'student_status'),
+    ("GPA", 'GPA'),
+    ("Ngày nhập học", 'enrollment_date'),
+]
+REGISTRATION_COLUMNS = [
+    ("Mã đăng ký", 'id'),
+    ("Họ và tên", 'full_name'),
+    ("Số điện thoại", 'phone_number'),
+    ("Email", 'email'),
+    ("Địa chỉ", 'address'),
+    ("Ngành học quan tâm", 'major_of_interest__name'),
+    ("Đã tốt nghiệp", 'has_graduated'),
+    ("Ngày đăng ký", 'registration_date'),
+    ("Trạng thái tư vấn", 'status'),
+    ("Ghi chú", 'notes'),
+    ("Số lần gửi", 'submission_count'),
+    ("Trùng với đăng ký", 'duplicate_of_id'),
+]
+
+
+def get_config():
+    config = {
+        'CHUNK_SIZE': 2000,
+    }
+    config.update(getattr(settings, 'EXPORTS', {}))
+    return config
+
+
+def _resolve_field(model, lookup):
+    field = None
+    for name in lookup.split('__'):
+        field = model._meta.get_field(name)
+        model = field.related_model
+    return field
+
+
+def iter_chunks(queryset, columns, chunk_size=None):
+    """Các lô dòng (list tuple giá trị theo columns), đọc theo keyset trên khóa chính."""
+    chunk_size = chunk_size or get_config()['CHUNK_SIZE']
+    lookups = [lookup for _, lookup in columns]
+    labels = {}
+    for index, lookup in enumerate(lookups):
+        field = _resolve_field(queryset.model, lookup)
+        if field.choices:
+            labels[index] = dict(field.flatchoices)
+    rows = queryset.order_by('pk').values_list('pk', *lookups)
+    last_pk = None
+    while True:
+        chunk = list((rows if last_pk is None else rows.filter(pk__gt=last_pk))[:chunk_size])
+        if not chunk:
+            return
+        last_pk = chunk[-1][0]
+        if labels:
+            chunk = [tuple(labels[i].get(value, value) if i in labels else value
+                           for i, value in enumerate(row[1:])) for row in chunk]
+        else:
+            chunk = [row[1:] for row in chunk]
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+
+
+def _plain(value):
+    """Giá trị ô dạng văn bản (CSV)."""
+    if value is None:
+        return ''
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, bool):
+        return 'Có' if value else 'Không'
+    value = str(value)
+    # Chống chèn công thức khi mở bằng Excel; "+84..." hay "-1" vẫn giữ nguyên
+    if value[:1] in ('=', '+', '-', '@', '\t', '\r') and not value[1:].replace(' ', '').isdigit():
+        return "'" + value
+    return value
+
+
+def stream_csv(header, chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')  # BOM để Excel nhận UTF-8
+    writer.writerow(header)
+    yield buffer.getvalue().encode('utf-8')
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode('utf-8')
+
+
+# -- XLSX -----------------------------------------------------------------------
+
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{sheets}</Types>'
+)
+_SHEET_CONTENT_TYPE = ('<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                       'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets></workbook>'
+)
+_WORKBOOK_SHEET = '<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>'
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}<Relationship Id="rId0" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/></Relationships>'
+)
+_WORKBOOK_REL = ('<Relationship Id="rId{n}" '
+                 'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                 'Target="worksheets/sheet{n}.xml"/>')
+# Kiểu 0: mặc định, 1: ngày (numFmt 14), 2: ngày giờ, 3: tiêu đề in đậm
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '</styleSheet>'
+)
+_SHEET_START = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" state="frozen"/>'
+                '</sheetView></sheetViews><sheetData>')
+_SHEET_END = '</sheetData></worksheet>'
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell(reference, value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return f'<c r="{reference}"><v>{value}</v></c>'
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.make_naive(timezone.localtime(value))
+        serial = (value - _EXCEL_EPOCH) / datetime.timedelta(days=1)
+        return f'<c r="{reference}" s="2"><v>{serial:.6f}</v></c>'
+    if isinstance(value, datetime.date):
+        return f'<c r="{reference}" s="1"><v>{(value - _EXCEL_EPOCH.date()).days}</v></c>'
+    if isinstance(value, uuid.UUID):
+        value = str(value)
+    text = escape(_ILLEGAL_XML.sub('', str(value)))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class _ZipStream:
+    """Đích ghi chỉ nối thêm cho zipfile (không seek): giữ byte đã nén đến khi được lấy ra."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def stream_xlsx(header, chunks, sheet_name='Sheet'):
+    letters = [_column_letter(index) for index in range(len(header))]
+    header_xml = ''.join(
+        f'<c r="{letter}1" s="3" t="inlineStr"><is><t>{escape(str(title))}</t></is></c>'
+        for letter, title in zip(letters, header))
+    stream = _ZipStream()
+    archive = zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6)
+
+    def open_sheet(number):
+        sheet = archive.open(f'xl/worksheets/sheet{number}.xml', 'w', force_zip64=True)
+        sheet.write(f'{_SHEET_START}<row r="1">{header_xml}</row>'.encode('utf-8'))
+        return sheet
+
+    sheets, row_number = 1, 1
+    sheet = open_sheet(sheets)
+    yield stream.pop()
+    for rows in chunks:
+        lines = []
+        for row in rows:
+            if row_number >= MAX_SHEET_ROWS:
+                sheet.write(''.join(lines).encode('utf-8') + _SHEET_END.encode('utf-8'))
+                sheet.close()
+                lines = []
+                sheets += 1
+                sheet = open_sheet(sheets)
+                row_number = 1
+            row_number += 1
+            cells = ''.join(_cell(f'{letter}{row_number}', value) for letter, value in zip(letters, row))
+            lines.append(f'<row r="{row_number}">{cells}</row>')
+        sheet.write(''.join(lines).encode('utf-8'))
+        yield stream.pop()
+    sheet.write(_SHEET_END.encode('utf-8'))
+    sheet.close()
+    numbers = range(1, sheets + 1)
+    names = [sheet_name if n == 1 else f'{sheet_name} ({n})' for n in numbers]
+    archive.writestr('[Content_Types].xml', _CONTENT_TYPES.format(
+        sheets=''.join(_SHEET_CONTENT_TYPE.format(n=n) for n in numbers)))
+    archive.writestr('_rels/.rels', _ROOT_RELS)
+    archive.writestr('xl/workbook.xml', _WORKBOOK.format(
+        sheets=''.join(_WORKBOOK_SHEET.format(n=n, name=escape(name)) for n, name in zip(numbers, names))))
+    archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS.format(
+        sheets=''.join(_WORKBOOK_REL.format(n=n) for n in numbers)))
+    archive.writestr('xl/styles.xml', _STYLES)
+    archive.close()
+    yield stream.pop()
+
+
+def export_response(queryset, columns, file_format, name, chunk_size=None):
+    """StreamingHttpResponse xuất queryset theo columns ở định dạng 'csv' hoặc 'xlsx'."""
+    if file_format not in FORMATS:
+        raise ValueError(f"Định dạng xuất không hỗ trợ: {file_format}")
+    header = [title for title, _ in columns]
+    chunks = iter_chunks(queryset, columns, chunk_size)
+    if file_format == 'csv':
+        content = stream_csv(header, chunks)
+    else:
+        content = stream_xlsx(header, chunks, sheet_name=name)
+    response = StreamingHttpResponse(content, content_type=FORMATS[file_format])
+    filename = f"{name}-{timezone.localtime().strftime('%Y%m%d-%H%M%S')}.{file_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['X-Accel-Buffering'] = 'no'  # nginx gửi ngay từng lô thay vì gom cả file
+    response['Cache-Control'] = 'no-store'
+    return response
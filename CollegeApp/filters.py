@@ -0,0 +1,128 @@
+# CollegeApp/filters.py
+import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from .models import AdvisoryRegistration, Student
+
+
+def _choice_values(value, choices, name):
+    """Nhận một hoặc nhiều giá trị cách nhau bởi dấu phẩy, kiểm tra theo choices."""
+    values = [v.strip() for v in value.split(',') if v.strip()]
+    allowed = {key for key, _ in choices}
+    invalid = [v for v in values if v not in allowed]
+    if invalid:
+        raise serializers.ValidationError({name: f"Giá trị không hợp lệ: {', '.join(invalid)}"})
+    return values
+
+
+def _datetime_bound(value, name, end=False):
+    """
+    Trả về điều kiện lọc {lookup: giá trị} trên registration_date. Ngày không kèm giờ được đổi
+    thành khoảng [00:00, 00:00 ngày hôm sau) để vẫn dùng được index.
+    """
+    try:
+        moment = parse_datetime(value)
+        day = None if moment else parse_date(value)
+    except ValueError:
+        moment = day = None
+    if moment is None and day is None:
+        raise serializers.ValidationError({name: "Ngày/giờ không hợp lệ (YYYY-MM-DD hoặc ISO 8601)."})
+    if moment is None:
+        if end:
+            day += datetime.timedelta(days=1)
+        moment = datetime.datetime.combine(day, datetime.time.min)
+        lookup = 'registration_date__lt' if end else 'registration_date__gte'
+    else:
+        lookup = 'registration_date__lte' if end else 'registration_date__gte'
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return {lookup: moment}
+
+
+class AdvisoryRegistrationFilter(BaseFilterBackend):
+    """
+    Lọc danh sách đăng ký tư vấn theo tham số query:
+    status, has_graduated (một hoặc nhiều giá trị, cách nhau bởi dấu phẩy),
+    major_of_interest (id ngành), is_duplicate (true/false),
+    registered_from / registered_to (ngày hoặc ISO 8601).
+    Mỗi bộ lọc đi kèm index ghép (cột lọc, registration_date, id) trên model.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if params.get('status'):
+            queryset = queryset.filter(status__in=_choice_values(
+                params['status'], AdvisoryRegistration.STATUS_CHOICES, 'status'))
+        if params.get('has_graduated'):
+            queryset = queryset.filter(has_graduated__in=_choice_values(
+                params['has_graduated'], AdvisoryRegistration.GRADUATED_CHOICES, 'has_graduated'))
+        if params.get('major_of_interest'):
+            try:
+                major_ids = [int(v) for v in params['major_of_interest'].split(',') if v.strip()]
+            except ValueError:
+                raise serializers.ValidationError({'major_of_interest': "Id ngành học không hợp lệ."})
+            queryset = queryset.filter(major_of_interest_id__in=major_ids)
+
+        if params.get('is_duplicate') in ('true', 'false'):
+            queryset = queryset.filter(duplicate_of__isnull=params['is_duplicate'] == 'false')
+
+        if params.get('registered_from'):
+            queryset = queryset.filter(**_datetime_bound(params['registered_from'], 'registered_from'))
+        if params.get('registered_to'):
+            queryset = queryset.filter(**_datetime_bound(params['registered_to'], 'registered_to', end=True))
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': name, 'required': False, 'in': 'query', 'description': description,
+             'schema': {'type': 'string'}}
+            for name, description in [
+                ('status', 'NEW, CONTACTED, CONSULTED (có thể nhiều giá trị, cách nhau bởi dấu phẩy)'),
+                ('has_graduated', 'THCS, THPT, TC, CD, DH'),
+                ('major_of_interest', 'Id ngành học quan tâm'),
+                ('is_duplicate', 'true/false: chỉ lấy đăng ký bị đánh dấu trùng / không trùng'),
+                ('registered_from', 'Từ ngày (YYYY-MM-DD hoặc ISO 8601)'),
+                ('registered_to', 'Đến ngày (YYYY-MM-DD hoặc ISO 8601)'),
+            ]
+        ]
+
+
+class StudentFilter(BaseFilterBackend):
+    """
+    Lọc sinh viên theo tham số query: student_status (một hoặc nhiều giá trị, cách nhau
+    bởi dấu phẩy), major, academic_year, department, student_class (id, có thể nhiều).
+    """
+    id_params = ('major', 'academic_year', 'department', 'student_class')
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if params.get('student_status'):
+            queryset = queryset.filter(student_status__in=_choice_values(
+                params['student_status'], Student.STUDENT_STATUS_CHOICES, 'student_status'))
+        for name in self.id_params:
+            if params.get(name):
+                try:
+                    ids = [int(v) for v in params[name].split(',') if v.strip()]
+                except ValueError:
+                    raise serializers.ValidationError({name: "Id không hợp lệ."})
+                queryset = queryset.filter(**{f'{name}_id__in': ids})
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': name, 'required': False, 'in': 'query', 'description': description,
+             'schema': {'type': 'string'}}
+            for name, description in [
+                ('student_status', 'DANG_HOC, DA_TOT_NGHIEP, ... (có thể nhiều giá trị, cách nhau bởi dấu phẩy)'),
+                ('major', 'Id ngành học'),
+                ('academic_year', 'Id niên khóa'),
+                ('department', 'Id khoa'),
+                ('student_class', 'Id lớp sinh hoạt'),
+            ]
+        ]
@@ -0,0 +1,87 @@
+# CollegeApp/generations.py
+"""
+Số thế hệ (generation) của từng model, lưu trong cache Django (settings.CACHES).
+
+Mỗi lần model thay đổi (save/delete/M2M, xem signals.py) số thế hệ tăng lên, nên
+mọi dữ liệu dẫn xuất gắn với số thế hệ cũ (response đã cache, đồ thị tiên quyết...)
+tự hết hiệu lực mà không cần xóa từng khóa. Giá trị là thời điểm thay đổi tính bằng
+micro giây (luôn tăng: max(cũ + 1, bây giờ)), nên cũng dùng được cho Last-Modified.
+
+Khi khóa bị mất (khởi động lại, cache bị đẩy ra) thế hệ được khởi tạo lại bằng thời
+điểm hiện tại: dữ liệu dẫn xuất cũ đều bị coi là cũ, không bao giờ bị dùng nhầm.
+Với nhiều tiến trình cần một cache dùng chung (Redis/Memcached) để các tiến trình
+thấy thay đổi của nhau. Với cache riêng từng tiến trình (LocMemCache) số thế hệ chỉ
+sống LOCAL_TTL giây, nên tiến trình không thấy thay đổi của tiến trình khác vẫn dùng
+dữ liệu cũ tối đa chừng đó; system check CollegeApp.W001 cảnh báo cấu hình này.
+
+Cấu hình trong settings:
+    GENERATIONS = {
+        'LOCAL_TTL': 300,  # giây, chỉ áp dụng khi cache không dùng chung
+    }
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+KEY_PREFIX = 'generation'
+LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def get_config():
+    config = {
+        'LOCAL_TTL': 300,
+    }
+    config.update(getattr(settings, 'GENERATIONS', {}))
+    return config
+
+
+def cache_is_shared():
+    """Cache mặc định có được các tiến trình dùng chung hay không."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LOCAL_BACKENDS)
+
+
+def _timeout():
+    return None if cache_is_shared() else get_config()['LOCAL_TTL']
+
+
+def _key(model):
+    return f'{KEY_PREFIX}:{model._meta.label_lower}'
+
+
+def _now():
+    return time.time_ns() // 1000
+
+
+def get_generations(models):
+    """{model: số thế hệ} trong một lần đọc cache."""
+    keys = {_key(model): model for model in models}
+    values = cache.get_many(list(keys))
+    result = {}
+    for key, model in keys.items():
+        value = values.get(key)
+        if value is None:
+            now = _now()
+            cache.add(key, now, timeout=_timeout())
+            # DummyCache không lưu gì: mỗi lần đọc là một thế hệ mới, không bao giờ dùng dữ liệu cũ
+            value = cache.get(key, now)
+        result[model] = value
+    return result
+
+
+def get_generation(model):
+    return get_generations([model])[model]
+
+
+def bump(*models):
+    """Tăng số thế hệ của các model (gọi sau khi dữ liệu đã thay đổi)."""
+    now = _now()
+    current = cache.get_many([_key(model) for model in models])
+    cache.set_many({_key(model): max(current.get(_key(model), 0) + 1, now) for model in models}, timeout=_timeout())
+
+
+def last_modified(generations):
+    """Thời điểm thay đổi gần nhất (giây, số nguyên) của một nhóm số thế hệ."""
+    return max(generations) // 1_000_000 if generations else None
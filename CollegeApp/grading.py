@@ -0,0 +1,50 @@
+# CollegeApp/grading.py
+"""
+Quy đổi điểm và xếp loại học lực (không phụ thuộc model).
+
+Điểm học phần chấm theo thang 10, quy đổi sang điểm chữ và thang 4 theo quy chế
+đào tạo tín chỉ. GPA = tổng (điểm thang 4 x tín chỉ) / tổng tín chỉ.
+"""
+from decimal import Decimal
+
+# (điểm thang 10 tối thiểu, điểm chữ, điểm thang 4)
+GRADE_SCALE = [
+    (Decimal('8.5'), 'A', Decimal('4.0')),
+    (Decimal('8.0'), 'B+', Decimal('3.5')),
+    (Decimal('7.0'), 'B', Decimal('3.0')),
+    (Decimal('6.5'), 'C+', Decimal('2.5')),
+    (Decimal('5.5'), 'C', Decimal('2.0')),
+    (Decimal('5.0'), 'D+', Decimal('1.5')),
+    (Decimal('4.0'), 'D', Decimal('1.0')),
+    (Decimal('0'), 'F', Decimal('0.0')),
+]
+
+# (GPA tối thiểu, xếp loại), dùng chung cho Student.academic_standing và thống kê
+STANDING_THRESHOLDS = [
+    (3.6, "Xuất sắc"),
+    (3.2, "Giỏi"),
+    (2.5, "Khá"),
+    (2.0, "Trung bình"),
+    (1.5, "Cảnh báo học vụ"),
+    (0.0, "Buộc thôi học / Đình chỉ"),
+]
+NO_GPA_STANDING = "Chưa có thông tin GPA"
+
+
+def convert_score(score):
+    """Điểm thang 10 -> (điểm chữ, điểm thang 4)."""
+    score = Decimal(str(score))
+    for minimum, letter, point in GRADE_SCALE:
+        if score >= minimum:
+            return letter, point
+    return GRADE_SCALE[-1][1], GRADE_SCALE[-1][2]
+
+
+def standing_for(gpa):
+    if gpa is None:
+        return NO_GPA_STANDING
+    gpa = float(gpa)
+    for minimum, label in STANDING_THRESHOLDS:
+        if gpa >= minimum:
+            return label
+    return STANDING_THRESHOLDS[-1][1]
@@ -0,0 +1,185 @@
+# CollegeApp/hashing.py
+"""
+Băm mật khẩu (make_password) trong một pool tiến trình dùng hết các lõi CPU.
+
+PBKDF2 cố tình chậm nên nếu băm ngay trên luồng request sẽ chặn worker WSGI.
+Dùng `hash_password()` cho từng tài khoản (đồng bộ) và `submit_passwords()`
+để băm cả lô một cách bất đồng bộ (ví dụ khi nhập hàng loạt).
+
+Cấu hình trong settings:
+    PASSWORD_HASHING_WORKERS    số tiến trình (None = số lõi CPU, 0 = băm ngay trong tiến trình hiện tại)
+    PASSWORD_HASHING_BATCH_SIZE số mật khẩu gửi cho một tiến trình mỗi lần
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+RATE_WINDOW_SECONDS = 60
+
+
+def _init_worker(settings_module):
+    # Tiến trình con chỉ cần settings (PASSWORD_HASHERS), không cần django.setup()
+    if settings_module:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+
+def _hash_batch(raw_passwords):
+    return [make_password(raw) for raw in raw_passwords]
+
+
+class PasswordHashingService:
+    def __init__(self, workers=None, batch_size=16):
+        self.workers = (os.cpu_count() or 1) if workers is None else max(0, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self._executor = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._recent = deque()  # (thời điểm, số mật khẩu đã băm)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # spawn: không fork một tiến trình WSGI đang chạy nhiều luồng
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE'),),
+                )
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, done, failed=0):
+        now = time.monotonic()
+        with self._lock:
+            self._queued -= done + failed
+            self._completed += done
+            self._failed += failed
+            if done:
+                self._recent.append((now, done))
+            while self._recent and self._recent[0][0] < now - RATE_WINDOW_SECONDS:
+                self._recent.popleft()
+
+    def submit_passwords(self, raw_passwords):
+        """
+        Gửi một lô mật khẩu đi băm, trả về Future cho danh sách mã băm theo đúng thứ tự.
+        """
+        raw_passwords = list(raw_passwords)
+        result = Future()
+        with self._lock:
+            self._queued += len(raw_passwords)
+
+        if not raw_passwords:
+            result.set_result([])
+            return result
+
+        if self.workers == 0:
+            try:
+                hashes = _hash_batch(raw_passwords)
+            except Exception as exc:
+                self._record(0, len(raw_passwords))
+                result.set_exception(exc)
+            else:
+                self._record(len(hashes))
+                result.set_result(hashes)
+            return result
+
+        batches = [raw_passwords[i:i + self.batch_size]
+                   for i in range(0, len(raw_passwords), self.batch_size)]
+        parts = [None] * len(batches)
+        remaining = [len(batches)]
+        part_lock = threading.Lock()
+
+        def on_done(index, size, future):
+            exc = future.exception()
+            if exc is not None:
+                self._record(0, size)
+                if isinstance(exc, BrokenProcessPool):
+                    self._reset_executor()
+                if not result.done():
+                    result.set_exception(exc)
+                return
+            self._record(size)
+            with part_lock:
+                parts[index] = future.result()
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished and not result.done():
+                result.set_result([h for part in parts for h in part])
+
+        submitted = 0
+        try:
+            executor = self._get_executor()
+            for index, batch in enumerate(batches):
+                future = executor.submit(_hash_batch, batch)
+                submitted += len(batch)
+                future.add_done_callback(lambda f, i=index, n=len(batch): on_done(i, n, f))
+        except (BrokenProcessPool, RuntimeError) as exc:
+            self._reset_executor()
+            self._record(0, len(raw_passwords) - submitted)
+            if not result.done():
+                result.set_exception(exc)
+        return result
+
+    def hash_passwords(self, raw_passwords):
+        return self.submit_passwords(raw_passwords).result()
+
+    def hash_password(self, raw_password):
+        return self.hash_passwords([raw_password])[0]
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            recent = [(t, n) for t, n in self._recent if t >= now - RATE_WINDOW_SECONDS]
+            window = max(now - recent[0][0], 1.0) if recent else 1.0
+            hashed = sum(n for _, n in recent)
+            return {
+                'workers': self.workers,
+                'queue_depth': self._queued,
+                'completed': self._completed,
+                'failed': self._failed,
+                'hashes_per_second': round(hashed / window, 2),
+            }
+
+    def shutdown(self):
+        self._reset_executor()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_hashing_service():
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = PasswordHashingService(
+                    workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', None),
+                    batch_size=getattr(settings, 'PASSWORD_HASHING_BATCH_SIZE', 16),
+                )
+                atexit.register(_service.shutdown)
+    return _service
+
+
+def hash_password(raw_password):
+    return get_hashing_service().hash_password(raw_password)
+
+
+def submit_passwords(raw_passwords):
+    return get_hashing_service().submit_passwords(raw_passwords)
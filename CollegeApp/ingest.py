@@ -0,0 +1,417 @@
+# CollegeApp/ingest.py
+"""
+Chế độ ghi trễ (write-behind) cho đăng ký tư vấn công khai.
+
+Đăng ký hợp lệ được ghi thêm (append) vào một file spool JSONL trên đĩa và API trả
+về mã biên nhận ngay. Một luồng nền đọc spool và INSERT theo lô. Vị trí đã ghi
+xuống DB được lưu trong file `.offset` đi kèm; khi tiến trình bị dừng đột ngột,
+phần còn lại được ghi bù khi khởi động lại hoặc bằng lệnh `flush_registration_spool`.
+Mỗi dòng mang `submission_id` (unique) nên ghi lại nhiều lần không tạo bản trùng.
+Mỗi lần ghi xuống DB (và làm rỗng file) giữ khóa flock trên file spool, nên tiến
+trình chủ và lệnh ghi bù không bao giờ đọc cùng một file đồng thời.
+
+Cấu hình trong settings:
+    REGISTRATION_WRITE_BEHIND = {
+        'ENABLED': False,
+        'SPOOL_DIR': BASE_DIR / 'var' / 'registration_spool',
+        'BATCH_SIZE': 200,        # số dòng mỗi lần INSERT
+        'FLUSH_INTERVAL': 2.0,    # giây giữa hai lần ghi
+        'FSYNC': True,            # fsync sau mỗi đăng ký
+        'RECOVER_ON_START': True, # ghi bù spool của tiến trình đã dừng
+    }
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: không có flock, chỉ dựa vào kiểm tra pid
+    fcntl = None
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models.constants import OnConflict
+from django.db.models.fields import AutoField
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import dedup
+from .models import AdvisoryRegistration, Major
+
+logger = logging.getLogger(__name__)
+
+SPOOL_FIELDS = ['full_name', 'phone_number', 'email', 'address', 'has_graduated']
+ROTATE_BYTES = 1024 * 1024
+MAJOR_IDS_TTL = 60
+
+
+def get_config():
+    config = {
+        'ENABLED': False,
+        'SPOOL_DIR': Path(settings.BASE_DIR) / 'var' / 'registration_spool',
+        'BATCH_SIZE': 200,
+        'FLUSH_INTERVAL': 2.0,
+        'FSYNC': True,
+        'RECOVER_ON_START': True,
+    }
+    config.update(getattr(settings, 'REGISTRATION_WRITE_BEHIND', {}))
+    return config
+
+
+def write_behind_enabled():
+    return bool(get_config()['ENABLED'])
+
+
+_major_ids = (0.0, frozenset())
+
+
+def known_major_ids():
+    """Tập id Major, làm mới tối đa mỗi MAJOR_IDS_TTL giây (thay cho một truy vấn mỗi đăng ký)."""
+    global _major_ids
+    loaded_at, ids = _major_ids
+    if time.monotonic() - loaded_at > MAJOR_IDS_TTL:
+        ids = frozenset(Major.objects.values_list('pk', flat=True))
+        _major_ids = (time.monotonic(), ids)
+    return ids
+
+
+# -- Ghi spool xuống DB ------------------------------------------------------
+
+def _offset_path(path):
+    return path.with_name(path.name + '.offset')
+
+
+def read_offset(path):
+    try:
+        return int(_offset_path(path).read_text() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def write_offset(path, offset):
+    # tên tạm riêng cho từng tiến trình / luồng để hai bên ghi không giẫm lên nhau
+    tmp = path.with_name(f'{path.name}.offset.{os.getpid()}-{threading.get_ident()}.tmp')
+    tmp.write_text(str(offset))
+    os.replace(tmp, _offset_path(path))
+
+
+def insert_registrations(records, using='default'):
+    """
+    INSERT nhiều dòng, bỏ qua dòng có submission_id đã tồn tại.
+    Dùng INSERT raw để giữ nguyên registration_date là thời điểm nhận đăng ký
+    (bulk_create sẽ ghi đè bằng auto_now_add).
+    """
+    major_ids = {r['major_of_interest_id'] for r in records if r.get('major_of_interest_id')}
+    existing_majors = set(Major.objects.using(using).filter(pk__in=major_ids).values_list('pk', flat=True))
+
+    objs = []
+    for record in records:
+        obj = AdvisoryRegistration(**{name: record.get(name) for name in SPOOL_FIELDS if name in record})
+        obj.submission_id = uuid.UUID(record['submission_id'])
+        obj.registration_date = parse_datetime(record['submitted_at'])
+        obj.status = 'NEW'
+        # Ngành bị xóa trong lúc chờ ghi: giữ đăng ký, bỏ ngành
+        major_id = record.get('major_of_interest_id')
+        obj.major_of_interest_id = major_id if major_id in existing_majors else None
+        obj.normalize_contact()
+        objs.append(obj)
+    flagged = []
+    if dedup.dedup_enabled():
+        objs, flagged = _drop_duplicates(objs, using=using)
+    if not objs:
+        return 0
+
+    fields = [f for f in AdvisoryRegistration._meta.concrete_fields if not isinstance(f, AutoField)]
+    _insert(objs, fields, using)
+    if flagged:
+        # Trùng trong cùng lô (POLICY='flag'): trỏ duplicate_of tới dòng vừa INSERT
+        first_ids = dict(AdvisoryRegistration.objects.using(using)
+                         .filter(submission_id__in=[first.submission_id for _, first in flagged])
+                         .values_list('submission_id', 'pk'))
+        for obj, first in flagged:
+            obj.duplicate_of_id = first.duplicate_of_id or first_ids.get(first.submission_id)
+        _insert([obj for obj, _ in flagged], fields, using)
+    if dedup.dedup_enabled():
+        detector = dedup.get_detector()
+        for obj in objs:
+            detector.remember(obj.phone_normalized, obj.email_normalized)
+    return len(objs) + len(flagged)
+
+
+def _insert(objs, fields, using):
+    ops = connections[using].ops
+    batch_size = max(ops.bulk_batch_size(fields, objs), 1)
+    for start in range(0, len(objs), batch_size):
+        AdvisoryRegistration._base_manager.using(using)._insert(
+            objs[start:start + batch_size], fields=fields, raw=True,
+            on_conflict=OnConflict.IGNORE, using=using)
+
+
+def _drop_duplicates(objs, using='default'):
+    """
+    Áp dụng phát hiện trùng cho một lô. Trả về (các đối tượng cần INSERT, [(lần gửi
+    trùng, lần gửi đầu)] cần INSERT sau lần gửi đầu).
+
+    Dòng có submission_id đã nằm trong DB (ghi bù spool sau sự cố) bị bỏ trước, để
+    không bị coi là bản trùng của chính nó. Lần gửi trùng với lần gửi trước trong
+    cùng lô hoặc với đăng ký đã có trong DB được gộp (merge) hoặc lưu kèm
+    duplicate_of (flag) theo cấu hình.
+    """
+    stored = set(AdvisoryRegistration.objects.using(using)
+                 .filter(submission_id__in=[obj.submission_id for obj in objs])
+                 .values_list('submission_id', flat=True))
+    merge = dedup.get_config()['POLICY'] == 'merge'
+    firsts, flagged, seen = [], [], {}
+    for obj in objs:
+        if obj.submission_id in stored:
+            continue
+        keys = [k for k in (obj.phone_normalized and 'p:' + obj.phone_normalized,
+                            obj.email_normalized and 'e:' + obj.email_normalized) if k]
+        first = next((seen[k] for k in keys if k in seen), None)
+        if first is not None:
+            if merge:
+                first.submission_count += 1
+                first.last_submitted_at = obj.registration_date
+            else:
+                flagged.append((obj, first))
+            continue
+        for k in keys:
+            seen[k] = obj
+        firsts.append(obj)
+
+    originals = dedup.get_detector().find_originals(
+        [(obj.phone_normalized, obj.email_normalized) for obj in firsts])
+    if not originals:
+        return firsts, flagged
+    to_insert = []
+    for obj in firsts:
+        original = originals.get((obj.phone_normalized, obj.email_normalized))
+        if original is None:
+            to_insert.append(obj)
+        elif merge:
+            # Lưu ý: sự cố giữa lúc gộp và lúc ghi offset vẫn có thể làm lần gửi này được đếm lại
+            dedup.merge_into(original, count=obj.submission_count,
+                             major_id=obj.major_of_interest_id, address=obj.address)
+        else:
+            obj.duplicate_of_id = original.pk
+            to_insert.append(obj)
+    return to_insert, flagged
+
+
+@contextmanager
+def spool_lock(path, blocking=True):
+    """
+    Khóa độc quyền (flock) một file spool trong lúc ghi xuống DB và làm rỗng file.
+    Trả về True nếu đã giữ khóa, False nếu file không tồn tại hoặc (blocking=False) đang bị khóa.
+    """
+    try:
+        handle = open(path, 'rb')
+    except FileNotFoundError:
+        yield False
+        return
+    with handle:
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+        yield True  # đóng file là nhả khóa
+
+
+def flush_spool_file(path, batch_size, using='default'):
+    """Ghi phần chưa ghi của một file spool xuống DB theo lô. Trả về số dòng đã xử lý."""
+    offset = read_offset(path)
+    processed = 0
+    try:
+        stream = open(path, 'rb')
+    except FileNotFoundError:
+        return 0
+    with stream:
+        if offset > os.fstat(stream.fileno()).st_size:
+            offset = 0  # file đã bị làm rỗng sau lần ghi offset cuối
+        stream.seek(offset)
+        while True:
+            records = []
+            end = offset
+            while len(records) < batch_size:
+                line = stream.readline()
+                if not line.endswith(b'\n'):
+                    # hết file, hoặc dòng đang được ghi dở
+                    break
+                end += len(line)
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.error("Bỏ qua dòng spool hỏng tại %s:%s", path, end - len(line))
+            if end == offset:
+                break
+            insert_registrations(records, using=using)
+            write_offset(path, end)
+            processed += len(records)
+            stream.seek(end)
+            offset = end
+    return processed
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError, ValueError):
+        return True
+    return True
+
+
+def spool_files(directory):
+    return sorted(Path(directory).glob('registrations-*.jsonl'))
+
+
+def flush_all(directory, batch_size, using='default', own_path=None):
+    """
+    Ghi bù các file spool của tiến trình đã dừng (và `own_path` nếu có) rồi xóa chúng
+    khi đã ghi hết. File của tiến trình còn sống do chính tiến trình đó ghi, không
+    đụng tới; file đang bị tiến trình ghi bù khác khóa thì bỏ qua. Trả về tổng số dòng
+    đã xử lý.
+    """
+    total = 0
+    for path in spool_files(directory):
+        own = path == own_path
+        if not own:
+            try:
+                pid = int(path.stem.split('-')[1])
+            except (IndexError, ValueError):
+                continue
+            if _pid_alive(pid):
+                continue
+        with spool_lock(path, blocking=own) as locked:
+            if not locked:
+                continue
+            total += flush_spool_file(path, batch_size, using=using)
+            if not own and read_offset(path) >= path.stat().st_size:
+                path.unlink(missing_ok=True)
+                _offset_path(path).unlink(missing_ok=True)
+    return total
+
+
+# -- Spool của tiến trình hiện tại --------------------------------------------
+
+class RegistrationSpool:
+    def __init__(self, directory, batch_size=200, flush_interval=2.0, fsync=True, recover_on_start=True):
+        self.directory = Path(directory)
+        self.path = self.directory / f'registrations-{os.getpid()}.jsonl'
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.recover_on_start = recover_on_start
+        self._lock = threading.Lock()
+        self._file = None
+        self._unflushed = 0
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._flusher = None
+
+    def append(self, validated_data):
+        """Ghi một đăng ký đã kiểm tra vào spool, trả về mã biên nhận."""
+        receipt = uuid.uuid4()
+        major = validated_data.get('major_of_interest')
+        record = {name: validated_data.get(name) for name in SPOOL_FIELDS if name in validated_data}
+        record.update({
+            'submission_id': str(receipt),
+            'submitted_at': timezone.now().isoformat(),
+            'major_of_interest_id': major.pk if major is not None else None,
+        })
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            if self._file is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'ab')
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._unflushed += 1
+            if self._unflushed >= self.batch_size:
+                self._wakeup.set()
+        self._ensure_flusher()
+        return receipt
+
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run, name='registration-spool-flusher', daemon=True)
+                self._flusher.start()
+                atexit.register(self.stop)
+
+    def _run(self):
+        if self.recover_on_start:
+            self._flush(recover=True)
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._flush()
+
+    def _flush(self, recover=False):
+        try:
+            if recover:
+                flush_all(self.directory, self.batch_size, own_path=self.path)
+            else:
+                with spool_lock(self.path) as locked:
+                    if locked:
+                        flush_spool_file(self.path, self.batch_size)
+                        self._rotate()
+        except Exception:
+            # DB tạm thời lỗi: dữ liệu vẫn nằm trong spool, lần sau ghi tiếp
+            logger.exception("Không ghi được spool đăng ký tư vấn %s", self.path)
+        finally:
+            connection.close()
+
+    def _rotate(self):
+        with self._lock:
+            self._unflushed = 0
+            if self._file is None or self._file.tell() < ROTATE_BYTES:
+                return
+            if read_offset(self.path) < self._file.tell():
+                return
+            # Đã ghi hết xuống DB: làm rỗng file thay vì để nó lớn mãi.
+            # Ghi offset trước; nếu dừng giữa chừng thì chỉ ghi lại các dòng đã có (bị bỏ qua).
+            write_offset(self.path, 0)
+            self._file.truncate(0)
+            self._file.seek(0)
+
+    def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=self.flush_interval + 5)
+        self._flush()
+
+
+_spool = None
+_spool_lock = threading.Lock()
+
+
+def get_spool():
+    global _spool
+    if _spool is None or _spool.path.stem != f'registrations-{os.getpid()}':
+        with _spool_lock:
+            if _spool is None or _spool.path.stem != f'registrations-{os.getpid()}':
+                config = get_config()
+                _spool = RegistrationSpool(
+                    config['SPOOL_DIR'],
+                    batch_size=config['BATCH_SIZE'],
+                    flush_interval=config['FLUSH_INTERVAL'],
+                    fsync=config['FSYNC'],
+                    recover_on_start=config['RECOVER_ON_START'],
+                )
+    return _spool
@@ -0,0 +1,120 @@
+# CollegeApp/loaders.py
+"""
+Nạp quan hệ theo lô cho serializer (kiểu DataLoader).
+
+Serializer khai báo quan hệ bằng BatchedRelatedField và dùng BatchedListSerializer
+làm list_serializer_class. Khi serialize một trang, các khóa ngoại của cả trang
+được gom lại và mỗi model liên quan chỉ được truy vấn một lần, thay vì một truy
+vấn cho mỗi dòng (N+1). Khi serialize một đối tượng lẻ, quan hệ được nạp theo yêu cầu.
+
+    class AdvisoryRegistrationSerializer(serializers.ModelSerializer):
+        major_of_interest = BatchedRelatedField(MajorSerializer)
+
+        class Meta:
+            list_serializer_class = BatchedListSerializer
+"""
+from django.db import models
+from rest_framework import serializers
+
+CONTEXT_KEY = '_batch_loaders'
+
+
+class BatchLoader:
+    """Nạp đối tượng theo khóa chính, các khóa đang chờ được gom vào một truy vấn."""
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self._cache = {}
+        self._pending = set()
+
+    def prime(self, keys):
+        self._pending.update(key for key in keys if key is not None and key not in self._cache)
+
+    def dispatch(self):
+        if not self._pending:
+            return
+        keys, self._pending = self._pending, set()
+        found = self.queryset.in_bulk(keys)
+        for key in keys:
+            self._cache[key] = found.get(key)
+
+    def load(self, key):
+        if key is None:
+            return None
+        if key not in self._cache:
+            self._pending.add(key)
+            self.dispatch()
+        return self._cache[key]
+
+    def load_many(self, keys):
+        self.prime(keys)
+        self.dispatch()
+        return [self._cache[key] for key in keys if key is not None]
+
+
+def get_loader(context, queryset):
+    """Một loader cho mỗi model trong phạm vi một lần serialize (dùng chung context)."""
+    loaders = context.setdefault(CONTEXT_KEY, {})
+    label = queryset.model._meta.label
+    if label not in loaders:
+        loaders[label] = BatchLoader(queryset)
+    return loaders[label]
+
+
+class BatchedRelatedField(serializers.Field):
+    """
+    Trường chỉ đọc hiển thị đối tượng liên quan (ForeignKey/OneToOne) bằng
+    `serializer_class`, lấy qua BatchLoader thay vì truy cập thuộc tính quan hệ.
+    """
+
+    def __init__(self, serializer_class, queryset=None, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.serializer_class = serializer_class
+        self.queryset = queryset
+        self._serializer = None
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        model_field = parent.Meta.model._meta.get_field(self.source)
+        self.attname = model_field.attname
+        if self.queryset is None:
+            self.queryset = model_field.related_model._default_manager.all()
+
+    @property
+    def serializer(self):
+        if self._serializer is None:
+            self._serializer = self.serializer_class(context=self.context)
+        return self._serializer
+
+    @property
+    def loader(self):
+        return get_loader(self.context, self.queryset)
+
+    def get_attribute(self, instance):
+        # Chỉ đọc cột khóa ngoại, không kích hoạt truy vấn quan hệ
+        return getattr(instance, self.attname)
+
+    def prime(self, instances):
+        """Nạp trước quan hệ cho cả danh sách, kể cả các BatchedRelatedField lồng bên trong."""
+        related = self.loader.load_many({getattr(obj, self.attname) for obj in instances})
+        prime_batched_fields(self.serializer, [obj for obj in related if obj is not None])
+
+    def to_representation(self, value):
+        obj = self.loader.load(value)
+        return None if obj is None else self.serializer.to_representation(obj)
+
+
+def prime_batched_fields(serializer, instances):
+    if not instances:
+        return
+    for field in serializer.fields.values():
+        if isinstance(field, BatchedRelatedField):
+            field.prime(instances)
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        prime_batched_fields(self.child, items)
+        return super().to_representation(items)
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from CollegeApp import benchmark
+
+
+class Command(BaseCommand):
+    help = ("Đo độ trễ p50/p95/p99, thông lượng và số câu SQL mỗi request của các API chính trên "
+            "dữ liệu của seed_college; ghi kết quả JSON để so sánh giữa các commit.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenarios', default=','.join(benchmark.SCENARIOS),
+                            help=f"Các kịch bản, cách nhau bởi dấu phẩy ({', '.join(benchmark.SCENARIOS)}).")
+        parser.add_argument('--requests', type=int, default=200, help="Số request đo cho mỗi kịch bản.")
+        parser.add_argument('--concurrency', type=int, default=8, help="Số client đồng thời.")
+        parser.add_argument('--warmup', type=int, default=10, help="Số request chạy trước, không tính.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--base-url', default=None,
+                            help="Gửi HTTP tới server này (vd. http://127.0.0.1:8000) thay vì gọi trong tiến trình.")
+        parser.add_argument('--host', default='localhost',
+                            help="Host của request trong tiến trình (phải thuộc ALLOWED_HOSTS).")
+        parser.add_argument('--output-dir', default=None, help="Thư mục lưu kết quả (mặc định var/bench).")
+        parser.add_argument('--no-save', action='store_true', help="Không ghi file kết quả.")
+        parser.add_argument('--compare', default=None,
+                            help="File kết quả để so sánh; 'latest' = lần chạy trước trong --output-dir.")
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = sorted(set(names) - set(benchmark.SCENARIOS))
+        if unknown:
+            raise CommandError(f"Kịch bản không tồn tại: {', '.join(unknown)}")
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--requests và --concurrency phải >= 1.")
+        try:
+            fixtures = benchmark.Fixtures()
+        except benchmark.BenchmarkError as exc:
+            raise CommandError(str(exc))
+        transport = (benchmark.HttpTransport(options['base_url']) if options['base_url']
+                     else benchmark.InProcessTransport(options['host']))
+        directory = Path(options['output_dir'] or Path(settings.BASE_DIR) / 'var' / 'bench')
+
+        meta = benchmark.metadata(transport, fixtures, requests=options['requests'],
+                                  concurrency=options['concurrency'], seed=options['seed'])
+        self.stdout.write(f"Commit {meta['commit']}, {meta['database']}, {transport.name}, "
+                          f"{options['concurrency']} client, dữ liệu: "
+                          + ", ".join(f"{label} {count}" for label, count in meta['dataset'].items()))
+        self.stdout.write(f"{'kịch bản':<22}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'SQL':>7}{'lỗi':>6}")
+        results = []
+        for name in names:
+            result = benchmark.run_scenario(transport, fixtures, name, options['requests'],
+                                            concurrency=options['concurrency'], warmup=options['warmup'],
+                                            seed=options['seed'])
+            results.append(result)
+            latency = result['latency_ms']
+            queries = f"{result['queries']['mean']:.1f}" if result['queries'] else '-'
+            self.stdout.write(f"{name:<22}{result['throughput_rps']:>8.1f}{latency['p50']:>9.1f}"
+                              f"{latency['p95']:>9.1f}{latency['p99']:>9.1f}{queries:>7}{result['errors']:>6}")
+            if result['errors']:
+                self.stdout.write(f"  mã trạng thái: {result['statuses']}")
+        self.stdout.write("Độ trễ tính bằng ms; SQL là số câu trung bình mỗi request.")
+
+        report = {'meta': meta, 'results': results}
+        path = None
+        if not options['no_save']:
+            path = benchmark.save_report(report, directory)
+            self.stdout.write(f"Đã lưu: {path}")
+
+        if options['compare']:
+            baseline_path = (benchmark.latest_report(directory, exclude=path) if options['compare'] == 'latest'
+                             else Path(options['compare']))
+            if baseline_path is None or not baseline_path.exists():
+                raise CommandError("Không tìm thấy kết quả để so sánh.")
+            baseline = benchmark.load_report(baseline_path)
+            self.stdout.write(f"So với {baseline_path.name} (commit {baseline['meta']['commit']}, "
+                              f"{baseline['meta']['database']}, {baseline['meta']['transport']}):")
+            for scenario, metric, was, now, change in benchmark.compare(report, baseline):
+                delta = f"{change:+.1f}%" if change is not None else '-'
+                self.stdout.write(f"  {scenario:<22}{metric:<9}{was:>10.1f}{now:>10.1f}{delta:>9}")
@@ -0,0 +1,102 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from CollegeApp.enrollment import EnrollmentError, enroll
+from CollegeApp.models import CourseOffering, Enrollment, Student
+
+
+class Command(BaseCommand):
+    help = ("Mô phỏng nhiều sinh viên đăng ký cùng một lớp học phần đồng thời; "
+            "báo thông lượng và số chỗ bị vượt (phải bằng 0).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('offering', type=int, help="Id lớp học phần dùng để thử.")
+        parser.add_argument('--students', type=int, default=500, help="Số sinh viên đăng ký (lấy từ dữ liệu có sẵn).")
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--capacity', type=int, default=None,
+                            help="Đặt lại max_students trước khi chạy (cần --reset).")
+        parser.add_argument('--retry-rate', type=float, default=0.2,
+                            help="Tỷ lệ yêu cầu được gửi lại với cùng idempotency key.")
+        parser.add_argument('--reset', action='store_true',
+                            help="Xóa toàn bộ đăng ký của lớp và đặt current_students = 0 trước khi chạy.")
+
+    def handle(self, *args, **options):
+        offering = CourseOffering.objects.filter(pk=options['offering']).first()
+        if offering is None:
+            raise CommandError("Không tìm thấy lớp học phần.")
+        if options['capacity'] is not None and not options['reset']:
+            raise CommandError("--capacity chỉ dùng cùng --reset.")
+        if options['reset']:
+            with transaction.atomic():
+                Enrollment.objects.filter(offering=offering).delete()
+                updates = {'current_students': 0, 'is_active': True}
+                if options['capacity'] is not None:
+                    updates['max_students'] = options['capacity']
+                CourseOffering.objects.filter(pk=offering.pk).update(**updates)
+            offering.refresh_from_db()
+
+        student_ids = list(Student.objects.order_by('pk').values_list('pk', flat=True)[:options['students']])
+        if not student_ids:
+            raise CommandError("Không có sinh viên nào để thử.")
+        random.shuffle(student_ids)
+        requests = [(student_id, uuid.uuid4()) for student_id in student_ids]
+        # Một phần yêu cầu được gửi lại (client hết thời gian chờ rồi thử lại)
+        requests += random.sample(requests, int(len(requests) * options['retry_rate']))
+        random.shuffle(requests)
+
+        outcomes = Counter()
+        latencies = []
+        lock = threading.Lock()
+        start_gate = threading.Barrier(options['threads'])
+
+        def worker(chunk):
+            try:
+                start_gate.wait()
+                for student_id, key in chunk:
+                    began = time.perf_counter()
+                    try:
+                        _, created = enroll(student_id, offering.pk, idempotency_key=key)
+                        outcome = 'created' if created else 'replayed'
+                    except EnrollmentError as exc:
+                        outcome = exc.code
+                    except Exception as exc:
+                        outcome = f'error:{type(exc).__name__}'
+                    with lock:
+                        outcomes[outcome] += 1
+                        latencies.append(time.perf_counter() - began)
+            finally:
+                connection.close()
+
+        threads = options['threads']
+        chunks = [requests[i::threads] for i in range(threads)]
+        began = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(worker, chunks))
+        elapsed = time.perf_counter() - began
+
+        offering.refresh_from_db()
+        enrolled = Enrollment.objects.filter(offering=offering, status='ENROLLED').count()
+        oversell = max(0, enrolled - offering.max_students) + max(0, offering.current_students - offering.max_students)
+        latencies.sort()
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+
+        self.stdout.write(f"Yêu cầu: {len(requests)} ({len(student_ids)} sinh viên, {threads} luồng)")
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"  {outcome}: {count}")
+        self.stdout.write(f"Thời gian: {elapsed:.2f}s, thông lượng: {len(requests) / elapsed:.0f} yêu cầu/s")
+        self.stdout.write(f"Độ trễ p50/p95/p99: {percentile(0.5):.1f}/{percentile(0.95):.1f}/{percentile(0.99):.1f} ms")
+        self.stdout.write(f"Sức chứa: {offering.max_students}, current_students: {offering.current_students}, "
+                          f"đăng ký hiệu lực: {enrolled}")
+        counter_drift = offering.current_students - enrolled
+        self.stdout.write(f"Vượt chỗ: {oversell}, lệch bộ đếm: {counter_drift}")
+        if oversell or counter_drift:
+            raise CommandError("Phát hiện vượt chỗ hoặc lệch bộ đếm.")
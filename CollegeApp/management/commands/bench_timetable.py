@@ -0,0 +1,68 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from CollegeApp.timetable import (DAYS, OfferingInfo, RoomInfo, SLOTS, TimetableSolver, check_timetable)
+
+
+def synthetic_semester(size, seed, slack=0.85):
+    """
+    Học kỳ giả lập: `size` lớp học phần, khoảng 1 giảng viên cho 4 lớp. Số phòng ở mỗi mức
+    sức chứa được tính để các ca cần phòng cỡ đó chiếm khoảng `slack` số ca có sẵn.
+    """
+    rng = random.Random(seed)
+    lecturers = max(1, size // 4)
+    offerings = [
+        OfferingInfo(i, rng.choice([30, 40, 45, 60, 80, 120]), rng.randrange(lecturers), rng.choice([1, 1, 1, 2]))
+        for i in range(size)
+    ]
+    rooms = []
+    for capacity in sorted({o.size for o in offerings}, reverse=True):
+        # Phòng có sức chứa >= capacity phải đủ cho mọi buổi của lớp có sĩ số >= capacity
+        needed = sum(o.sessions for o in offerings if o.size >= capacity)
+        while len(rooms) * len(SLOTS) * slack < needed:
+            rooms.append(RoomInfo(len(rooms), f'R{len(rooms)}', capacity))
+    return offerings, rooms
+
+
+class Command(BaseCommand):
+    help = "Đo thời gian xếp thời khóa biểu trên các học kỳ giả lập có kích thước tăng dần (không dùng DB)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='500,1000,2000,5000,10000')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--changed', type=int, default=20,
+                            help="Số lớp xếp lại trong phép đo chế độ tăng dần.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'Số lớp':>8} {'Phòng':>6} {'Xếp được':>9} {'Không xếp':>10} "
+                          f"{'Thời gian':>10} {'Tăng dần':>9} {'Vi phạm':>8}")
+        for size in [int(v) for v in options['sizes'].split(',') if v]:
+            offerings, rooms = synthetic_semester(size, options['seed'])
+            began = time.perf_counter()
+            solver = TimetableSolver(rooms)
+            assignments, unassigned = solver.solve(offerings)
+            elapsed = time.perf_counter() - began
+            problems = check_timetable(assignments, offerings)
+
+            # Tăng dần: bỏ lịch của vài lớp rồi xếp lại chúng, giữ nguyên phần còn lại
+            rng = random.Random(options['seed'])
+            changed = set(rng.sample(sorted(assignments), min(options['changed'], len(assignments))))
+            began = time.perf_counter()
+            incremental = TimetableSolver(rooms)
+            by_id = {offering.id: offering for offering in offerings}
+            for offering_id, sessions in assignments.items():
+                if offering_id not in changed:
+                    for session in sessions:
+                        incremental.occupy((session.day, session.block), session.room_id,
+                                           by_id[offering_id].lecturer_id)
+            redone, _ = incremental.solve([by_id[offering_id] for offering_id in changed])
+            incremental_elapsed = time.perf_counter() - began
+            merged = {k: v for k, v in assignments.items() if k not in changed}
+            merged.update(redone)
+            problems += check_timetable(merged, offerings)
+
+            self.stdout.write(f"{size:>8} {len(rooms):>6} {len(assignments):>9} {len(unassigned):>10} "
+                              f"{elapsed:>9.3f}s {incremental_elapsed:>8.3f}s {len(problems):>8}")
+        self.stdout.write(f"({len(DAYS)} ngày x {len(SLOTS) // len(DAYS)} ca mỗi tuần)")
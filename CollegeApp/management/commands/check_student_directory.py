@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from CollegeApp.directory import check_directory, refresh_students
+from CollegeApp.models import StudentDirectoryEntry
+
+
+class Command(BaseCommand):
+    help = "Kiểm tra danh bạ sinh viên có khớp dữ liệu gốc không; --fix để sửa các dòng lệch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help="Ghi lại dòng thiếu/lệch và xóa dòng thừa.")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        stale, orphans = check_directory(chunk_size=options['chunk_size'])
+        self.stdout.write(f"{len(stale)} sinh viên thiếu hoặc lệch, {len(orphans)} dòng thừa.")
+        if stale[:20]:
+            self.stdout.write("Ví dụ: " + ', '.join(map(str, stale[:20])))
+        if not options['fix']:
+            if stale or orphans:
+                raise CommandError("Danh bạ không đồng bộ (chạy lại với --fix).")
+            return
+        refresh_students(stale)
+        StudentDirectoryEntry.objects.filter(student_id__in=orphans).delete()
+        self.stdout.write("Đã sửa.")
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from CollegeApp.ingest import flush_all, get_config
+
+
+class Command(BaseCommand):
+    help = ("Ghi các đăng ký tư vấn còn trong spool của tiến trình đã dừng xuống cơ sở dữ liệu "
+            "(ghi bù sau sự cố); spool của tiến trình đang chạy do chính nó ghi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Chạy liên tục như một tiến trình ghi riêng.")
+        parser.add_argument('--interval', type=float, default=None)
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        config = get_config()
+        batch_size = options['batch_size'] or config['BATCH_SIZE']
+        interval = options['interval'] or config['FLUSH_INTERVAL']
+        while True:
+            count = flush_all(config['SPOOL_DIR'], batch_size)
+            if count or not options['loop']:
+                self.stdout.write(f"Đã ghi {count} đăng ký tư vấn.")
+            if not options['loop']:
+                break
+            time.sleep(interval)
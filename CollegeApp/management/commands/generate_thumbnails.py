@@ -0,0 +1,62 @@
+from concurrent.futures import wait
+
+from django.core.management.base import BaseCommand, CommandError
+
+from CollegeApp.models import Image, User
+from CollegeApp.thumbnails import PILImage, get_thumbnail_service
+
+
+class Command(BaseCommand):
+    help = "Tạo trước ảnh thu nhỏ cho Image.image_file và User.user_photo (bỏ qua biến thể đã có)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--variant', action='append', dest='variants',
+                            help="Chỉ tạo biến thể này (lặp lại được). Mặc định: mọi biến thể.")
+        parser.add_argument('--skip-users', action='store_true', help="Không xử lý ảnh người dùng.")
+        parser.add_argument('--skip-images', action='store_true', help="Không xử lý thư viện ảnh.")
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        if PILImage is None:
+            raise CommandError("Cần cài Pillow để tạo ảnh thu nhỏ.")
+        service = get_thumbnail_service()
+        variants = options['variants'] or list(service.config['VARIANTS'])
+        unknown = set(variants) - set(service.config['VARIANTS'])
+        if unknown:
+            raise CommandError(f"Biến thể không tồn tại: {', '.join(sorted(unknown))}")
+
+        sources = []
+        if not options['skip_images']:
+            sources.append(Image.objects.exclude(image_file='').values_list('image_file', flat=True))
+        if not options['skip_users']:
+            sources.append(User.objects.exclude(user_photo__isnull=True).exclude(user_photo='')
+                           .values_list('user_photo', flat=True))
+
+        seen, skipped, failed, generated = set(), 0, 0, 0
+        futures = []
+        for values in sources:
+            for value in values.distinct().iterator():
+                source = service.resolve_source(value)
+                if source is None:
+                    skipped += 1
+                    continue
+                if source in seen:
+                    continue
+                seen.add(source)
+                futures.extend(service.submit(source, variant) for variant in variants)
+                if len(futures) >= options['batch_size']:
+                    done, failed_now = self._wait(futures)
+                    generated, failed, futures = generated + done, failed + failed_now, []
+        done, failed_now = self._wait(futures)
+        generated, failed = generated + done, failed + failed_now
+        self.stdout.write(f"{len(seen)} ảnh gốc: {generated} biến thể sẵn sàng, {failed} lỗi; "
+                          f"bỏ qua {skipped} đường dẫn ngoài MEDIA_ROOT / không phải ảnh.")
+
+    def _wait(self, futures):
+        wait(futures)
+        failed = 0
+        for future in futures:
+            if future.exception() is not None:
+                failed += 1
+                self.stderr.write(f"Lỗi: {future.exception()}")
+        return len(futures) - failed, failed
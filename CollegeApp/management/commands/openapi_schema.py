@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from CollegeApp.openapi import get_schema_store
+
+
+class Command(BaseCommand):
+    help = ("Sinh lại tài liệu OpenAPI, ghi vào OPENAPI_SCHEMA['CACHE_DIR'] cho phiên bản mã hiện tại "
+            "và in ra (hoặc ghi vào --output) để so sánh trong CI.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=['json', 'yaml'], default='json')
+        parser.add_argument('--output', help="File đích; mặc định in ra stdout.")
+        parser.add_argument('--prune', action='store_true', help="Xóa schema của các phiên bản khác.")
+
+    def handle(self, *args, **options):
+        store = get_schema_store()
+        content = store.generate()[options['format']]
+        if options['prune']:
+            store.prune()
+        if options['output']:
+            with open(options['output'], 'wb') as handle:
+                handle.write(content)
+            self.stderr.write(f"Phiên bản {store.version}: đã ghi {len(content)} byte vào {options['output']}.")
+        else:
+            sys.stdout.buffer.write(content)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from CollegeApp.models import Admin, Faculty, Student, User
+from CollegeApp.search import index_users
+
+
+class Command(BaseCommand):
+    help = "Dựng lại chỉ mục tìm kiếm người dùng (UserSearchToken) từ dữ liệu hiện có."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        querysets = [
+            Student.objects.all(),
+            Faculty.objects.all(),
+            Admin.objects.all(),
+            # Người dùng không thuộc bảng con nào (vd. superuser tạo bằng createsuperuser)
+            User.objects.filter(student__isnull=True, faculty__isnull=True, admin__isnull=True),
+        ]
+        total_users = total_tokens = 0
+        for queryset in querysets:
+            chunk = []
+            for user in queryset.order_by('pk').iterator(chunk_size=chunk_size):
+                chunk.append(user)
+                if len(chunk) >= chunk_size:
+                    total_tokens += index_users(chunk)
+                    total_users += len(chunk)
+                    chunk = []
+            total_tokens += index_users(chunk)
+            total_users += len(chunk)
+        self.stdout.write(f"Đã lập chỉ mục {total_users} người dùng, {total_tokens} từ khóa.")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from CollegeApp.directory import rebuild
+
+
+class Command(BaseCommand):
+    help = "Ghi lại toàn bộ danh bạ sinh viên (StudentDirectoryEntry) từ Student và các bảng liên quan."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written, removed = rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(f"Đã ghi {written} dòng danh bạ, xóa {removed} dòng thừa.")
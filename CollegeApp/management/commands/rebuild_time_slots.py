@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from CollegeApp.models import CourseOffering, OfferingTimeSlot
+from CollegeApp.schedule import ScheduleParseError, parse_schedule
+
+
+class Command(BaseCommand):
+    help = "Tách lại lịch học (CourseOffering.schedule) thành khung giờ OfferingTimeSlot."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, default=None, help="Chỉ xử lý một học kỳ.")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        offerings = CourseOffering.objects.order_by('pk')
+        if options['semester']:
+            offerings = offerings.filter(semester_id=options['semester'])
+        chunk, slots_written, invalid = [], 0, 0
+        for offering in offerings.iterator(chunk_size=options['chunk_size']):
+            try:
+                chunk.append((offering, parse_schedule(offering.schedule)))
+            except ScheduleParseError as exc:
+                invalid += 1
+                self.stderr.write(f"{offering.class_code}: {exc}")
+                chunk.append((offering, []))
+            if len(chunk) >= options['chunk_size']:
+                with transaction.atomic():
+                    slots_written += OfferingTimeSlot.sync(chunk)
+                chunk = []
+        if chunk:
+            with transaction.atomic():
+                slots_written += OfferingTimeSlot.sync(chunk)
+        self.stdout.write(f"Đã ghi {slots_written} khung giờ; {invalid} lịch học không đọc được.")
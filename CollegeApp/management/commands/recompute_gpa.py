@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from CollegeApp.models import Grade, Student
+
+
+class Command(BaseCommand):
+    help = ("Tính lại quality_points, credits_attempted và GPA của sinh viên từ sổ điểm, "
+            "bằng các câu lệnh UPDATE trên cả nhóm (không lặp từng sinh viên).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--academic-year', type=int, default=None, help="Id niên khóa.")
+        parser.add_argument('--major', type=int, default=None, help="Id ngành học.")
+        parser.add_argument('--department', type=int, default=None, help="Id khoa.")
+        parser.add_argument('--include-empty', action='store_true',
+                            help="Đặt lại cả sinh viên chưa có điểm nào (GPA nhập tay trước đây bị xóa).")
+
+    def handle(self, *args, **options):
+        students = Student.objects.all()
+        for option, field in (('academic_year', 'academic_year_id'), ('major', 'major_id'),
+                              ('department', 'department_id')):
+            if options[option]:
+                students = students.filter(**{field: options[option]})
+        if not options['include_empty']:
+            students = students.filter(pk__in=Grade.objects.values('student_id'))
+
+        totals = (Grade.objects.filter(student_id=OuterRef('pk')).order_by()
+                  .values('student_id')
+                  .annotate(points=Sum(F('grade_point') * F('credits')), credits=Sum('credits')))
+        zero = Value(0, output_field=DecimalField(max_digits=9, decimal_places=2))
+        with transaction.atomic():
+            count = students.update(
+                quality_points=Coalesce(Subquery(totals.values('points')), zero),
+                credits_attempted=Coalesce(Subquery(totals.values('credits')), zero),
+            )
+            students.update(GPA=Student.gpa_expression())
+        self.stdout.write(f"Đã tính lại GPA cho {count} sinh viên.")
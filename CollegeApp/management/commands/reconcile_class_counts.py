@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from CollegeApp.classes import reconcile_counts
+
+
+class Command(BaseCommand):
+    help = "Đặt lại sĩ số lớp (Class.number_of_students) theo số sinh viên thực tế."
+
+    def handle(self, *args, **options):
+        fixed = reconcile_counts()
+        self.stdout.write(f"Đã sửa sĩ số của {fixed} lớp.")
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from CollegeApp import seeding
+from CollegeApp.models import User
+
+
+class Command(BaseCommand):
+    help = ("Sinh dữ liệu trường học giả lập (khoa, ngành, lớp, môn học, giảng viên, sinh viên, "
+            "đăng ký tư vấn) cho benchmark; cùng --scale và --seed cho cùng dữ liệu.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(seeding.SCALES), default='small')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--students', type=int, default=None, help="Ghi đè số sinh viên của --scale.")
+        parser.add_argument('--registrations', type=int, default=None,
+                            help="Ghi đè số đăng ký tư vấn của --scale.")
+        parser.add_argument('--reset', action='store_true', help="Xóa dữ liệu giả lập cũ trước khi sinh.")
+        parser.add_argument('--clear', action='store_true', help="Chỉ xóa dữ liệu giả lập rồi thoát.")
+
+    def handle(self, *args, **options):
+        if options['reset'] or options['clear']:
+            deleted = seeding.clear()
+            self.stdout.write("Đã xóa: " + ", ".join(f"{label} {count}" for label, count in deleted.items()))
+            if options['clear']:
+                return
+        if User.objects.filter(email=seeding.ADMIN_EMAIL).exists():
+            raise CommandError("Đã có dữ liệu giả lập; dùng --reset để sinh lại.")
+
+        scale = seeding.get_scale(options['scale'], students=options['students'],
+                                  registrations=options['registrations'])
+
+        def progress(kind, done):
+            self.stdout.write(f"  {kind}: {done}/{scale[kind]}")
+
+        began = time.perf_counter()
+        created = seeding.seed(scale, seed=options['seed'], progress=progress)
+        elapsed = time.perf_counter() - began
+        self.stdout.write(", ".join(f"{label} {count}" for label, count in created.items()))
+        self.stdout.write(f"Thời gian: {elapsed:.1f}s. Tài khoản quản trị: {seeding.ADMIN_EMAIL}, "
+                          f"mật khẩu mọi tài khoản: {seeding.PASSWORD}")
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from CollegeApp.models import Semester
+from CollegeApp.timetable import apply_timetable, check_timetable, solve_semester
+
+
+class Command(BaseCommand):
+    help = "Xếp thời khóa biểu (ca học và phòng) cho các lớp học phần của một học kỳ."
+
+    def add_arguments(self, parser):
+        parser.add_argument('semester', type=int, help="Id học kỳ.")
+        parser.add_argument('--only', type=lambda value: [int(v) for v in value.split(',') if v],
+                            default=None, help="Chỉ xếp lại các lớp học phần này (id, cách nhau bởi dấu phẩy); "
+                                               "lịch các lớp khác được giữ nguyên.")
+        parser.add_argument('--dry-run', action='store_true', help="Chỉ tính, không ghi vào cơ sở dữ liệu.")
+
+    def handle(self, *args, **options):
+        if not Semester.objects.filter(pk=options['semester']).exists():
+            raise CommandError("Không tìm thấy học kỳ.")
+        if not options['only'] and options['only'] is not None:
+            raise CommandError("--only cần ít nhất một id.")
+        timetable = solve_semester(options['semester'], only=options['only'])
+        problems = check_timetable(timetable.assignments, timetable.offerings)
+        if problems:
+            raise CommandError(f"Lời giải có {len(problems)} vi phạm, không ghi.")
+
+        self.stdout.write(f"Đã xếp {len(timetable.assignments)}/{len(timetable.offerings)} lớp học phần "
+                          f"trong {timetable.elapsed:.2f}s.")
+        if timetable.unassigned:
+            self.stdout.write(self.style.WARNING(
+                f"Không xếp được {len(timetable.unassigned)} lớp (thiếu phòng đủ chỗ hoặc giảng viên kín lịch): "
+                + ', '.join(map(str, sorted(timetable.unassigned)[:50]))))
+        if not options['dry_run']:
+            apply_timetable(timetable)
+            self.stdout.write("Đã ghi lịch học vào cơ sở dữ liệu.")
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0011_alter_advisoryregistration_has_graduated'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='advisoryregistration',
+            index=models.Index(fields=['-registration_date', '-id'], name='advreg_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advisoryregistration',
+            index=models.Index(fields=['status', '-registration_date', '-id'], name='advreg_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advisoryregistration',
+            index=models.Index(fields=['major_of_interest', '-registration_date', '-id'], name='advreg_major_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advisoryregistration',
+            index=models.Index(fields=['has_graduated', '-registration_date', '-id'], name='advreg_grad_date_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0012_advisoryregistration_advreg_date_id_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advisoryregistration',
+            name='submission_id',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True, verbose_name='Mã biên nhận'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from CollegeApp.normalize import normalize_email, normalize_phone
+
+
+def fill_normalized_contact(apps, schema_editor):
+    AdvisoryRegistration = apps.get_model('CollegeApp', 'AdvisoryRegistration')
+    batch = []
+    for registration in AdvisoryRegistration.objects.only('id', 'phone_number', 'email').iterator(chunk_size=2000):
+        registration.phone_normalized = normalize_phone(registration.phone_number)
+        registration.email_normalized = normalize_email(registration.email)
+        batch.append(registration)
+        if len(batch) >= 2000:
+            AdvisoryRegistration.objects.bulk_update(batch, ['phone_normalized', 'email_normalized'])
+            batch = []
+    if batch:
+        AdvisoryRegistration.objects.bulk_update(batch, ['phone_normalized', 'email_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0013_advisoryregistration_submission_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advisoryregistration',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='CollegeApp.advisoryregistration', verbose_name='Trùng với đăng ký'),
+        ),
+        migrations.AddField(
+            model_name='advisoryregistration',
+            name='email_normalized',
+            field=models.CharField(blank=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='advisoryregistration',
+            name='last_submitted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Lần gửi gần nhất'),
+        ),
+        migrations.AddField(
+            model_name='advisoryregistration',
+            name='phone_normalized',
+            field=models.CharField(blank=True, default='', editable=False, max_length=15),
+        ),
+        migrations.AddField(
+            model_name='advisoryregistration',
+            name='submission_count',
+            field=models.PositiveIntegerField(default=1, verbose_name='Số lần gửi'),
+        ),
+        migrations.AddIndex(
+            model_name='advisoryregistration',
+            index=models.Index(fields=['phone_normalized', 'registration_date'], name='advreg_phone_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advisoryregistration',
+            index=models.Index(fields=['email_normalized', 'registration_date'], name='advreg_email_date_idx'),
+        ),
+        migrations.RunPython(fill_normalized_contact, migrations.RunPython.noop),
+    ]
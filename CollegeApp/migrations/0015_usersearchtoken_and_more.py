@@ -0,0 +1,33 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0014_advisoryregistration_duplicate_of_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('kind', models.CharField(choices=[('N', 'Thông tin chung'), ('C', 'Mã sinh viên/giảng viên/quản trị')], default='N', max_length=1)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Từ khóa tìm kiếm',
+                'verbose_name_plural': 'Các Từ khóa tìm kiếm',
+                'indexes': [models.Index(fields=['token', 'user'], name='usersearch_token_user_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='usersearchtoken',
+            constraint=models.UniqueConstraint(fields=('user', 'token', 'kind'), name='usersearch_user_token_uniq'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0015_usersearchtoken_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Enrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('ENROLLED', 'Đã đăng ký'), ('DROPPED', 'Đã hủy')], default='ENROLLED', max_length=20, verbose_name='Trạng thái')),
+                ('idempotency_key', models.UUIDField(blank=True, editable=False, null=True, unique=True)),
+                ('enrolled_at', models.DateTimeField(auto_now_add=True, verbose_name='Ngày đăng ký')),
+                ('dropped_at', models.DateTimeField(blank=True, null=True, verbose_name='Ngày hủy')),
+                ('offering', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='CollegeApp.courseoffering', verbose_name='Lớp học phần')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='CollegeApp.student', verbose_name='Sinh viên')),
+            ],
+            options={
+                'verbose_name': 'Đăng ký lớp học phần',
+                'verbose_name_plural': 'Các Đăng ký lớp học phần',
+                'ordering': ['-enrolled_at'],
+                'indexes': [models.Index(fields=['offering', 'status'], name='enrollment_offering_status_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='enrollment',
+            constraint=models.UniqueConstraint(fields=('student', 'offering'), name='enrollment_student_offering_uniq'),
+        ),
+    ]
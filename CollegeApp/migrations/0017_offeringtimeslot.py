@@ -0,0 +1,57 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from CollegeApp.schedule import ScheduleParseError, parse_schedule, period_mask, room_key
+
+
+def fill_time_slots(apps, schema_editor):
+    # Lịch học không đọc được được bỏ qua; sửa rồi chạy lệnh rebuild_time_slots
+    CourseOffering = apps.get_model('CollegeApp', 'CourseOffering')
+    OfferingTimeSlot = apps.get_model('CollegeApp', 'OfferingTimeSlot')
+    rows = []
+    for offering in CourseOffering.objects.exclude(schedule__isnull=True).exclude(schedule='').iterator(chunk_size=2000):
+        try:
+            slots = parse_schedule(offering.schedule)
+        except ScheduleParseError:
+            continue
+        key = room_key(offering.room)
+        rows.extend(
+            OfferingTimeSlot(offering_id=offering.pk, semester_id=offering.semester_id, day=slot.day,
+                             start_period=slot.start_period, end_period=slot.end_period,
+                             period_mask=period_mask(slot.start_period, slot.end_period),
+                             room_key=key, lecturer_id=offering.lecturer_id)
+            for slot in slots)
+    OfferingTimeSlot.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0016_enrollment_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferingTimeSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.PositiveSmallIntegerField(verbose_name='Thứ (2-7, 8 là chủ nhật)')),
+                ('start_period', models.PositiveSmallIntegerField(verbose_name='Tiết bắt đầu')),
+                ('end_period', models.PositiveSmallIntegerField(verbose_name='Tiết kết thúc')),
+                ('period_mask', models.PositiveIntegerField(verbose_name='Bitmask tiết học')),
+                ('room_key', models.CharField(blank=True, default='', max_length=50, verbose_name='Phòng (đã chuẩn hóa)')),
+                ('lecturer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='time_slots', to='CollegeApp.faculty', verbose_name='Giảng viên')),
+                ('offering', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_slots', to='CollegeApp.courseoffering', verbose_name='Lớp học phần')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_slots', to='CollegeApp.semester', verbose_name='Học kỳ')),
+            ],
+            options={
+                'verbose_name': 'Khung giờ lớp học phần',
+                'verbose_name_plural': 'Các Khung giờ lớp học phần',
+                'ordering': ['day', 'start_period'],
+                'indexes': [models.Index(fields=['semester', 'room_key', 'day', 'start_period'], name='timeslot_room_idx'), models.Index(fields=['semester', 'lecturer', 'day', 'start_period'], name='timeslot_lecturer_idx')],
+            },
+        ),
+        migrations.RunPython(fill_time_slots, migrations.RunPython.noop),
+    ]
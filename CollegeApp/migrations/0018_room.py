@@ -0,0 +1,29 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0017_offeringtimeslot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Room',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=50, unique=True, verbose_name='Mã phòng')),
+                ('name', models.CharField(blank=True, default='', max_length=200, verbose_name='Tên phòng')),
+                ('building', models.CharField(blank=True, default='', max_length=100, verbose_name='Tòa nhà')),
+                ('capacity', models.PositiveIntegerField(verbose_name='Sức chứa')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Đang sử dụng')),
+            ],
+            options={
+                'verbose_name': 'Phòng học',
+                'verbose_name_plural': 'Các Phòng học',
+                'ordering': ['code'],
+            },
+        ),
+    ]
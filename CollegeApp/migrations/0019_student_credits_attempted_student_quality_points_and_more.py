@@ -0,0 +1,56 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0018_room'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='credits_attempted',
+            field=models.DecimalField(decimal_places=1, default=0, editable=False, max_digits=7, verbose_name='Tổng tín chỉ đã có điểm'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='quality_points',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=9, verbose_name='Tổng điểm x tín chỉ'),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='GPA',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=4, null=True, verbose_name='Điểm trung bình tích lũy (GPA)'),
+        ),
+        migrations.CreateModel(
+            name='Grade',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.DecimalField(decimal_places=1, max_digits=3, verbose_name='Điểm (thang 10)')),
+                ('letter', models.CharField(editable=False, max_length=2, verbose_name='Điểm chữ')),
+                ('grade_point', models.DecimalField(decimal_places=1, editable=False, max_digits=2, verbose_name='Điểm thang 4')),
+                ('credits', models.DecimalField(decimal_places=1, editable=False, max_digits=3, verbose_name='Số tín chỉ')),
+                ('recorded_at', models.DateTimeField(auto_now_add=True, verbose_name='Ngày nhập điểm')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ngày cập nhật')),
+                ('offering', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grades', to='CollegeApp.courseoffering', verbose_name='Lớp học phần')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grades', to='CollegeApp.student', verbose_name='Sinh viên')),
+            ],
+            options={
+                'verbose_name': 'Điểm học phần',
+                'verbose_name_plural': 'Sổ điểm',
+                'ordering': ['student', 'offering'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='grade',
+            constraint=models.UniqueConstraint(fields=('student', 'offering'), name='grade_student_offering_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='grade',
+            constraint=models.CheckConstraint(check=models.Q(('score__gte', 0), ('score__lte', 10)), name='grade_score_range'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def reset_class_counts(apps, schema_editor):
+    # Sĩ số cũ được nhập tay; lúc này chưa sinh viên nào được xếp lớp
+    apps.get_model('CollegeApp', 'Class').objects.update(number_of_students=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0019_student_credits_attempted_student_quality_points_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='student_class',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='students', to='CollegeApp.class', verbose_name='Lớp sinh hoạt'),
+        ),
+        migrations.AlterField(
+            model_name='class',
+            name='number_of_students',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Số lượng sinh viên'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['student_class', 'student_code'], name='student_class_code_idx'),
+        ),
+        migrations.RunPython(reset_class_counts, migrations.RunPython.noop),
+    ]
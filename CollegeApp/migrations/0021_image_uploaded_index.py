@@ -0,0 +1,17 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0020_student_class'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['uploaded_at', 'id'], name='image_uploaded_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.21 on 2026-10-18 18:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import F
+
+
+def fill_directory(apps, schema_editor):
+    # Giống directory.rebuild() nhưng trên model lịch sử của migration
+    Student = apps.get_model('CollegeApp', 'Student')
+    StudentDirectoryEntry = apps.get_model('CollegeApp', 'StudentDirectoryEntry')
+    names = {
+        'program_name': F('program__name'), 'major_name': F('major__name'),
+        'academic_year_name': F('academic_year__name'), 'department_name': F('department__name'),
+        'student_class_name': F('student_class__class_name'),
+    }
+    fields = ['student_code', 'last_name', 'first_name', 'email', 'phone', 'gender', 'date_of_birth',
+              'student_status', 'is_active', 'program_id', 'major_id', 'academic_year_id', 'department_id',
+              'student_class_id']
+    rows = Student.objects.order_by().annotate(**names).values('pk', *fields, *names)
+    batch = []
+    for row in rows.iterator(chunk_size=2000):
+        row['student_id'] = row.pop('pk')
+        for name in names:
+            row[name] = row[name] or ''
+        batch.append(StudentDirectoryEntry(**row))
+        if len(batch) >= 2000:
+            StudentDirectoryEntry.objects.bulk_create(batch)
+            batch = []
+    StudentDirectoryEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CollegeApp', '0021_image_uploaded_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentDirectoryEntry',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='directory_entry', serialize=False, to='CollegeApp.student', verbose_name='Sinh viên')),
+                ('student_code', models.CharField(max_length=20, unique=True, verbose_name='Mã số sinh viên')),
+                ('last_name', models.CharField(max_length=100, verbose_name='Họ')),
+                ('first_name', models.CharField(max_length=100, verbose_name='Tên đệm và tên')),
+                ('email', models.EmailField(max_length=254, verbose_name='Email')),
+                ('phone', models.CharField(max_length=18, verbose_name='Số điện thoại')),
+                ('gender', models.CharField(blank=True, max_length=50, null=True, verbose_name='Giới tính')),
+                ('date_of_birth', models.DateField(blank=True, null=True, verbose_name='Ngày sinh')),
+                ('student_status', models.CharField(choices=[('DANG_HOC', 'Đang học'), ('DA_TOT_NGHIEP', 'Đã tốt nghiệp'), ('SAP_TOT_NGHIEP', 'Sắp tốt nghiệp'), ('THOI_HOC', 'Đã thôi học'), ('BUOC_THOI_HOC', 'Buộc thôi học'), ('BAO_LUU', 'Bảo lưu')], max_length=50, verbose_name='Tình trạng')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Tình trạng tài khoản')),
+                ('program_id', models.BigIntegerField(null=True, verbose_name='Mã chương trình')),
+                ('program_name', models.CharField(blank=True, default='', max_length=100, verbose_name='Chương trình')),
+                ('major_id', models.BigIntegerField(null=True, verbose_name='Mã ngành')),
+                ('major_name', models.CharField(blank=True, default='', max_length=200, verbose_name='Ngành học')),
+                ('academic_year_id', models.BigIntegerField(null=True, verbose_name='Mã niên khóa')),
+                ('academic_year_name', models.CharField(blank=True, default='', max_length=100, verbose_name='Niên khóa')),
+                ('department_id', models.BigIntegerField(null=True, verbose_name='Mã khoa')),
+                ('department_name', models.CharField(blank=True, default='', max_length=200, verbose_name='Khoa')),
+                ('student_class_id', models.BigIntegerField(null=True, verbose_name='Mã lớp')),
+                ('student_class_name', models.CharField(blank=True, default='', max_length=100, verbose_name='Lớp sinh hoạt')),
+                ('synced_at', models.DateTimeField(auto_now=True, verbose_name='Đồng bộ lúc')),
+            ],
+            options={
+                'verbose_name': 'Danh bạ sinh viên',
+                'verbose_name_plural': 'Danh bạ sinh viên',
+                'ordering': ['student_code'],
+                'indexes': [models.Index(fields=['major_id', 'student_code'], name='directory_major_idx'), models.Index(fields=['academic_year_id', 'student_code'], name='directory_year_idx'), models.Index(fields=['department_id', 'student_code'], name='directory_department_idx'), models.Index(fields=['student_class_id', 'student_code'], name='directory_class_idx'), models.Index(fields=['student_status', 'student_code'], name='directory_status_idx'), models.Index(fields=['last_name', 'first_name'], name='directory_name_idx')],
+            },
+        ),
+        migrations.RunPython(fill_directory, migrations.RunPython.noop),
+    ]
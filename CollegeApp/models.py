@@ -1,5 +1,15 @@
+import logging
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, router, transaction
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, FloatField, Value, When
+
+from .grading import convert_score, standing_for
+from .normalize import normalize_email, normalize_phone
+from .schedule import ScheduleParseError, parse_schedule, period_mask, room_key
+
+logger = logging.getLogger(__name__)
 
 
 class User(AbstractUser):
@@ -70,6 +80,10 @@ class Image(models.Model):
         verbose_name = "Hình ảnh"
         verbose_name_plural = "Các Hình ảnh"
         ordering = ['-uploaded_at']
+        indexes = [
+            # Phân trang keyset của thư viện ảnh (-uploaded_at, -id)
+            models.Index(fields=['uploaded_at', 'id'], name='image_uploaded_idx'),
+        ]
 
     def __str__(self):
         return self.title if self.title else f"Image {self.id}"
@@ -288,8 +302,8 @@ class Class(models.Model):
     department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True,
                                    related_name='classes_by_department', verbose_name="Khoa quản lý")
     end_date = models.DateField(blank=True, null=True, verbose_name="Ngày dự kiến kết thúc")
-    number_of_students = models.IntegerField(default=0, verbose_name="Số lượng sinh viên (dự kiến/hiện tại)"
-                                             )
+    # Bộ đếm sinh viên của lớp (Student.student_class), chỉ thay đổi bằng F() qua adjust_counts
+    number_of_students = models.IntegerField(default=0, editable=False, verbose_name="Số lượng sinh viên")
     is_active = models.BooleanField(
         default=True,
         verbose_name="Lớp đang hoạt động"
@@ -310,6 +324,14 @@ class Class(models.Model):
             return f"{self.class_name} ({self.major.name if self.major else 'N/A'}) - {self.academic_year.name}"
         return f"{self.class_name} ({self.major.name if self.major else 'N/A'})"
 
+    @classmethod
+    def adjust_counts(cls, deltas, using='default'):
+        """deltas: {id lớp: số sinh viên thêm (+) / bớt (-)}. Mỗi lớp một UPDATE nguyên tử."""
+        for class_id, delta in deltas.items():
+            if class_id is not None and delta:
+                cls.objects.using(using).filter(pk=class_id).update(
+                    number_of_students=F('number_of_students') + delta)
+
 
 class Semester(models.Model):
     SEMESTER_TYPE_CHOICES = [
@@ -337,6 +359,22 @@ class Semester(models.Model):
         return f"{self.name} - {self.academic_year.name}"
 
 
+class Room(models.Model):
+    code = models.CharField(max_length=50, unique=True, verbose_name="Mã phòng")
+    name = models.CharField(max_length=200, blank=True, default='', verbose_name="Tên phòng")
+    building = models.CharField(max_length=100, blank=True, default='', verbose_name="Tòa nhà")
+    capacity = models.PositiveIntegerField(verbose_name="Sức chứa")
+    is_active = models.BooleanField(default=True, verbose_name="Đang sử dụng")
+
+    class Meta:
+        verbose_name = "Phòng học"
+        verbose_name_plural = "Các Phòng học"
+        ordering = ['code']
+
+    def __str__(self):
+        return f"{self.code} ({self.capacity} chỗ)"
+
+
 class CourseOffering(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='offerings', verbose_name="Môn học")
     semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='course_offerings',
@@ -361,6 +399,100 @@ class CourseOffering(models.Model):
     def __str__(self):
         return f"{self.course.title} - {self.class_code} ({self.semester.name})"
 
+    # Các cột quyết định khung giờ trong OfferingTimeSlot
+    TIME_SLOT_FIELDS = frozenset({'schedule', 'room', 'lecturer', 'semester'})
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_schedule = instance.__dict__.get('schedule')
+        return instance
+
+    def parsed_schedule(self):
+        """
+        Khung giờ của lịch học. Lịch không đọc được chỉ bị từ chối khi vừa được nhập
+        hoặc sửa; lịch cũ giữ nguyên thì không có khung giờ (ghi cảnh báo), để không
+        chặn việc sửa các cột khác.
+        """
+        try:
+            return parse_schedule(self.schedule)
+        except ScheduleParseError as exc:
+            if self._state.adding or self.schedule != getattr(self, '_loaded_schedule', None):
+                raise ValidationError({'schedule': str(exc)})
+            logger.warning("Lịch học của lớp học phần %s không đọc được, bỏ qua khung giờ: %s",
+                           self.class_code, exc)
+            return []
+
+    def clean(self):
+        super().clean()
+        slots = self.parsed_schedule()
+        if slots and self.semester_id:
+            from .conflicts import find_conflicts, describe_conflicts
+            conflicts = find_conflicts(self.semester_id, slots, room_key=room_key(self.room),
+                                       lecturer_id=self.lecturer_id, exclude_offering=self.pk)
+            if conflicts:
+                raise ValidationError({'schedule': describe_conflicts(conflicts)})
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not self.TIME_SLOT_FIELDS.intersection(update_fields):
+            return super().save(*args, **kwargs)
+        slots = self.parsed_schedule()
+        with transaction.atomic(using=kwargs.get('using') or self._state.db or 'default'):
+            super().save(*args, **kwargs)
+            OfferingTimeSlot.sync([(self, slots)], using=self._state.db)
+        self._loaded_schedule = self.schedule
+
+
+class OfferingTimeSlot(models.Model):
+    """
+    Khung giờ hằng tuần của lớp học phần, tách từ CourseOffering.schedule.
+    Semester, phòng và giảng viên được chép lại để tra cứu trùng lịch trên index.
+    """
+    offering = models.ForeignKey(CourseOffering, on_delete=models.CASCADE, related_name='time_slots',
+                                 verbose_name="Lớp học phần")
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='time_slots',
+                                 verbose_name="Học kỳ")
+    day = models.PositiveSmallIntegerField(verbose_name="Thứ (2-7, 8 là chủ nhật)")
+    start_period = models.PositiveSmallIntegerField(verbose_name="Tiết bắt đầu")
+    end_period = models.PositiveSmallIntegerField(verbose_name="Tiết kết thúc")
+    period_mask = models.PositiveIntegerField(verbose_name="Bitmask tiết học")
+    room_key = models.CharField(max_length=50, blank=True, default='', verbose_name="Phòng (đã chuẩn hóa)")
+    lecturer = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='time_slots', verbose_name="Giảng viên")
+
+    class Meta:
+        verbose_name = "Khung giờ lớp học phần"
+        verbose_name_plural = "Các Khung giờ lớp học phần"
+        ordering = ['day', 'start_period']
+        indexes = [
+            models.Index(fields=['semester', 'room_key', 'day', 'start_period'], name='timeslot_room_idx'),
+            models.Index(fields=['semester', 'lecturer', 'day', 'start_period'], name='timeslot_lecturer_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.offering_id}: thứ {self.day}, tiết {self.start_period}-{self.end_period}"
+
+    @classmethod
+    def sync(cls, items, using=None):
+        """
+        Ghi lại khung giờ cho [(offering, [TimeSlot])]: một DELETE và một INSERT nhiều dòng.
+        Dùng sau khi lưu hoặc cập nhật hàng loạt lớp học phần.
+        """
+        rows = []
+        for offering, slots in items:
+            key = room_key(offering.room)
+            rows.extend(
+                cls(offering_id=offering.pk, semester_id=offering.semester_id, day=slot.day,
+                    start_period=slot.start_period, end_period=slot.end_period,
+                    period_mask=period_mask(slot.start_period, slot.end_period),
+                    room_key=key, lecturer_id=offering.lecturer_id)
+                for slot in slots)
+        manager = cls.objects.db_manager(using)
+        manager.filter(offering_id__in=[offering.pk for offering, _ in items]).delete()
+        manager.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
 
 class Student(User):
     STUDENT_STATUS_CHOICES = [
@@ -382,13 +514,24 @@ class Student(User):
     department = models.ForeignKey(Department, on_delete=models.CASCADE)
     student_status = models.CharField(max_length=50, choices=STUDENT_STATUS_CHOICES, default='DANG_HOC',
                                       verbose_name="Tình trạng")
-    GPA = models.DecimalField(max_digits=4, decimal_places=1, blank=True, null=True,
+    student_class = models.ForeignKey(Class, on_delete=models.SET_NULL, null=True, blank=True,
+                                      related_name='students', verbose_name="Lớp sinh hoạt")
+    # GPA được tính từ sổ điểm (Grade): tổng điểm thang 4 x tín chỉ và tổng tín chỉ
+    GPA = models.DecimalField(max_digits=4, decimal_places=2, blank=True, null=True, editable=False,
                               verbose_name="Điểm trung bình tích lũy (GPA)")
+    quality_points = models.DecimalField(max_digits=9, decimal_places=2, default=0, editable=False,
+                                         verbose_name="Tổng điểm x tín chỉ")
+    credits_attempted = models.DecimalField(max_digits=7, decimal_places=1, default=0, editable=False,
+                                            verbose_name="Tổng tín chỉ đã có điểm")
 
     class Meta:
         verbose_name = "Sinh viên"
         verbose_name_plural = "Sinh viên"
         ordering = ['student_code']
+        indexes = [
+            # Danh sách lớp (roster) phân trang keyset theo mã sinh viên
+            models.Index(fields=['student_class', 'student_code'], name='student_class_code_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.student_code})"
@@ -397,7 +540,18 @@ class Student(User):
         self.role = 'SINH_VIEN'
         if self._state.adding and self.pk is None:
             self.is_active = True
-        super().save(*args, **kwargs)  # Đây là dòng quan trọng
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'student_class' not in update_fields:
+            return super().save(*args, **kwargs)
+        using = kwargs.get('using') or router.db_for_write(Student, instance=self)
+        with transaction.atomic(using=using):
+            old_class_id = None
+            if not self._state.adding:
+                old_class_id = (Student.objects.using(using).select_for_update().filter(pk=self.pk)
+                                .values_list('student_class_id', flat=True).first())
+            super().save(*args, **kwargs)  # Đây là dòng quan trọng
+            if old_class_id != self.student_class_id:
+                Class.adjust_counts({old_class_id: -1, self.student_class_id: 1}, using=using)
 
     @property
     def full_name(self):
@@ -405,21 +559,31 @@ class Student(User):
 
     @property
     def academic_standing(self):
-        if self.gpa is None:
-            return "Chưa có thông tin GPA"
-
-        if self.gpa >= 3.6:
-            return "Xuất sắc"
-        elif self.gpa >= 3.2:
-            return "Giỏi"
-        elif self.gpa >= 2.5:
-            return "Khá"
-        elif self.gpa >= 2.0:
-            return "Trung bình"
-        elif self.gpa >= 1.5:
-            return "Cảnh báo học vụ"
-        else:
-            return "Buộc thôi học / Đình chỉ"
+        return standing_for(self.GPA)
+
+    @classmethod
+    def gpa_expression(cls):
+        """GPA = quality_points / credits_attempted, NULL khi chưa có tín chỉ nào."""
+        return Case(
+            # * 1.0: SQLite lưu số thập phân nguyên dạng INTEGER, phép chia sẽ bị làm tròn xuống
+            When(credits_attempted__gt=0,
+                 then=ExpressionWrapper(F('quality_points') * Value(1.0, output_field=FloatField())
+                                        / F('credits_attempted'),
+                                        output_field=DecimalField(max_digits=4, decimal_places=2))),
+            default=None,
+            output_field=DecimalField(max_digits=4, decimal_places=2),
+        )
+
+    @classmethod
+    def apply_grade_delta(cls, student_id, points, credits, using='default'):
+        """Cộng dồn thay đổi của sổ điểm vào tổng của sinh viên, rồi tính lại GPA từ hai tổng."""
+        if not points and not credits:
+            return
+        students = cls.objects.using(using).filter(pk=student_id)
+        students.update(quality_points=F('quality_points') + points,
+                        credits_attempted=F('credits_attempted') + credits)
+        # Câu lệnh riêng: MySQL tính các phép gán SET lần lượt, các DB khác dùng giá trị cũ
+        students.update(GPA=cls.gpa_expression())
 
 
 class Admin(User):
@@ -451,6 +615,107 @@ class Admin(User):
         return f"{self.last_name} {self.first_name}"
 
 
+class Enrollment(models.Model):
+    """Đăng ký lớp học phần của sinh viên. Giữ chỗ qua enrollment.py, không tạo trực tiếp."""
+    STATUS_CHOICES = [
+        ('ENROLLED', 'Đã đăng ký'),
+        ('DROPPED', 'Đã hủy'),
+    ]
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments',
+                                verbose_name="Sinh viên")
+    offering = models.ForeignKey(CourseOffering, on_delete=models.CASCADE, related_name='enrollments',
+                                 verbose_name="Lớp học phần")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ENROLLED', verbose_name="Trạng thái")
+    # Khóa do client gửi kèm để gửi lại yêu cầu an toàn (không giữ thêm chỗ)
+    idempotency_key = models.UUIDField(unique=True, null=True, blank=True, editable=False)
+    enrolled_at = models.DateTimeField(auto_now_add=True, verbose_name="Ngày đăng ký")
+    dropped_at = models.DateTimeField(null=True, blank=True, verbose_name="Ngày hủy")
+
+    class Meta:
+        verbose_name = "Đăng ký lớp học phần"
+        verbose_name_plural = "Các Đăng ký lớp học phần"
+        ordering = ['-enrolled_at']
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'offering'], name='enrollment_student_offering_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['offering', 'status'], name='enrollment_offering_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} - {self.offering_id} ({self.get_status_display()})"
+
+
+class Grade(models.Model):
+    """
+    Sổ điểm: điểm của sinh viên ở một lớp học phần, có trọng số là tín chỉ của môn học
+    (chép lại lúc nhập điểm). Mỗi lần thêm, sửa hay xóa điểm chỉ cộng/trừ phần chênh lệch
+    vào Student.quality_points / credits_attempted (xóa: receiver post_delete trong
+    signals.py); lệnh recompute_gpa tính lại toàn bộ. QuerySet.update() không đi qua
+    save(), sau khi dùng nó cần chạy recompute_gpa.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='grades', verbose_name="Sinh viên")
+    offering = models.ForeignKey(CourseOffering, on_delete=models.CASCADE, related_name='grades',
+                                 verbose_name="Lớp học phần")
+    score = models.DecimalField(max_digits=3, decimal_places=1, verbose_name="Điểm (thang 10)")
+    letter = models.CharField(max_length=2, editable=False, verbose_name="Điểm chữ")
+    grade_point = models.DecimalField(max_digits=2, decimal_places=1, editable=False, verbose_name="Điểm thang 4")
+    credits = models.DecimalField(max_digits=3, decimal_places=1, editable=False, verbose_name="Số tín chỉ")
+    recorded_at = models.DateTimeField(auto_now_add=True, verbose_name="Ngày nhập điểm")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Ngày cập nhật")
+
+    class Meta:
+        verbose_name = "Điểm học phần"
+        verbose_name_plural = "Sổ điểm"
+        ordering = ['student', 'offering']
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'offering'], name='grade_student_offering_uniq'),
+            models.CheckConstraint(check=models.Q(score__gte=0, score__lte=10), name='grade_score_range'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} - {self.offering_id}: {self.score}"
+
+    @property
+    def weighted_points(self):
+        return self.grade_point * self.credits
+
+    def save(self, *args, **kwargs):
+        self.letter, self.grade_point = convert_score(self.score)
+        using = kwargs.get('using') or router.db_for_write(Grade, instance=self)
+        with transaction.atomic(using=using):
+            old = None
+            if self.pk is not None:
+                old = (Grade.objects.using(using).select_for_update().filter(pk=self.pk)
+                       .values('student_id', 'offering_id', 'grade_point', 'credits').first())
+            # Tín chỉ chép từ môn học lúc nhập điểm và khi đổi sang lớp học phần khác
+            if self.credits is None or (old is not None and old['offering_id'] != self.offering_id):
+                self.credits = Course.objects.using(using).filter(offerings=self.offering_id) \
+                    .values_list('credits', flat=True).get()
+            super().save(*args, **kwargs)
+            if old is not None and old['student_id'] != self.student_id:
+                Student.apply_grade_delta(old['student_id'], -old['grade_point'] * old['credits'],
+                                          -old['credits'], using=using)
+                old = None
+            if old is None:
+                Student.apply_grade_delta(self.student_id, self.weighted_points, self.credits, using=using)
+            else:
+                Student.apply_grade_delta(self.student_id, self.weighted_points - old['grade_point'] * old['credits'],
+                                          self.credits - old['credits'], using=using)
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(Grade, instance=self)
+        with transaction.atomic(using=using):
+            # post_delete trừ theo giá trị của instance: lấy giá trị hiện có trong DB
+            current = (Grade.objects.using(using).select_for_update().filter(pk=self.pk)
+                       .values('student_id', 'grade_point', 'credits').first())
+            if current is not None:
+                self.student_id, self.grade_point, self.credits = (
+                    current['student_id'], current['grade_point'], current['credits'])
+            return super().delete(*args, **kwargs)
+
+
 class AdvisoryRegistration(models.Model):
     STATUS_CHOICES = [
         ('NEW', 'Mới đăng ký'),
@@ -485,13 +750,115 @@ class AdvisoryRegistration(models.Model):
         verbose_name="Trạng thái tư vấn"
     )
     notes = models.TextField(blank=True, null=True, verbose_name="Ghi chú của tư vấn viên")
-
+    # Mã biên nhận của chế độ ghi trễ (ingest.py), tránh ghi trùng khi ghi bù spool
+    submission_id = models.UUIDField(unique=True, null=True, blank=True, editable=False,
+                                     verbose_name="Mã biên nhận")
+    # Phát hiện đăng ký trùng (dedup.py)
+    phone_normalized = models.CharField(max_length=15, blank=True, default='', editable=False)
+    email_normalized = models.CharField(max_length=254, blank=True, default='', editable=False)
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='duplicates', verbose_name="Trùng với đăng ký")
+    submission_count = models.PositiveIntegerField(default=1, verbose_name="Số lần gửi")
+    last_submitted_at = models.DateTimeField(null=True, blank=True, verbose_name="Lần gửi gần nhất")
 
     class Meta:
         verbose_name = "Đăng ký tư vấn"
         verbose_name_plural = "Các Đăng ký tư vấn"
         ordering = ['-registration_date'] # Sắp xếp các đăng ký mới nhất lên đầu
+        # Index ghép cho phân trang keyset (registration_date, id) và các bộ lọc của danh sách
+        indexes = [
+            models.Index(fields=['-registration_date', '-id'], name='advreg_date_id_idx'),
+            models.Index(fields=['status', '-registration_date', '-id'], name='advreg_status_date_idx'),
+            models.Index(fields=['major_of_interest', '-registration_date', '-id'], name='advreg_major_date_idx'),
+            models.Index(fields=['has_graduated', '-registration_date', '-id'], name='advreg_grad_date_idx'),
+            models.Index(fields=['phone_normalized', 'registration_date'], name='advreg_phone_date_idx'),
+            models.Index(fields=['email_normalized', 'registration_date'], name='advreg_email_date_idx'),
+        ]
 
     def __str__(self):
         return f"Đăng ký tư vấn của {self.full_name} - {self.get_status_display()}"
 
+    def normalize_contact(self):
+        self.phone_normalized = normalize_phone(self.phone_number)
+        self.email_normalized = normalize_email(self.email)
+
+    def save(self, *args, **kwargs):
+        self.normalize_contact()
+        super().save(*args, **kwargs)
+
+
+
+class UserSearchToken(models.Model):
+    """
+    Chỉ mục tìm kiếm người dùng (search.py): mỗi từ đã bỏ dấu của họ tên, email,
+    CCCD và mã sinh viên/giảng viên là một dòng, tìm theo tiền tố trên index.
+    """
+    KIND_CHOICES = [
+        ('N', 'Thông tin chung'),
+        ('C', 'Mã sinh viên/giảng viên/quản trị'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=100)
+    kind = models.CharField(max_length=1, choices=KIND_CHOICES, default='N')
+
+    class Meta:
+        verbose_name = "Từ khóa tìm kiếm"
+        verbose_name_plural = "Các Từ khóa tìm kiếm"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'token', 'kind'], name='usersearch_user_token_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['token', 'user'], name='usersearch_token_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.token} ({self.user_id})"
+
+
+class StudentDirectoryEntry(models.Model):
+    """
+    Bản đọc phẳng của danh bạ sinh viên (directory.py): các cột của Student, User và
+    tên chương trình/ngành/niên khóa/khoa/lớp trong một bảng, để danh sách và trang
+    quản trị đọc không cần JOIN. Chỉ được ghi bởi directory.py, không sửa tay.
+    """
+    student = models.OneToOneField(Student, on_delete=models.CASCADE, primary_key=True,
+                                   related_name='directory_entry', verbose_name="Sinh viên")
+    student_code = models.CharField(max_length=20, unique=True, verbose_name="Mã số sinh viên")
+    last_name = models.CharField(max_length=100, verbose_name="Họ")
+    first_name = models.CharField(max_length=100, verbose_name="Tên đệm và tên")
+    email = models.EmailField(verbose_name="Email")
+    phone = models.CharField(max_length=18, verbose_name="Số điện thoại")
+    gender = models.CharField(max_length=50, null=True, blank=True, verbose_name="Giới tính")
+    date_of_birth = models.DateField(null=True, blank=True, verbose_name="Ngày sinh")
+    student_status = models.CharField(max_length=50, choices=Student.STUDENT_STATUS_CHOICES,
+                                      verbose_name="Tình trạng")
+    is_active = models.BooleanField(default=True, verbose_name="Tình trạng tài khoản")
+    # id và tên của các bảng liên quan, không phải khóa ngoại
+    program_id = models.BigIntegerField(null=True, verbose_name="Mã chương trình")
+    program_name = models.CharField(max_length=100, blank=True, default='', verbose_name="Chương trình")
+    major_id = models.BigIntegerField(null=True, verbose_name="Mã ngành")
+    major_name = models.CharField(max_length=200, blank=True, default='', verbose_name="Ngành học")
+    academic_year_id = models.BigIntegerField(null=True, verbose_name="Mã niên khóa")
+    academic_year_name = models.CharField(max_length=100, blank=True, default='', verbose_name="Niên khóa")
+    department_id = models.BigIntegerField(null=True, verbose_name="Mã khoa")
+    department_name = models.CharField(max_length=200, blank=True, default='', verbose_name="Khoa")
+    student_class_id = models.BigIntegerField(null=True, verbose_name="Mã lớp")
+    student_class_name = models.CharField(max_length=100, blank=True, default='', verbose_name="Lớp sinh hoạt")
+    synced_at = models.DateTimeField(auto_now=True, verbose_name="Đồng bộ lúc")
+
+    class Meta:
+        verbose_name = "Danh bạ sinh viên"
+        verbose_name_plural = "Danh bạ sinh viên"
+        ordering = ['student_code']
+        indexes = [
+            models.Index(fields=['major_id', 'student_code'], name='directory_major_idx'),
+            models.Index(fields=['academic_year_id', 'student_code'], name='directory_year_idx'),
+            models.Index(fields=['department_id', 'student_code'], name='directory_department_idx'),
+            models.Index(fields=['student_class_id', 'student_code'], name='directory_class_idx'),
+            models.Index(fields=['student_status', 'student_code'], name='directory_status_idx'),
+            models.Index(fields=['last_name', 'first_name'], name='directory_name_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.last_name} {self.first_name} ({self.student_code})"
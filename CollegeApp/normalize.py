@@ -0,0 +1,34 @@
+# CollegeApp/normalize.py
+"""Chuẩn hóa chuỗi dùng để so khớp/tìm kiếm (không phụ thuộc model)."""
+import re
+import unicodedata
+
+
+def normalize_phone(phone):
+    """Chỉ giữ chữ số, đổi tiền tố quốc gia 84 thành 0: '+84 912-345-678' -> '0912345678'."""
+    digits = re.sub(r'\D', '', phone or '')
+    if digits.startswith('84') and len(digits) in (11, 12):
+        digits = '0' + digits[2:]
+    return digits
+
+
+def normalize_email(email):
+    """Chữ thường; với Gmail bỏ dấu chấm và phần +nhãn ở tên hộp thư."""
+    email = (email or '').strip().lower()
+    local, _, domain = email.partition('@')
+    if domain in ('gmail.com', 'googlemail.com'):
+        local = local.split('+', 1)[0].replace('.', '')
+        domain = 'gmail.com'
+    return f'{local}@{domain}' if domain else local
+
+
+def strip_diacritics(text):
+    """Bỏ dấu tiếng Việt và đổi về chữ thường: 'Nguyễn Đức' -> 'nguyen duc'."""
+    text = (text or '').replace('đ', 'd').replace('Đ', 'D')
+    decomposed = unicodedata.normalize('NFD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def search_words(text):
+    """Tách chuỗi đã bỏ dấu thành các từ chữ/số dùng cho chỉ mục tìm kiếm."""
+    return re.findall(r'[a-z0-9]+', strip_diacritics(text))
@@ -0,0 +1,189 @@
+# CollegeApp/openapi.py
+"""
+Tài liệu OpenAPI (drf-yasg) được sinh một lần cho mỗi phiên bản mã nguồn.
+
+Sinh schema phải duyệt mọi view và serializer, nên:
+  - schema được sinh với một request giả (public, không có host) và lưu trên đĩa
+    dưới dạng CACHE_DIR/openapi-<phiên bản>.json / .yaml; các tiến trình sau chỉ
+    đọc file, lần đầu cần thì mới sinh;
+  - bytes đã mã hóa được giữ trong bộ nhớ cùng ETag, /swagger.json, /swagger.yaml và
+    ?format=openapi của /swagger/, /redoc/ trả thẳng bytes hoặc 304;
+  - phiên bản mặc định là băm các file .py của dự án cùng phiên bản Django, DRF,
+    drf-yasg: đổi mã thì đổi tên file, schema cũ không còn được dùng.
+
+Lệnh openapi_schema sinh lại schema (chạy lúc build để ghi sẵn vào CACHE_DIR) và
+in ra để so sánh trong CI.
+
+Cấu hình trong settings:
+    OPENAPI_SCHEMA = {
+        'CACHE_DIR': BASE_DIR / 'var' / 'openapi',
+        'VERSION': None,  # chuỗi phiên bản (vd. mã commit); None = băm mã nguồn
+    }
+"""
+import hashlib
+import os
+import threading
+from importlib import import_module
+from pathlib import Path
+
+import django
+import drf_yasg
+import rest_framework
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.cache import get_conditional_response
+from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.views import get_schema_view
+from rest_framework.request import Request
+
+API_INFO = openapi.Info(
+    title="College API",
+    default_version='v1',
+    description="APIs for CollegeApp",
+    contact=openapi.Contact(email="https://sgc.edu.vn/"),
+    license=openapi.License(name="Cao Đẳng Sài Gòn Gia Định@2004"),
+)
+# định dạng của renderer drf-yasg -> (đuôi file, codec)
+FORMATS = {
+    'openapi': ('json', OpenAPICodecJson),
+    'json': ('json', OpenAPICodecJson),
+    'yaml': ('yaml', OpenAPICodecYaml),
+}
+SKIP_DIRS = {'migrations', '__pycache__', 'tests'}
+
+
+def get_config():
+    config = {
+        'CACHE_DIR': Path(settings.BASE_DIR) / 'var' / 'openapi',
+        'VERSION': None,
+    }
+    config.update(getattr(settings, 'OPENAPI_SCHEMA', {}))
+    config['CACHE_DIR'] = Path(config['CACHE_DIR'])
+    return config
+
+
+def source_dirs():
+    """Thư mục mã nguồn của dự án: các app nằm trong BASE_DIR và package của ROOT_URLCONF."""
+    base = Path(settings.BASE_DIR).resolve()
+    dirs = {Path(app.path).resolve() for app in apps.get_app_configs()}
+    dirs.add(Path(import_module(settings.ROOT_URLCONF).__file__).resolve().parent)
+    return sorted(path for path in dirs if path == base or base in path.parents)
+
+
+def code_version():
+    hasher = hashlib.blake2b(digest_size=10)
+    hasher.update(f'{django.__version__}|{rest_framework.VERSION}|{drf_yasg.__version__}'.encode())
+    for directory in source_dirs():
+        for path in sorted(directory.rglob('*.py')):
+            if SKIP_DIRS.intersection(path.relative_to(directory).parts):
+                continue
+            hasher.update(path.relative_to(directory.parent).as_posix().encode())
+            hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+class SchemaStore:
+    def __init__(self, config):
+        self.config = config
+        self._lock = threading.RLock()
+        self._documents = {}  # đuôi file -> (bytes, ETag)
+        self._version = None
+
+    @property
+    def version(self):
+        if self._version is None:
+            self._version = str(self.config['VERSION'] or code_version())
+        return self._version
+
+    def path(self, extension):
+        return self.config['CACHE_DIR'] / f'openapi-{self.version}.{extension}'
+
+    def generate(self):
+        """Sinh schema từ view/serializer, ghi file cho mọi định dạng; trả {đuôi file: bytes}."""
+        # Request giả cho các view đọc self.request trong get_queryset(); url='' để không ghi host
+        request = Request(RequestFactory().get('/swagger.json'))
+        generator = swagger_settings.DEFAULT_GENERATOR_CLASS(API_INFO, url='')
+        schema = generator.get_schema(request=request, public=True)
+        contents = {}
+        for extension, codec in FORMATS.values():
+            contents[extension] = codec(validators=[]).encode(schema)
+        directory = self.config['CACHE_DIR']
+        directory.mkdir(parents=True, exist_ok=True)
+        for extension, content in contents.items():
+            target = self.path(extension)
+            temporary = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+            temporary.write_bytes(content)
+            os.replace(temporary, target)
+        with self._lock:
+            self._documents = {extension: (content, self._etag(content)) for extension, content in contents.items()}
+        return contents
+
+    def prune(self):
+        """Xóa file schema của các phiên bản khác trong CACHE_DIR."""
+        removed = 0
+        for stale in self.config['CACHE_DIR'].glob('openapi-*.*'):
+            if not stale.name.startswith(f'openapi-{self.version}.'):
+                stale.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _etag(content):
+        return '"%s"' % hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def document(self, extension):
+        """(bytes, ETag) của schema; đọc file của phiên bản hiện tại hoặc sinh mới nếu chưa có."""
+        document = self._documents.get(extension)
+        if document is not None:
+            return document
+        with self._lock:
+            if extension not in self._documents:
+                try:
+                    content = self.path(extension).read_bytes()
+                except FileNotFoundError:
+                    self.generate()
+                else:
+                    self._documents[extension] = (content, self._etag(content))
+            return self._documents[extension]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_schema_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SchemaStore(get_config())
+    return _store
+
+
+def precomputed_schema_view(**kwargs):
+    """
+    get_schema_view() của drf-yasg với API_INFO, nhưng schema (JSON/YAML) lấy từ
+    SchemaStore thay vì sinh lại mỗi request. Trang UI vẫn do drf-yasg vẽ (không cần
+    duyệt view); nó tải schema qua ?format=openapi.
+    """
+    base = get_schema_view(API_INFO, **kwargs)
+
+    class PrecomputedSchemaView(base):
+        def get(self, request, version='', format=None):
+            renderer = request.accepted_renderer
+            name = renderer.format.lstrip('.')  # renderer tương thích cũ dùng '.json', '.yaml'
+            if name not in FORMATS:
+                return super().get(request, version, format)
+            content, etag = get_schema_store().document(FORMATS[name][0])
+            response = get_conditional_response(request._request, etag=etag)
+            if response is None:
+                response = HttpResponse(content, content_type=f'{renderer.media_type}; charset=utf-8')
+            response['ETag'] = etag
+            response['Cache-Control'] = 'no-cache'  # luôn hỏi lại bằng If-None-Match
+            return response
+
+    return PrecomputedSchemaView
@@ -0,0 +1,276 @@
+# CollegeApp/profiling.py
+"""
+Đo từng request: số câu SQL, tổng thời gian DB, câu lặp lại (dấu hiệu N+1),
+thời gian serializer, thời gian view.
+
+Mọi request chỉ được bấm giờ tổng (một lần perf_counter). Một phần SAMPLE_RATE
+request được đo chi tiết:
+  - connection.execute_wrapper ghi lại từng câu SQL (tối đa MAX_RECORDED câu, sau
+    đó chỉ cộng dồn số lượng và thời gian);
+  - thời gian của Serializer.data / is_valid (chỉ tính lớp ngoài cùng, serializer
+    lồng nhau không bị cộng hai lần);
+  - thời gian view: từ process_view đến khi có response, gồm cả render;
+  - header Server-Timing: db, serializer, view, total.
+Câu SQL được gom theo chữ ký: chuỗi SQL với danh sách IN (%s, %s, ...) rút gọn, nên
+cùng một truy vấn chạy trong vòng lặp cho cùng chữ ký.
+
+Request chậm (>= SLOW_REQUEST_MS) hoặc có chữ ký lặp >= DUPLICATE_THRESHOLD lần được
+ghi một dòng JSON vào logger 'CollegeApp.profiling', kèm các câu SQL chậm nhất và
+kế hoạch EXPLAIN của chúng (chỉ với SELECT). Request chậm không được lấy mẫu chỉ có
+thời gian tổng.
+
+Với response dạng luồng (xuất CSV/XLSX), SQL chạy trong lúc gửi body vẫn được ghi
+và thời gian tổng tính đến khi body được đọc hết. Header Server-Timing đã gửi trước
+body nên chỉ có số liệu đến lúc trả header (kèm metric 'stream' để đánh dấu).
+
+Tham số của câu SQL (token, email, số CCCD...) mặc định không được ghi; chỉ bật
+LOG_PARAMS khi gỡ lỗi trên máy cá nhân. Lưu ý EXPLAIN của PostgreSQL có
+in giá trị hằng trong điều kiện lọc: ở môi trường đó nên tắt EXPLAIN.
+
+Cấu hình trong settings:
+    REQUEST_PROFILING = {
+        'ENABLED': True,
+        'SAMPLE_RATE': 0.05,          # tỉ lệ request được đo chi tiết (0..1)
+        'SLOW_REQUEST_MS': 500,
+        'DUPLICATE_THRESHOLD': 10,
+        'MAX_RECORDED': 1000,         # số câu SQL giữ lại mỗi request
+        'LOGGED_QUERIES': 5,          # số câu chậm nhất ghi vào log
+        'EXPLAIN': True,
+        'SERVER_TIMING': True,
+        'LOG_PARAMS': False,          # ghi tham số của câu SQL chậm vào log
+    }
+"""
+import contextvars
+import json
+import logging
+import random
+import re
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from django.http import FileResponse
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r'\((?:%s|\?)(?:,\s*(?:%s|\?))*\)')
+_current = contextvars.ContextVar('request_profile', default=None)
+_serializers_patched = False
+
+
+def get_config():
+    config = {
+        'ENABLED': True,
+        'SAMPLE_RATE': 0.05,
+        'SLOW_REQUEST_MS': 500,
+        'DUPLICATE_THRESHOLD': 10,
+        'MAX_RECORDED': 1000,
+        'LOGGED_QUERIES': 5,
+        'EXPLAIN': True,
+        'SERVER_TIMING': True,
+        'LOG_PARAMS': False,
+    }
+    config.update(getattr(settings, 'REQUEST_PROFILING', {}))
+    return config
+
+
+def query_signature(sql):
+    return _IN_LIST.sub('(...)', sql)
+
+
+class RequestProfile:
+    def __init__(self, max_recorded):
+        self.max_recorded = max_recorded
+        self.queries = []  # (alias, sql, params, giây)
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.view_start = None
+        self.view_time = 0.0  # từ lúc gọi view đến khi có response (gồm cả render)
+        self.in_serializer = False
+
+    def recorder(self, alias):
+        def record(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.query_count += 1
+                self.db_time += elapsed
+                if len(self.queries) < self.max_recorded:
+                    self.queries.append((alias, sql, None if many else params, elapsed))
+        return record
+
+    def duplicates(self, threshold):
+        """[(chữ ký, số lần, tổng giây)] của các chữ ký chạy >= threshold lần."""
+        groups = defaultdict(lambda: [0, 0.0])
+        for _, sql, _, elapsed in self.queries:
+            group = groups[query_signature(sql)]
+            group[0] += 1
+            group[1] += elapsed
+        return sorted(((signature, count, total) for signature, (count, total) in groups.items()
+                       if count >= threshold), key=lambda item: -item[1])
+
+
+def _timed(method):
+    """Cộng thời gian của method serializer vào profile của request (chỉ lời gọi ngoài cùng)."""
+    def wrapper(self, *args, **kwargs):
+        profile = _current.get()
+        if profile is None or profile.in_serializer:
+            return method(self, *args, **kwargs)
+        profile.in_serializer = True
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profile.serializer_time += time.perf_counter() - start
+            profile.in_serializer = False
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def _patch_serializers():
+    global _serializers_patched
+    if _serializers_patched:
+        return
+    for cls in (serializers.BaseSerializer, serializers.Serializer, serializers.ListSerializer):
+        for name in ('data', 'is_valid'):
+            attribute = cls.__dict__.get(name)
+            if isinstance(attribute, property):
+                setattr(cls, name, property(_timed(attribute.fget)))
+            elif callable(attribute):
+                setattr(cls, name, _timed(attribute))
+    _serializers_patched = True
+
+
+def explain(alias, sql, params):
+    """Kế hoạch thực thi của một câu SELECT (list dòng), None nếu không lấy được."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    connection = connections[alias]
+    if connection.force_debug_cursor:
+        return None  # đang có CaptureQueriesContext / assertNumQueries: không chen câu EXPLAIN
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return [' | '.join(str(value) for value in row) for row in cursor.fetchall()]
+    except (DatabaseError, TypeError, ValueError):
+        return None
+
+
+class RequestProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        _patch_serializers()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        profile = None
+        if random.random() < self.config['SAMPLE_RATE']:
+            profile = RequestProfile(self.config['MAX_RECORDED'])
+        with self.recording(profile):
+            response = self.get_response(request)
+        end = time.perf_counter()
+        if profile is not None and profile.view_start is not None:
+            profile.view_time = end - profile.view_start
+        streamed = response.streaming and not response.is_async and not isinstance(response, FileResponse)
+        if self.config['SERVER_TIMING']:
+            response['Server-Timing'] = self.server_timing(profile, end - start, streamed)
+        if streamed:
+            # Body sinh dần (exports.py) chạy SQL sau khi view trả về: đo tiếp cho đến khi đọc hết body
+            response.streaming_content = self.stream(request, response, response.streaming_content, start, profile)
+        else:
+            self.finish(request, response, end - start, profile)
+        return response
+
+    @contextmanager
+    def recording(self, profile):
+        """Ghi các câu SQL và thời gian serializer vào profile (không làm gì nếu request không được lấy mẫu)."""
+        if profile is None:
+            yield
+            return
+        token = _current.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.recorder(connection.alias)))
+                yield
+        finally:
+            _current.reset(token)
+
+    def stream(self, request, response, content, start, profile):
+        chunks = iter(content)
+        try:
+            while True:
+                with self.recording(profile):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self.finish(request, response, time.perf_counter() - start, profile)
+
+    @staticmethod
+    def server_timing(profile, total, streamed):
+        metrics = []
+        if profile is not None:
+            metrics += [
+                f'db;dur={profile.db_time * 1000:.1f};desc="{profile.query_count} queries"',
+                f'serializer;dur={profile.serializer_time * 1000:.1f}',
+                f'view;dur={profile.view_time * 1000:.1f}',
+            ]
+        metrics.append(f'total;dur={total * 1000:.1f}')
+        if streamed:
+            # Header được gửi trước body: số liệu chỉ tính đến lúc này, số đầy đủ nằm trong log
+            metrics.append('stream;desc="body not measured"')
+        return ', '.join(metrics)
+
+    def finish(self, request, response, total, profile):
+        duplicates = profile.duplicates(self.config['DUPLICATE_THRESHOLD']) if profile is not None else ()
+        if duplicates or total * 1000 >= self.config['SLOW_REQUEST_MS']:
+            self.log(request, response, total, profile, duplicates)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = _current.get()
+        if profile is not None:
+            profile.view_start = time.perf_counter()
+        return None
+
+    def log(self, request, response, total, profile, duplicates=()):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'sampled': profile is not None,
+        }
+        if profile is not None:
+            slowest = sorted(profile.queries, key=lambda query: -query[3])[:self.config['LOGGED_QUERIES']]
+            record.update({
+                'view_ms': round(profile.view_time * 1000, 1),
+                'serializer_ms': round(profile.serializer_time * 1000, 1),
+                'db_ms': round(profile.db_time * 1000, 1),
+                'queries': profile.query_count,
+                'duplicates': [{'sql': signature, 'count': count, 'total_ms': round(elapsed * 1000, 1)}
+                               for signature, count, elapsed in duplicates],
+                'slowest': [self.describe(alias, sql, params, elapsed) for alias, sql, params, elapsed in slowest],
+            })
+        logger.warning(json.dumps(record, ensure_ascii=False, default=str), extra={'profile': record})
+
+    def describe(self, alias, sql, params, elapsed):
+        query = {
+            'sql': sql,
+            'ms': round(elapsed * 1000, 1),
+            'explain': explain(alias, sql, params) if self.config['EXPLAIN'] else None,
+        }
+        if self.config['LOG_PARAMS']:
+            query['params'] = repr(params)[:500]
+        return query
@@ -0,0 +1,157 @@
+# CollegeApp/schedule.py
+"""
+Phân tích chuỗi lịch học của lớp học phần thành các khung giờ trong tuần
+(không phụ thuộc model).
+
+Chấp nhận các dạng thường gặp, có hoặc không có dấu:
+    "Thứ 2, Tiết 1-3"
+    "Thứ 2, 4 - Tiết 1-3"            (nhiều ngày cùng tiết)
+    "Thứ Hai, Tiết 1,2,3"
+    "T3 (7-9); T5 (1-3)"             (nhiều buổi, ngăn cách bởi ; hoặc xuống dòng)
+    "Thứ 2 (Tiết 1-3), Thứ 4 (Tiết 7-9)"  (nhiều buổi ngăn cách bởi dấu phẩy)
+    "Chủ nhật, Tiết 4 đến 6"
+
+Mỗi khung giờ là (thứ, tiết bắt đầu, tiết kết thúc); thứ 2..7, chủ nhật là 8.
+Tiết trong ngày được lưu gọn thành bitmask (bit i ứng với tiết i).
+"""
+import re
+from collections import namedtuple
+
+from .normalize import strip_diacritics
+
+MIN_PERIOD, MAX_PERIOD = 1, 15
+SUNDAY = 8
+DAY_NAMES = {2: 'Thứ 2', 3: 'Thứ 3', 4: 'Thứ 4', 5: 'Thứ 5', 6: 'Thứ 6', 7: 'Thứ 7', SUNDAY: 'Chủ nhật'}
+DAY_WORDS = {'hai': 2, 'ba': 3, 'tu': 4, 'nam': 5, 'sau': 6, 'bay': 7}
+
+TimeSlot = namedtuple('TimeSlot', ['day', 'start_period', 'end_period'])
+
+_DAY_RE = re.compile(r'\bchu\s*nhat\b|\bcn\b|\bthu\s*(hai|ba|tu|nam|sau|bay|[2-7])\b|\bt\s*([2-7])\b')
+_DAY_LIST_RE = re.compile(r'^[\s,&]*(?:va\s+)?([2-7])\b')
+_PERIOD_RE = re.compile(r'(\d{1,2})\s*(?:-|–|den|->)\s*(\d{1,2})|(\d{1,2})')
+
+
+class ScheduleParseError(ValueError):
+    pass
+
+
+def period_mask(start_period, end_period):
+    return ((1 << (end_period + 1)) - 1) ^ ((1 << start_period) - 1)
+
+
+def _has_periods(text):
+    return 'tiet' in text or '(' in text
+
+
+def _split_groups(segment):
+    """
+    Tách một đoạn thành các buổi: một thứ xuất hiện sau phần tiết của buổi trước mở
+    buổi mới ("Thứ 2 (Tiết 1-3), Thứ 4 (Tiết 7-9)"); "Thứ 2, Thứ 4 - Tiết 1-3" vẫn là một buổi.
+    """
+    starts = [0]
+    for match in _DAY_RE.finditer(segment):
+        if _has_periods(segment[starts[-1]:match.start()]):
+            starts.append(match.start())
+    return [segment[start:end] for start, end in zip(starts, starts[1:] + [len(segment)])]
+
+
+def _split_days_periods(segment):
+    """Tách một buổi thành (phần ngày, phần tiết)."""
+    if 'tiet' in segment:
+        days, _, periods = segment.partition('tiet')
+    else:
+        match = re.search(r'\(([^)]*)\)', segment)
+        if match is None:
+            raise ScheduleParseError(f"Không tìm thấy tiết học trong '{segment.strip()}'.")
+        days, periods = segment[:match.start()], match.group(1)
+    # Phần tiết còn chứa thứ hoặc chữ "tiết" thứ hai: không đoán, báo lỗi
+    if 'tiet' in periods or _DAY_RE.search(periods):
+        raise ScheduleParseError(f"Không tách được các buổi trong '{segment.strip()}'.")
+    return days, periods
+
+
+def _parse_days(text):
+    days = []
+    position = 0
+    while True:
+        match = _DAY_RE.search(text, position)
+        if match is None:
+            break
+        if match.group(0).startswith(('chu', 'cn')):
+            days.append(SUNDAY)
+        else:
+            value = match.group(1) or match.group(2)
+            days.append(DAY_WORDS.get(value) or int(value))
+        position = match.end()
+        # "Thứ 2, 4" / "Thứ 2 và 4": các số ngay sau cũng là thứ
+        while True:
+            extra = _DAY_LIST_RE.match(text[position:])
+            if extra is None:
+                break
+            days.append(int(extra.group(1)))
+            position += extra.end()
+    return days
+
+
+def _parse_periods(text):
+    ranges = []
+    for match in _PERIOD_RE.finditer(text):
+        if match.group(3):
+            start = end = int(match.group(3))
+        else:
+            start, end = int(match.group(1)), int(match.group(2))
+        if not (MIN_PERIOD <= start <= end <= MAX_PERIOD):
+            raise ScheduleParseError(f"Tiết {start}-{end} không hợp lệ (tiết {MIN_PERIOD}-{MAX_PERIOD}).")
+        ranges.append((start, end))
+    # Gộp các tiết liền nhau: "1,2,3" -> 1-3
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_schedule(text):
+    """Trả về danh sách TimeSlot đã sắp xếp; chuỗi rỗng cho danh sách rỗng."""
+    normalized = strip_diacritics(text).strip()
+    if not normalized:
+        return []
+    slots = set()
+    segments = (group for part in re.split(r'[;\n|]+', normalized) for group in _split_groups(part))
+    for segment in segments:
+        if not segment.strip(' ,'):
+            continue
+        day_text, period_text = _split_days_periods(segment)
+        days = _parse_days(day_text)
+        periods = _parse_periods(period_text)
+        if not days:
+            raise ScheduleParseError(f"Không tìm thấy thứ trong '{segment.strip()}'.")
+        if not periods:
+            raise ScheduleParseError(f"Không tìm thấy tiết học trong '{segment.strip()}'.")
+        for day in days:
+            for start, end in periods:
+                slots.add(TimeSlot(day, start, end))
+    result = sorted(slots)
+    for first, second in zip(result, result[1:]):
+        if first.day == second.day and second.start_period <= first.end_period:
+            raise ScheduleParseError(f"Các buổi học trùng tiết trong {DAY_NAMES[first.day]}.")
+    return result
+
+
+def format_schedule(slots):
+    """Chuỗi lịch học chuẩn từ danh sách khung giờ: 'Thứ 2, Tiết 1-3; Thứ 5, Tiết 7-9'."""
+    parts = []
+    for slot in sorted(slots):
+        periods = (f"{slot.start_period}-{slot.end_period}" if slot.end_period != slot.start_period
+                   else str(slot.start_period))
+        parts.append(f"{DAY_NAMES[slot.day]}, Tiết {periods}")
+    return '; '.join(parts)
+
+
+def room_key(room):
+    """Khóa so khớp phòng học: 'Phòng A1.101' và 'a1-101' cùng là 'A1101'."""
+    text = re.sub(r'^\s*phong\b', '', strip_diacritics(room))
+    return re.sub(r'[^a-z0-9]', '', text).upper()
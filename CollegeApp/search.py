@@ -0,0 +1,159 @@
+# CollegeApp/search.py
+"""
+Tìm kiếm người dùng không phân biệt dấu, dựa trên bảng chỉ mục UserSearchToken.
+
+Mỗi người dùng có một tập từ khóa (đã bỏ dấu, chữ thường) lấy từ họ, tên, hai
+phần trước và sau @ của email, CCCD và mã sinh viên/giảng viên/quản trị. Truy vấn
+được tách thành từ; mỗi từ là một điều kiện `token LIKE 'tu%'` trên index (token,
+user), người dùng phải khớp tất cả các từ. Cụm có @ ở giữa ('an@gmail.com') là
+địa chỉ email, được lọc bằng email LIKE 'cum%' (index của email) thay vì từ khóa. Khi không có kết quả, mỗi từ được mở rộng
+sang các từ khóa gần đúng (khoảng cách chỉnh sửa nhỏ, cùng chữ cái đầu).
+
+Chỉ mục được cập nhật bởi signal post_save (signals.py), khi nhập hàng loạt
+(bulk_import.py) và có thể dựng lại bằng lệnh `rebuild_search_index`.
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Length
+
+from .models import User, UserSearchToken
+from .normalize import search_words
+
+CODE_FIELDS = ('student_code', 'faculty_code', 'admin_code')
+GENERAL_FIELDS = ('first_name', 'last_name', 'email', 'national_id_card')
+SEARCH_FIELDS = frozenset(GENERAL_FIELDS + CODE_FIELDS)
+MAX_TOKEN_LENGTH = 100
+MAX_QUERY_WORDS = 6
+MIN_FUZZY_LENGTH = 3
+MAX_FUZZY_CANDIDATES = 20
+
+
+def _words_and_compact(text):
+    """Các từ của chuỗi và dạng viết liền ('SV-2024-001' -> sv, 2024, 001, sv2024001)."""
+    words = search_words(text)
+    tokens = set(words)
+    if len(words) > 1:
+        tokens.add(''.join(words))
+    return tokens
+
+
+def user_tokens(user):
+    """Trả về (từ khóa chung, từ khóa mã) của một người dùng."""
+    general = set()
+    general.update(search_words(user.first_name))
+    general.update(search_words(user.last_name))
+    general.update(search_words(user.national_id_card))
+    local, _, domain = (user.email or '').partition('@')
+    general.update(_words_and_compact(local))
+    general.update(_words_and_compact(domain))
+    codes = set()
+    for name in CODE_FIELDS:
+        codes.update(_words_and_compact(getattr(user, name, None)))
+    return ({t[:MAX_TOKEN_LENGTH] for t in general if t},
+            {t[:MAX_TOKEN_LENGTH] for t in codes if t})
+
+
+def has_code_fields(user):
+    """Đối tượng Student/Faculty/Admin mang mã; User gốc thì không (giữ nguyên từ khóa mã đã có)."""
+    return any(hasattr(user, name) for name in CODE_FIELDS)
+
+
+def index_users(users, using='default'):
+    """Ghi lại từ khóa cho danh sách người dùng: một DELETE và một INSERT nhiều dòng."""
+    users = [user for user in users if user.pk is not None]
+    if not users:
+        return 0
+    rows = []
+    with_codes, without_codes = [], []
+    for user in users:
+        general, codes = user_tokens(user)
+        rows.extend(UserSearchToken(user_id=user.pk, token=token, kind='N') for token in general)
+        if has_code_fields(user):
+            with_codes.append(user.pk)
+            rows.extend(UserSearchToken(user_id=user.pk, token=token, kind='C') for token in codes)
+        else:
+            without_codes.append(user.pk)
+
+    stale = Q(user_id__in=with_codes) | Q(user_id__in=without_codes, kind='N')
+    with transaction.atomic(using=using):
+        UserSearchToken.objects.using(using).filter(stale).delete()
+        UserSearchToken.objects.using(using).bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+    return len(rows)
+
+
+# -- Truy vấn ----------------------------------------------------------------
+
+def edit_distance(a, b, limit):
+    """
+    Khoảng cách chỉnh sửa (Levenshtein có tính hoán vị hai ký tự liền nhau),
+    dừng sớm và trả về limit + 1 khi đã vượt quá limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def fuzzy_tokens(word, using='default'):
+    """Các từ khóa (chung) gần đúng với `word`, lấy từ những từ cùng chữ cái đầu và độ dài gần bằng."""
+    if len(word) < MIN_FUZZY_LENGTH or word.isdigit():
+        return []
+    limit = 1 if len(word) <= 5 else 2
+    vocabulary = (UserSearchToken.objects.using(using)
+                  .filter(kind='N', token__startswith=word[0])
+                  .annotate(length=Length('token'))
+                  .filter(length__gte=len(word) - limit, length__lte=len(word) + limit)
+                  .values_list('token', flat=True)
+                  .distinct())
+    scored = []
+    for token in vocabulary:
+        distance = edit_distance(word, token, limit)
+        if distance <= limit:
+            scored.append((distance, token))
+    scored.sort()
+    return [token for _, token in scored[:MAX_FUZZY_CANDIDATES]]
+
+
+def _match_all(queryset, conditions):
+    for condition in conditions:
+        tokens = UserSearchToken.objects.using(queryset.db).filter(condition)
+        queryset = queryset.filter(pk__in=tokens.values('user_id'))
+    return queryset
+
+
+def search_users(query, queryset=None, fuzzy=True):
+    """
+    Lọc `queryset` (User hoặc Student/Faculty/Admin) theo chuỗi tìm kiếm.
+    Cụm dạng email lọc theo tiền tố của email; các từ còn lại tìm theo tiền tố
+    trước, nếu không có kết quả và `fuzzy` thì tìm gần đúng.
+    """
+    if queryset is None:
+        queryset = User.objects.all()
+    terms = query.split()
+    for term in terms:
+        if '@' in term[1:]:
+            queryset = queryset.filter(email__istartswith=term)
+    words = search_words(' '.join(term for term in terms if '@' not in term[1:]))[:MAX_QUERY_WORDS]
+    if not words:
+        return queryset
+    result = _match_all(queryset, [Q(token__startswith=word) for word in words])
+    if not fuzzy or result.exists():
+        return result
+    conditions = []
+    for word in words:
+        candidates = fuzzy_tokens(word, using=queryset.db)
+        condition = Q(token__startswith=word)
+        if candidates:
+            condition |= Q(token__in=candidates)
+        conditions.append(condition)
+    return _match_all(queryset, conditions)
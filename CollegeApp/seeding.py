@@ -0,0 +1,191 @@
+# CollegeApp/seeding.py
+"""
+Dữ liệu trường học giả lập cho benchmark (lệnh seed_college, bench_api).
+
+Cùng quy mô và cùng seed thì sinh ra cùng dữ liệu (random.Random(seed)), nên kết
+quả benchmark giữa các commit so sánh được. Mọi bản ghi mang dấu hiệu riêng để
+xóa lại được mà không chạm dữ liệu thật:
+  - mã (code, course_code, class_name, student_code, faculty_code) bắt đầu bằng PREFIX;
+  - email tài khoản và đăng ký tư vấn thuộc miền EMAIL_DOMAIN.
+Mọi tài khoản có mật khẩu PASSWORD (băm một lần, dùng chung chuỗi băm).
+
+Dữ liệu được ghi theo lô: bulk_create cho danh mục và đăng ký tư vấn,
+bulk_import.insert_accounts cho sinh viên / giảng viên (cập nhật chỉ mục tìm kiếm,
+sĩ số lớp và danh bạ như khi nhập tài khoản). Sau cùng tăng số thế hệ của các
+model danh mục để cache (catalog.py, curriculum.py) không giữ dữ liệu cũ.
+"""
+import datetime
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from .bulk_import import insert_accounts
+from .generations import bump
+from .models import (AcademicYear, AdvisoryRegistration, Class, Course, Department, Faculty, Major, Program,
+                     Student, User)
+
+PREFIX = 'BENCH-'
+EMAIL_DOMAIN = 'bench.local'
+PASSWORD = 'bench-password'
+ADMIN_EMAIL = f'admin@{EMAIL_DOMAIN}'
+BATCH_SIZE = 1000
+BASE_YEAR = 2024  # năm bắt đầu của khóa mới nhất (cố định để dữ liệu không đổi theo ngày chạy)
+
+SCALES = {
+    'tiny': {'departments': 2, 'majors_per_department': 2, 'academic_years': 2, 'classes_per_major': 1,
+             'courses_per_major': 4, 'faculty': 5, 'students': 50, 'registrations': 100},
+    'small': {'departments': 4, 'majors_per_department': 3, 'academic_years': 4, 'classes_per_major': 2,
+              'courses_per_major': 10, 'faculty': 40, 'students': 2000, 'registrations': 5000},
+    'medium': {'departments': 8, 'majors_per_department': 4, 'academic_years': 4, 'classes_per_major': 4,
+               'courses_per_major': 20, 'faculty': 200, 'students': 20000, 'registrations': 50000},
+    'large': {'departments': 12, 'majors_per_department': 5, 'academic_years': 5, 'classes_per_major': 8,
+              'courses_per_major': 30, 'faculty': 600, 'students': 100000, 'registrations': 300000},
+}
+
+LAST_NAMES = ['Nguyễn', 'Trần', 'Lê', 'Phạm', 'Hoàng', 'Huỳnh', 'Phan', 'Vũ', 'Võ', 'Đặng', 'Bùi', 'Đỗ']
+FIRST_NAMES = ['Văn An', 'Thị Bình', 'Minh Châu', 'Quốc Dũng', 'Thu Hà', 'Gia Huy', 'Ngọc Lan', 'Đức Minh',
+               'Thanh Nam', 'Bảo Ngọc', 'Hữu Phúc', 'Kim Quyên', 'Tấn Tài', 'Mai Trang', 'Anh Tuấn', 'Hải Yến']
+CITIES = [('Quận 1', 'TP. Hồ Chí Minh'), ('Bình Thạnh', 'TP. Hồ Chí Minh'), ('Thủ Đức', 'TP. Hồ Chí Minh'),
+          ('Biên Hòa', 'Đồng Nai'), ('Thủ Dầu Một', 'Bình Dương'), ('Ninh Kiều', 'Cần Thơ')]
+
+
+def get_scale(name, **overrides):
+    scale = dict(SCALES[name])
+    scale.update({key: value for key, value in overrides.items() if value is not None})
+    return scale
+
+
+def _person(rng, index, model, password, **fields):
+    district, city = rng.choice(CITIES)
+    return model(
+        username=f'{index}@{EMAIL_DOMAIN}', email=f'{index}@{EMAIL_DOMAIN}', password=password,
+        last_name=rng.choice(LAST_NAMES), first_name=rng.choice(FIRST_NAMES),
+        nationality='Việt Nam', national_id_card=f'{rng.randrange(10 ** 11, 10 ** 12)}',
+        date_of_birth=datetime.date(rng.randint(1985, 2006), rng.randint(1, 12), rng.randint(1, 28)),
+        phone=f'09{rng.randrange(10 ** 7, 10 ** 8)}', gender=rng.choice(['M', 'F']),
+        address=f'{rng.randint(1, 500)} đường số {rng.randint(1, 60)}', district=district, city=city,
+        is_active=True, **fields)
+
+
+def clear():
+    """Xóa dữ liệu đã sinh; trả về số bản ghi bị xóa theo model."""
+    deleted = {}
+    with transaction.atomic():
+        for label, queryset in [
+            ('registrations', AdvisoryRegistration.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')),
+            ('users', User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')),
+            ('classes', Class.objects.filter(class_name__startswith=PREFIX)),
+            ('courses', Course.objects.filter(course_code__startswith=PREFIX)),
+            ('majors', Major.objects.filter(code__startswith=PREFIX)),
+            ('academic_years', AcademicYear.objects.filter(name__startswith=PREFIX)),
+            ('departments', Department.objects.filter(code__startswith=PREFIX)),
+            ('programs', Program.objects.filter(code__startswith=PREFIX)),
+        ]:
+            deleted[label] = queryset.delete()[0]
+    bump(Department, Program, Major, Course, AcademicYear, Class, Faculty)
+    return deleted
+
+
+def seed(scale, seed=0, progress=None):
+    """Sinh dữ liệu theo scale (dict như SCALES[...]); trả về số bản ghi đã tạo theo loại."""
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+    created = {}
+    with transaction.atomic():
+        Program.objects.bulk_create([
+            Program(name=name, code=f'{PREFIX}P{index}', duration_years=3)
+            for index, (name, _) in enumerate(Program.PROGRAM_TYPE_CHOICES)])
+        Department.objects.bulk_create([
+            Department(name=f'{PREFIX}Khoa {index:02d}', code=f'{PREFIX}K{index:02d}')
+            for index in range(scale['departments'])])
+        # bulk_create trên MySQL không trả về khóa chính: đọc lại theo mã
+        programs = list(Program.objects.filter(code__startswith=PREFIX).order_by('code'))
+        departments = list(Department.objects.filter(code__startswith=PREFIX).order_by('code'))
+        Major.objects.bulk_create([
+            Major(name=f'{PREFIX}Ngành {d:02d}-{m:02d}', code=f'{PREFIX}N{d:02d}{m:02d}',
+                  department=department, program=rng.choice(programs), required_credits=rng.choice([90, 110, 120]))
+            for d, department in enumerate(departments) for m in range(scale['majors_per_department'])])
+        majors = list(Major.objects.filter(code__startswith=PREFIX).select_related('department').order_by('code'))
+        AcademicYear.objects.bulk_create([
+            AcademicYear(name=f'{PREFIX}Khóa {BASE_YEAR - index}', start_year=BASE_YEAR - index,
+                         end_year=BASE_YEAR - index + 3)
+            for index in range(scale['academic_years'])])
+        years = list(AcademicYear.objects.filter(name__startswith=PREFIX).order_by('name'))
+        Class.objects.bulk_create([
+            Class(class_name=f'{PREFIX}L{major.code[-4:]}{y:02d}{c:02d}', major=major, academic_year=year,
+                  department=major.department)
+            for major in majors for y, year in enumerate(years) for c in range(scale['classes_per_major'])])
+        classes = list(Class.objects.filter(class_name__startswith=PREFIX)
+                       .select_related('major', 'academic_year', 'department').order_by('class_name'))
+        created.update(programs=len(programs), departments=len(departments), majors=len(majors),
+                       academic_years=len(years), classes=len(classes))
+
+        Course.objects.bulk_create([
+            Course(course_code=f'{PREFIX}C{major.code[-4:]}{c:03d}', title=f'Môn học {major.code[-4:]}.{c:03d}',
+                   credits=Decimal(rng.choice(['2.0', '3.0', '4.0'])), department=major.department,
+                   course_type=rng.choice(Course.COURSE_TYPE_CHOICES)[0], total_hours=rng.choice([30, 45, 60]))
+            for major in majors for c in range(scale['courses_per_major'])])
+        courses = {course.course_code: course for course in Course.objects.filter(course_code__startswith=PREFIX)}
+        course_majors, prerequisites = [], []
+        for major in majors:
+            chain = [courses[f'{PREFIX}C{major.code[-4:]}{c:03d}'] for c in range(scale['courses_per_major'])]
+            course_majors += [Course.major.through(course=course, major=major) for course in chain]
+            # Chuỗi tiên quyết trong ngành: môn sau cần môn trước (không tạo chu trình)
+            prerequisites += [Course.prerequisites.through(from_course=later, to_course=earlier)
+                              for earlier, later in zip(chain, chain[2:]) if rng.random() < 0.5]
+        Course.major.through.objects.bulk_create(course_majors, batch_size=BATCH_SIZE)
+        Course.prerequisites.through.objects.bulk_create(prerequisites, batch_size=BATCH_SIZE)
+        created['courses'] = len(courses)
+
+        faculty = [_person(rng, f'gv{index:05d}', Faculty, password, role='CBCNV',
+                           faculty_code=f'{PREFIX}GV{index:05d}', department=rng.choice(departments),
+                           type=rng.choice(Faculty.FACULTY_TYPE_CHOICES)[0])
+                   for index in range(scale['faculty'])]
+        insert_accounts(Faculty, faculty)
+        created['faculty'] = len(faculty)
+
+        admin = User.objects.create(
+            username=ADMIN_EMAIL, email=ADMIN_EMAIL, password=password, first_name='Quản trị', last_name='Benchmark',
+            nationality='Việt Nam', national_id_card='000000000000', phone='0900000000', role='ADMIN',
+            address='-', district='-', city='-', is_staff=True, is_superuser=True)
+        Token.objects.create(user=admin)
+
+    # Sinh viên và đăng ký tư vấn: mỗi lô một transaction để không giữ khóa quá lâu
+    for start in range(0, scale['students'], BATCH_SIZE):
+        students = []
+        for index in range(start, min(start + BATCH_SIZE, scale['students'])):
+            student_class = rng.choice(classes)
+            students.append(_person(
+                rng, f'sv{index:06d}', Student, password, role='SINH_VIEN',
+                student_code=f'{PREFIX}SV{index:06d}', parent_name=f'{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)}',
+                parent_phone=f'09{rng.randrange(10 ** 7, 10 ** 8)}', program=rng.choice(programs),
+                major=student_class.major, academic_year=student_class.academic_year,
+                department=student_class.department, student_class=student_class,
+                student_status=rng.choices(['DANG_HOC', 'BAO_LUU', 'DA_TOT_NGHIEP'], [90, 3, 7])[0]))
+        with transaction.atomic():
+            insert_accounts(Student, students)
+        if progress:
+            progress('students', start + len(students))
+    created['students'] = scale['students']
+
+    for start in range(0, scale['registrations'], BATCH_SIZE):
+        registrations = []
+        for index in range(start, min(start + BATCH_SIZE, scale['registrations'])):
+            registration = AdvisoryRegistration(
+                full_name=f'{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)}',
+                phone_number=f'09{rng.randrange(10 ** 7, 10 ** 8)}', email=f'dk{index:07d}@{EMAIL_DOMAIN}',
+                address=f'{rng.randint(1, 500)} đường số {rng.randint(1, 60)}', major_of_interest=rng.choice(majors),
+                has_graduated=rng.choice(AdvisoryRegistration.GRADUATED_CHOICES)[0],
+                status=rng.choices(['NEW', 'CONTACTED', 'CONSULTED'], [60, 25, 15])[0])
+            registration.normalize_contact()
+            registrations.append(registration)
+        AdvisoryRegistration.objects.bulk_create(registrations)
+        if progress:
+            progress('registrations', start + len(registrations))
+    created['registrations'] = scale['registrations']
+
+    bump(Department, Program, Major, Course, AcademicYear, Class, Faculty)
+    return created
@@ -1,11 +1,75 @@
 # your_app_name/serializers.py
+import uuid
+
 from django.contrib.auth import authenticate
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from django.contrib.auth.hashers import make_password, check_password
+from . import dedup
+from .hashing import hash_password
+from .loaders import BatchedListSerializer, BatchedRelatedField
 from .models import *
+from .normalize import normalize_email, normalize_phone
+from .thumbnails import thumbnail_urls
+
+
+def apply_account_defaults(validated_data, role):
+    """
+    Gán các giá trị mặc định cho tài khoản mới (vai trò, trạng thái, username).
+    Dùng chung cho tạo từng tài khoản và nhập hàng loạt.
+    """
+    validated_data['role'] = role
+    validated_data['is_active'] = True
+    # username là unique trong AbstractUser, dùng email để tránh trùng chuỗi rỗng
+    validated_data.setdefault('username', validated_data['email'])
+    return validated_data
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Giống PrimaryKeyRelatedField nhưng nếu context có `related_cache`
+    ({tên trường: {pk: đối tượng}}) thì tra cứu trong đó thay vì truy vấn từng dòng.
+    Nhập hàng loạt nạp sẵn cache này một lần cho cả lô.
+    """
+
+    def to_internal_value(self, data):
+        cache = self.context.get('related_cache')
+        if cache is None or self.field_name not in cache:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        obj = cache[self.field_name].get(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+class ThumbnailField(serializers.ReadOnlyField):
+    """
+    {biến thể: URL} của một trường đường dẫn ảnh (thumbnails.py), ví dụ
+    ThumbnailField(source='user_photo', variants=['small']).
+    """
+
+    def __init__(self, variants=None, **kwargs):
+        self.variants = variants
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        urls = thumbnail_urls(value, self.variants)
+        if request is not None:
+            urls = {variant: url if '://' in url else request.build_absolute_uri(url) for variant, url in urls.items()}
+        return urls
 
 
 class StudentCreateSerializer(serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
     email = serializers.EmailField(required=True)
     national_id_card = serializers.CharField(max_length=12, required=True)
 
@@ -16,20 +80,18 @@ class StudentCreateSerializer(serializers.ModelSerializer):
             'date_of_birth', 'place_of_birth', 'user_photo', 'email', 'phone',
             'gender', 'address', 'district', 'city', 'student_code',
             'parent_name', 'parent_phone', 'program', 'major', 'academic_year',
-            'department', 'student_status', 'GPA'
+            'department', 'student_status', 'student_class', 'GPA'
         ]
         extra_kwargs = {
             'password': {'write_only': True, 'required': False}  # Mật khẩu sẽ được xử lý riêng
         }
 
     def create(self, validated_data):
+        apply_account_defaults(validated_data, 'SINH_VIEN')
 
-        validated_data['role'] = 'SINH_VIEN'
-
+        # Băm trong pool tiến trình để không chiếm CPU của worker WSGI
         password = validated_data['national_id_card']
-        validated_data['password'] = make_password(password)
-
-        validated_data['is_active'] = True
+        validated_data['password'] = hash_password(password)
 
         student = Student.objects.create(**validated_data)
         return student
@@ -74,6 +136,7 @@ class AdminSerializer(serializers.ModelSerializer):
 
 
 class FacultyCreateSerializer(serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
     email = serializers.EmailField(required=True)
     national_id_card = serializers.CharField(max_length=12, required=True)
 
@@ -90,15 +153,12 @@ class FacultyCreateSerializer(serializers.ModelSerializer):
         }
 
     def create(self, validated_data):
-        # Thiết lập vai trò mặc định là CBCNV
-        validated_data['role'] = 'CBCNV'
+        # Vai trò mặc định là CBCNV, tài khoản đang hoạt động
+        apply_account_defaults(validated_data, 'CBCNV')
 
         # Mật khẩu mặc định là national_id_card và được băm
         password = validated_data['national_id_card']
-        validated_data['password'] = make_password(password)
-
-        # Tình trạng tài khoản mặc định là đang hoạt động
-        validated_data['is_active'] = True
+        validated_data['password'] = hash_password(password)
 
         faculty = Faculty.objects.create(**validated_data)
         return faculty
@@ -181,8 +241,9 @@ class MajorSerializer(serializers.ModelSerializer):
 
 
 class AdvisoryRegistrationSerializer(serializers.ModelSerializer):
-    major_of_interest = MajorSerializer(read_only=True)
-    major_of_interest_id = serializers.PrimaryKeyRelatedField(
+    # Nạp theo lô: cả trang danh sách chỉ tốn một truy vấn Major
+    major_of_interest = BatchedRelatedField(MajorSerializer)
+    major_of_interest_id = PrefetchedPrimaryKeyRelatedField(
         queryset=Major.objects.all(),
         source='major_of_interest',  # Ánh xạ đến trường major_of_interest trong model
         allow_null=False,
@@ -198,9 +259,12 @@ class AdvisoryRegistrationSerializer(serializers.ModelSerializer):
             'id', 'full_name', 'phone_number', 'email', 'address',
             'major_of_interest', 'major_of_interest_id',
             'has_graduated', 'has_graduated_display',
-            'registration_date', 'status', 'status_display', 'notes'
+            'registration_date', 'status', 'status_display', 'notes',
+            'submission_count', 'last_submitted_at', 'duplicate_of'
         ]
-        read_only_fields = ['registration_date', 'status', 'notes', 'has_graduated_display', 'status_display']
+        read_only_fields = ['registration_date', 'status', 'notes', 'has_graduated_display', 'status_display',
+                            'submission_count', 'last_submitted_at', 'duplicate_of']
+        list_serializer_class = BatchedListSerializer
 
 
     def create(self, validated_data):
@@ -209,8 +273,166 @@ class AdvisoryRegistrationSerializer(serializers.ModelSerializer):
         # Nếu major_of_interest_id không được cung cấp nhưng major_of_interest_id là null trong model
         if 'major_of_interest_id' in validated_data and validated_data['major_of_interest_id'] is None:
             validated_data['major_of_interest'] = None
-        return super().create(validated_data)
+        # Mã biên nhận trả cho người gửi; lần gửi bị gộp vẫn có mã riêng (không lộ đăng ký gốc)
+        self.receipt = validated_data['submission_id'] = uuid.uuid4()
+        if not dedup.dedup_enabled():
+            return super().create(validated_data)
+
+        # Bloom filter: đăng ký mới hoàn toàn không tốn thêm truy vấn nào
+        key = (normalize_phone(validated_data.get('phone_number')), normalize_email(validated_data.get('email')))
+        detector = dedup.get_detector()
+        original = detector.find_originals([key]).get(key)
+        if original is not None:
+            if dedup.get_config()['POLICY'] == 'merge':
+                major = validated_data.get('major_of_interest')
+                dedup.merge_into(original, major_id=major.pk if major else None,
+                                 address=validated_data.get('address'))
+                original.refresh_from_db()
+                return original
+            validated_data['duplicate_of'] = original
+        instance = super().create(validated_data)
+        detector.remember(*key)
+        return instance
 
     def update(self, instance, validated_data):
         validated_data.pop('registration_date', None)
         return super().update(instance, validated_data)
+
+
+class AdvisoryRegistrationReceiptSerializer(serializers.Serializer):
+    """Phản hồi cho người gửi đăng ký công khai: chỉ có mã biên nhận, không trả lại bản ghi đã lưu."""
+    message = serializers.CharField()
+    receipt = serializers.UUIDField()
+
+
+class UserSearchResultSerializer(serializers.ModelSerializer):
+    full_name = serializers.SerializerMethodField()
+    code = serializers.SerializerMethodField()
+    photo = ThumbnailField(source='user_photo', variants=['small'])
+
+    class Meta:
+        model = User
+        fields = ['id', 'full_name', 'email', 'role', 'code', 'photo']
+
+    def get_full_name(self, obj):
+        return f"{obj.last_name} {obj.first_name}".strip()
+
+    def get_code(self, obj):
+        # Quan hệ ngược student/faculty/admin đã được select_related trong view
+        for related, field in (('student', 'student_code'), ('faculty', 'faculty_code'), ('admin', 'admin_code')):
+            child = getattr(obj, related, None)
+            if child is not None:
+                return getattr(child, field)
+        return None
+
+
+class CourseBriefSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Course
+        fields = ['id', 'course_code', 'title', 'credits', 'course_type']
+
+
+class EnrollmentSerializer(serializers.ModelSerializer):
+    class_code = serializers.CharField(source='offering.class_code', read_only=True)
+    course_title = serializers.CharField(source='offering.course.title', read_only=True)
+
+    class Meta:
+        model = Enrollment
+        fields = ['id', 'offering', 'class_code', 'course_title', 'status', 'enrolled_at', 'dropped_at']
+        read_only_fields = ['status', 'enrolled_at', 'dropped_at']
+
+
+class ClassSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Class
+        fields = ['id', 'class_name', 'major', 'academic_year', 'department', 'end_date',
+                  'number_of_students', 'is_active', 'description']
+        read_only_fields = ['number_of_students']
+
+
+class ClassRosterSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Student
+        fields = ['id', 'student_code', 'last_name', 'first_name', 'email', 'student_status']
+
+
+class ClassMembershipSerializer(serializers.Serializer):
+    students = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False,
+                                     max_length=1000)
+
+
+# -- Danh mục công khai (chỉ đọc) -------------------------------------------------
+
+class DepartmentCatalogSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Department
+        fields = ['id', 'name', 'code', 'description', 'established_date', 'phone_number', 'email', 'website']
+
+
+class ProgramCatalogSerializer(serializers.ModelSerializer):
+    name_display = serializers.CharField(source='get_name_display', read_only=True)
+
+    class Meta:
+        model = Program
+        fields = ['id', 'name', 'name_display', 'code', 'description', 'duration_years', 'is_active']
+
+
+class MajorCatalogSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Major
+        fields = ['id', 'name', 'code', 'department', 'program', 'required_credits']
+
+
+class CourseCatalogSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Course
+        fields = ['id', 'course_code', 'title', 'description', 'credits', 'course_type', 'department',
+                  'total_hours', 'prerequisites', 'major']
+
+
+class AdmissionRequirementCatalogSerializer(serializers.ModelSerializer):
+    requirement_display = serializers.CharField(source='get_requirement_display', read_only=True)
+
+    class Meta:
+        model = AdmissionRequirement
+        fields = ['id', 'requirement', 'requirement_display', 'description']
+
+
+class AdmissionMethodCatalogSerializer(serializers.ModelSerializer):
+    method_type_display = serializers.CharField(source='get_method_type_display', read_only=True)
+
+    class Meta:
+        model = AdmissionMethod
+        fields = ['id', 'method_type', 'method_type_display', 'description', 'url', 'contact_info', 'is_active']
+
+
+# -- Thư viện ảnh ----------------------------------------------------------------
+
+class AlbumSerializer(serializers.ModelSerializer):
+    # image_count, cover_file được annotate trong view (không truy vấn theo từng album)
+    image_count = serializers.IntegerField(read_only=True)
+    cover = ThumbnailField(source='cover_file', variants=['medium'])
+
+    class Meta:
+        model = Album
+        fields = ['id', 'title', 'description', 'created_at', 'image_count', 'cover']
+
+
+class GalleryImageSerializer(serializers.ModelSerializer):
+    # albums lấy từ prefetch_related: một truy vấn cho cả trang
+    thumbnails = ThumbnailField(source='image_file')
+
+    class Meta:
+        model = Image
+        fields = ['id', 'title', 'description', 'image_file', 'thumbnails', 'uploaded_at', 'albums']
+
+
+class StudentDirectorySerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='student_id', read_only=True)
+
+    class Meta:
+        model = StudentDirectoryEntry
+        fields = ['id', 'student_code', 'last_name', 'first_name', 'email', 'phone', 'gender', 'date_of_birth',
+                  'student_status', 'is_active', 'program_id', 'program_name', 'major_id', 'major_name',
+                  'academic_year_id', 'academic_year_name', 'department_id', 'department_name',
+                  'student_class_id', 'student_class_name']
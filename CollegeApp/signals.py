@@ -0,0 +1,145 @@
+# CollegeApp/signals.py
+"""
+Các receiver giữ cho cache/dữ liệu phụ đồng bộ với model. Được nạp trong apps.py.
+"""
+from functools import partial
+
+from django.db import transaction
+from django.db.models import SET_NULL
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from . import generations
+from . import directory
+from .catalog import CATALOG_MODELS
+from .curriculum import CourseMajorLink, PrerequisiteLink, check_prerequisite_links
+from .models import AcademicYear, Admin, Album, Class, Course, Faculty, Grade, Image, Student, User
+from .search import SEARCH_FIELDS, index_users
+
+USER_MODELS = (User, Student, Faculty, Admin)
+
+
+def invalidate_user_tokens(sender, instance, **kwargs):
+    # Đổi mật khẩu, khóa tài khoản hay sửa thông tin đều phải xác thực lại từ DB
+    token_cache.invalidate_user(instance.pk)
+
+
+def update_search_index(sender, instance, raw=False, update_fields=None, using='default', **kwargs):
+    # Bỏ qua khi chỉ lưu các cột không tìm kiếm (vd. last_login lúc đăng nhập)
+    if raw or (update_fields is not None and not SEARCH_FIELDS.intersection(update_fields)):
+        return
+    index_users([instance], using=using)
+
+
+def invalidate_token(sender, instance, **kwargs):
+    token_cache.invalidate_key(instance.key)
+
+
+for model in USER_MODELS:
+    post_save.connect(invalidate_user_tokens, sender=model,
+                      dispatch_uid=f'token_cache_user_save_{model.__name__}')
+    post_delete.connect(invalidate_user_tokens, sender=model,
+                        dispatch_uid=f'token_cache_user_delete_{model.__name__}')
+    post_save.connect(update_search_index, sender=model,
+                      dispatch_uid=f'search_index_user_save_{model.__name__}')
+post_save.connect(invalidate_token, sender=Token, dispatch_uid='token_cache_token_save')
+post_delete.connect(invalidate_token, sender=Token, dispatch_uid='token_cache_token_delete')
+
+
+def check_prerequisite_cycle(sender, instance, action, reverse, pk_set, using='default', **kwargs):
+    if action != 'pre_add' or not pk_set:
+        return
+    if reverse:
+        # prereq.required_for.add(course...)
+        links = [(course_id, instance.pk) for course_id in pk_set]
+    else:
+        links = [(instance.pk, prereq_id) for prereq_id in pk_set]
+    check_prerequisite_links(links, using=using)
+
+
+# Model có dữ liệu cache theo số thế hệ: danh mục, thư viện ảnh, đích autocomplete của admin
+GENERATION_MODELS = CATALOG_MODELS + (Album, Image, AcademicYear, Class, Faculty)
+
+
+def _bump_on_commit(models, using):
+    # Tăng sau khi commit: đọc xen giữa chỉ có thể cache dữ liệu cũ dưới số thế hệ cũ
+    transaction.on_commit(partial(generations.bump, *models), using=using)
+
+
+def bump_generation(sender, using='default', **kwargs):
+    _bump_on_commit([sender], using)
+
+
+def bump_generation_on_delete(sender, using='default', **kwargs):
+    # SET_NULL và bảng trung gian M2M được sửa bằng UPDATE/DELETE hàng loạt, không phát signal
+    dependants = {rel.related_model for rel in sender._meta.related_objects
+                  if rel.related_model in GENERATION_MODELS and (rel.many_to_many or rel.on_delete is SET_NULL)}
+    dependants.update(field.related_model for field in sender._meta.many_to_many
+                      if field.related_model in GENERATION_MODELS)
+    _bump_on_commit([sender, *dependants], using)
+
+
+def bump_course_generation(sender, action, using='default', **kwargs):
+    # Cả hai chiều (course.major.add / major.major_courses.add) đều đổi dữ liệu của Course
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _bump_on_commit([Course], using)
+
+
+def bump_generation_m2m(sender, action, using='default', **kwargs):
+    # Ảnh thêm vào / bỏ khỏi album: đổi cả số ảnh của album
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _bump_on_commit([Album, Image], using)
+
+
+m2m_changed.connect(check_prerequisite_cycle, sender=PrerequisiteLink, dispatch_uid='course_graph_check_cycle')
+m2m_changed.connect(bump_course_generation, sender=PrerequisiteLink, dispatch_uid='generation_course_prerequisites')
+m2m_changed.connect(bump_course_generation, sender=CourseMajorLink, dispatch_uid='generation_course_majors')
+m2m_changed.connect(bump_generation_m2m, sender=Image.albums.through, dispatch_uid='generation_image_albums')
+for model in GENERATION_MODELS:
+    post_save.connect(bump_generation, sender=model, dispatch_uid=f'generation_save_{model.__name__}')
+    post_delete.connect(bump_generation_on_delete, sender=model, dispatch_uid=f'generation_delete_{model.__name__}')
+
+
+def release_class_seat(sender, instance, using='default', **kwargs):
+    # Xóa sinh viên (kể cả xóa dây chuyền từ User) trả lại một chỗ cho lớp
+    if instance.student_class_id is not None:
+        Class.adjust_counts({instance.student_class_id: -1}, using=using)
+
+
+post_delete.connect(release_class_seat, sender=Student, dispatch_uid='class_count_student_delete')
+
+
+def reverse_deleted_grade(sender, instance, using='default', **kwargs):
+    # Mọi kiểu xóa điểm (instance, queryset, admin, CASCADE từ lớp học phần / sinh viên)
+    # đều qua Collector nên đều phát post_delete; instance mang giá trị vừa đọc từ DB
+    Student.apply_grade_delta(instance.student_id, -instance.grade_point * instance.credits,
+                              -instance.credits, using=using)
+
+
+post_delete.connect(reverse_deleted_grade, sender=Grade, dispatch_uid='grade_totals_delete')
+
+
+def update_directory(sender, instance, created=False, raw=False, update_fields=None, using='default', **kwargs):
+    if raw or (update_fields is not None and not directory.TRACKED_FIELDS.intersection(update_fields)):
+        return
+    if sender is User and created:
+        # Tài khoản User mới chưa thể là sinh viên
+        return
+    directory.refresh_students([instance.pk], using=using)
+
+
+def rename_directory_related(sender, instance, created=False, raw=False, using='default', **kwargs):
+    if not created and not raw:
+        directory.rename_related(instance, using=using)
+
+
+def clear_directory_class(sender, instance, using='default', **kwargs):
+    directory.clear_related(Class, instance.pk, using=using)
+
+
+for model in (User, Student):
+    post_save.connect(update_directory, sender=model, dispatch_uid=f'directory_save_{model.__name__}')
+for model in directory.RELATED:
+    post_save.connect(rename_directory_related, sender=model, dispatch_uid=f'directory_rename_{model.__name__}')
+post_delete.connect(clear_directory_class, sender=Class, dispatch_uid='directory_class_delete')
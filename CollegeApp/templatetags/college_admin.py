@@ -0,0 +1,16 @@
+# CollegeApp/templatetags/college_admin.py
+from django import template
+from django.contrib.admin.templatetags.admin_list import pagination, search_form
+
+register = template.Library()
+
+
+@register.inclusion_tag('admin/college/pagination.html')
+def college_pagination(cl):
+    """Như {% pagination %} của admin nhưng hiển thị số dòng ước lượng của EstimatedCountPaginator."""
+    return pagination(cl)
+
+
+@register.inclusion_tag('admin/college/search_form.html')
+def college_search_form(cl):
+    return search_form(cl)
@@ -1,3 +1,377 @@
-from django.test import TestCase
+import datetime
+import io
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from . import benchmark, dedup, generations, ingest, profiling, search, seeding, timetable
+from .admin import StudentAdmin
+from .checks import check_shared_cache
+from .grading import convert_score
+from .management.commands.bench_timetable import synthetic_semester
+from .models import (AcademicYear, AdvisoryRegistration, Album, Course, CourseOffering, Faculty, Grade, Major,
+                     OfferingTimeSlot, Room, Semester, Student, User)
+from .schedule import ScheduleParseError, TimeSlot, parse_schedule, room_key
+
+
+class AdvisoryRegistrationListQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        majors = [Major.objects.create(name=f"Ngành {i}", code=f"N{i}") for i in range(4)]
+        AdvisoryRegistration.objects.bulk_create([
+            AdvisoryRegistration(full_name=f"Người {i}", phone_number="0900000000", email=f"a{i}@example.com",
+                                 major_of_interest=majors[i % len(majors)])
+            for i in range(40)
+        ])
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        url = reverse('view-registrations-list')
+        for page_size in (5, 40):
+            # một truy vấn cho trang đăng ký, một truy vấn cho tất cả Major của trang
+            with self.assertNumQueries(2):
+                response = self.client.get(url, {'page_size': page_size})
+            self.assertEqual(len(response.data['results']), page_size)
+            self.assertIn('name', response.data['results'][0]['major_of_interest'])
+
+    def test_detail_still_renders_major(self):
+        registration = AdvisoryRegistration.objects.first()
+        response = self.client.get(reverse('detail-registrations-detail', args=[registration.pk]))
+        self.assertEqual(response.data['major_of_interest']['id'], registration.major_of_interest_id)
+
+
+class AdvisoryRegistrationCreateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.major = Major.objects.create(name="Ngành A", code="NA")
+
+    def setUp(self):
+        dedup._detector = None  # Bloom filter dựng lại từ DB của test
+
+    def post(self, **fields):
+        data = {'full_name': "Người gửi", 'phone_number': "0912345678", 'email': "a@example.com",
+                'address': "1 đường số 1", 'major_of_interest_id': self.major.pk, **fields}
+        return self.client.post(reverse('create-registrations-list'), data, content_type='application/json')
+
+    def test_duplicate_does_not_echo_original(self):
+        self.post()
+        AdvisoryRegistration.objects.update(notes="Ghi chú nội bộ")
+        response = self.post(full_name="Người khác", phone_number="+84 912 345 678", email="b@example.com")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(response.data), {'message', 'receipt'})
+        self.assertNotIn("Người gửi", response.content.decode())
+        original = AdvisoryRegistration.objects.get()
+        self.assertEqual(original.submission_count, 2)
+        self.assertNotEqual(str(original.submission_id), response.data['receipt'])
+
+
+class SpoolDedupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.major = Major.objects.create(name="Ngành A", code="NA")
+
+    def setUp(self):
+        dedup._detector = None
+
+    def record(self, phone="0912345678"):
+        return {'full_name': "Người gửi", 'phone_number': phone, 'email': f"{uuid.uuid4().hex}@example.com",
+                'submission_id': str(uuid.uuid4()), 'submitted_at': timezone.now().isoformat(),
+                'major_of_interest_id': self.major.pk}
+
+    def test_replay_does_not_merge_into_itself(self):
+        records = [self.record()]
+        ingest.insert_registrations(records)
+        ingest.insert_registrations(records)  # ghi bù lại spool sau sự cố
+        self.assertEqual(AdvisoryRegistration.objects.get().submission_count, 1)
+
+    @override_settings(REGISTRATION_DEDUP={'POLICY': 'flag'})
+    def test_flag_policy_applies_within_batch(self):
+        first, second = self.record(), self.record(phone="+84 912 345 678")
+        ingest.insert_registrations([first, second])
+        original = AdvisoryRegistration.objects.get(submission_id=first['submission_id'])
+        duplicate = AdvisoryRegistration.objects.get(submission_id=second['submission_id'])
+        self.assertIsNone(original.duplicate_of_id)
+        self.assertEqual(duplicate.duplicate_of_id, original.pk)
+        self.assertEqual(original.submission_count, 1)
+
+
+class ParseScheduleTests(TestCase):
+    def test_formats(self):
+        cases = {
+            "Thứ 2, Tiết 1-3": [(2, 1, 3)],
+            "Thứ 2, 4 - Tiết 1-3": [(2, 1, 3), (4, 1, 3)],
+            "Thứ 2, Thứ 4 - Tiết 1-3": [(2, 1, 3), (4, 1, 3)],
+            "Thứ Hai, Tiết 1,2,3": [(2, 1, 3)],
+            "T3 (7-9); T5 (1-3)": [(3, 7, 9), (5, 1, 3)],
+            "Chủ nhật, Tiết 4 đến 6": [(8, 4, 6)],
+            "Thứ 2 (Tiết 1-3), Thứ 4 (Tiết 7-9)": [(2, 1, 3), (4, 7, 9)],
+            "Thứ 2, Tiết 1-3, Thứ 5, Tiết 7-9": [(2, 1, 3), (5, 7, 9)],
+            "T2 (1-3), T4 (7-9)": [(2, 1, 3), (4, 7, 9)],
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_schedule(text), [TimeSlot(*slot) for slot in expected])
+
+    def test_ambiguous_segments_are_rejected(self):
+        for text in ("Thứ 2 tiết 1-3 tiết 7-9", "Thứ 2 tiết 1-3 thứ 4", "Tiết 1-3"):
+            with self.subTest(text=text), self.assertRaises(ScheduleParseError):
+                parse_schedule(text)
+
+
+class CourseOfferingScheduleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        year = AcademicYear.objects.create(name="Khóa 2024", start_year=2024, end_year=2027)
+        cls.semester = Semester.objects.create(name="HK1", academic_year=year, semester_type='HK1',
+                                               start_date=datetime.date(2024, 9, 1),
+                                               end_date=datetime.date(2025, 1, 15))
+        cls.course = Course.objects.create(course_code="C1", title="Môn 1", credits=3)
+
+    def test_legacy_schedule_does_not_block_other_edits(self):
+        offering = CourseOffering.objects.create(course=self.course, semester=self.semester, class_code="L1",
+                                                 max_students=40, schedule="Thứ 2, Tiết 1-3")
+        CourseOffering.objects.filter(pk=offering.pk).update(schedule="Sáng thứ hai hàng tuần")
+        offering = CourseOffering.objects.get(pk=offering.pk)
+        offering.max_students = 50
+        with self.assertLogs('CollegeApp.models', 'WARNING'):
+            offering.save()
+        self.assertFalse(OfferingTimeSlot.objects.filter(offering=offering).exists())
+        offering.schedule = "Thứ 3, Tiết"
+        with self.assertRaises(ValidationError):
+            offering.save()
+
+
+class GradeTotalsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seeding.seed(seeding.get_scale('tiny', students=2, registrations=0))
+        year = AcademicYear.objects.create(name="Khóa 2024", start_year=2024, end_year=2027)
+        semester = Semester.objects.create(name="HK1", academic_year=year, semester_type='HK1',
+                                           start_date=datetime.date(2024, 9, 1), end_date=datetime.date(2025, 1, 15))
+        cls.offerings = [
+            CourseOffering.objects.create(course=Course.objects.create(course_code=f"G{credits}", title="Môn",
+                                                                       credits=credits),
+                                          semester=semester, class_code=f"G{credits}-01", max_students=40)
+            for credits in (3, 4)
+        ]
+        cls.student = Student.objects.order_by('pk').first()
+
+    def grade(self, offering, score):
+        return Grade.objects.create(student=self.student, offering=offering, score=score)
+
+    def assertTotals(self, *grades):
+        student = Student.objects.get(pk=self.student.pk)
+        points = sum((convert_score(score)[1] * credits for score, credits in grades), 0)
+        credits = sum((credits for _, credits in grades), 0)
+        self.assertEqual(student.quality_points, points)
+        self.assertEqual(student.credits_attempted, credits)
+        self.assertEqual(student.GPA, round(points / credits, 2) if credits else None)
+
+    def test_create_and_edit(self):
+        grade = self.grade(self.offerings[0], 8)
+        self.grade(self.offerings[1], 6)
+        self.assertTotals((8, 3), (6, 4))
+        grade.score = 9
+        grade.save()
+        self.assertTotals((9, 3), (6, 4))
+
+    def test_changing_offering_recomputes_credits(self):
+        grade = self.grade(self.offerings[0], 8)
+        grade.offering = self.offerings[1]
+        grade.save()
+        self.assertEqual(grade.credits, 4)
+        self.assertTotals((8, 4))
+
+    def test_instance_and_queryset_delete(self):
+        first = self.grade(self.offerings[0], 8)
+        self.grade(self.offerings[1], 6)
+        first.delete()
+        self.assertTotals((6, 4))
+        Grade.objects.filter(student=self.student).delete()
+        self.assertTotals()
+
+    def test_cascade_from_offering(self):
+        self.grade(self.offerings[0], 8)
+        self.grade(self.offerings[1], 6)
+        self.offerings[0].delete()
+        self.assertTotals((6, 4))
+
+
+class SharedCacheTests(TestCase):
+    @override_settings(DEBUG=False, GENERATIONS={'LOCAL_TTL': 120})
+    def test_local_cache_is_reported_and_generations_expire(self):
+        self.assertEqual([message.id for message in check_shared_cache(None)], ['CollegeApp.W001'])
+        with mock.patch.object(generations.cache, 'set_many', wraps=generations.cache.set_many) as set_many:
+            generations.bump(Major)
+        self.assertEqual(set_many.call_args.kwargs['timeout'], 120)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    def test_dummy_cache_still_serves_catalog(self):
+        self.assertIsInstance(generations.get_generation(Major), int)
+        self.assertEqual(self.client.get(reverse('catalog-majors-list')).status_code, 200)
+
+
+@override_settings(ALLOWED_HOSTS=['testserver', 'college.example'])
+class GalleryCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Album.objects.bulk_create([Album(title=f"Album {i}") for i in range(2)])
+
+    def test_cached_links_follow_request_host_and_scheme(self):
+        url = reverse('gallery-albums-list')
+        internal = self.client.get(url, {'page_size': 1})
+        public = self.client.get(url, {'page_size': 1}, HTTP_HOST='college.example', secure=True)
+        self.assertTrue(internal.data['next'].startswith('http://testserver/'))
+        self.assertTrue(public.data['next'].startswith('https://college.example/'))
+        self.assertNotEqual(internal['ETag'], public['ETag'])
+
+
+class UserSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.an = User.objects.create(username="an", email="nguyen.van.an@gmail.com",
+                                     first_name="An", last_name="Nguyễn Văn")
+        cls.binh = User.objects.create(username="binh", email="nguyen.van.an2@truong.edu.vn",
+                                       first_name="Bình", last_name="Trần")
+
+    def found(self, query):
+        return set(search.search_users(query).values_list('username', flat=True))
+
+    def test_full_email_and_domain(self):
+        self.assertEqual(self.found("nguyen.van.an@gmail.com"), {"an"})
+        self.assertEqual(self.found("NGUYEN.VAN.AN@gmail"), {"an"})
+        self.assertEqual(self.found("gmail"), {"an"})
+        self.assertEqual(self.found("truong.edu.vn"), {"binh"})
+        self.assertEqual(self.found("nguyen.van.an2@truong.edu.vn trần"), {"binh"})
+        self.assertEqual(self.found("nguyen.van.an2@truong.edu.vn Lê"), set())
+
+    def test_admin_search_by_email(self):
+        self.client.force_login(User.objects.create_superuser("root", "root@example.com", "x"))
+        response = self.client.get(reverse('admin:CollegeApp_user_changelist'), {'q': "nguyen.van.an@gmail.com"})
+        self.assertEqual([user.username for user in response.context['cl'].result_list], ["an"])
+
+
+class TimetableTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Học kỳ giả lập mà trước đây bộ xếp lịch chia một lớp học phần vào hai phòng
+        offerings, rooms = synthetic_semester(60, 1)
+        seeding.seed(seeding.get_scale('tiny', faculty=max(o.lecturer_id for o in offerings) + 1,
+                                       students=0, registrations=0))
+        lecturers = list(Faculty.objects.order_by('pk').values_list('pk', flat=True))
+        year = AcademicYear.objects.create(name="Khóa 2024", start_year=2024, end_year=2027)
+        cls.semester = Semester.objects.create(name="HK1", academic_year=year, semester_type='HK1',
+                                               start_date=datetime.date(2024, 9, 1),
+                                               end_date=datetime.date(2025, 1, 15))
+        Room.objects.bulk_create([Room(code=room.code, capacity=room.capacity) for room in rooms])
+        courses = {sessions: Course.objects.create(course_code=f"TT{sessions}", title="Môn", credits=3 * sessions)
+                   for sessions in {o.sessions for o in offerings}}
+        for o in offerings:
+            CourseOffering.objects.create(course=courses[o.sessions], semester=cls.semester, class_code=f"TT-{o.id:03}",
+                                          max_students=o.size, lecturer_id=lecturers[o.lecturer_id])
+
+    def stored_slots(self):
+        return sorted(OfferingTimeSlot.objects.values_list('offering_id', 'day', 'start_period', 'room_key'))
+
+    def test_saved_timetable_keeps_every_session_room(self):
+        solved = timetable.solve_semester(self.semester.pk)
+        self.assertEqual(timetable.check_timetable(solved.assignments, solved.offerings), [])
+        timetable.apply_timetable(solved)
+        expected = sorted(
+            (offering_id, session.day, timetable.block_periods(session.block)[0],
+             room_key(solved.rooms[session.room_id].code))
+            for offering_id, sessions in solved.assignments.items() for session in sessions)
+        self.assertEqual(self.stored_slots(), expected)
+        for offering in CourseOffering.objects.filter(pk__in=solved.assignments):
+            offering.save()
+        self.assertEqual(self.stored_slots(), expected)
+        call_command('rebuild_time_slots', stdout=io.StringIO())
+        self.assertEqual(self.stored_slots(), expected)
+
+
+@override_settings(ADMIN_CHANGELIST={'FILTERED_COUNT_LIMIT': 10})
+class AdminChangelistPagingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seeding.seed(seeding.get_scale('tiny', students=23, registrations=0))
+        cls.admin = User.objects.get(email=seeding.ADMIN_EMAIL)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        patcher = mock.patch.object(StudentAdmin, 'list_per_page', 5)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, page):
+        return self.client.get(reverse('admin:CollegeApp_student_changelist'),
+                               {'student_class__isnull': 'False', 'p': page})
+
+    def test_pages_past_count_limit_are_reachable(self):
+        response = self.get(3)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), 5)
+        self.assertContains(response, '16+')
+        last = self.get(5)
+        self.assertEqual(len(last.context['cl'].result_list), 3)
+        self.assertEqual(last.context['cl'].paginator.display_count, '23')
+        self.assertRedirects(self.get(6), reverse('admin:CollegeApp_student_changelist') + '?e=1',
+                             fetch_redirect_response=False)
+
+
+class ProfilingLogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.major = Major.objects.create(name="Ngành A", code="NA")
+
+    def setUp(self):
+        dedup._detector = None
+
+    def slowest(self, **config):
+        config = {'SAMPLE_RATE': 1, 'SLOW_REQUEST_MS': 0, 'EXPLAIN': False, 'LOGGED_QUERIES': 100, **config}
+        data = {'full_name': "Người gửi", 'phone_number': "0912345678", 'email': "bi-mat@example.com",
+                'address': "1 đường số 1", 'major_of_interest_id': self.major.pk}
+        with override_settings(REQUEST_PROFILING=config), self.assertLogs(profiling.logger) as logs:
+            self.client.post(reverse('create-registrations-list'), data, content_type='application/json')
+        return logs.records[-1].profile['slowest']
+
+    def test_params_are_not_logged_by_default(self):
+        slowest = self.slowest()
+        self.assertTrue(slowest)
+        self.assertNotIn('params', slowest[0])
+        self.assertNotIn("bi-mat", str(slowest))
+
+    def test_params_are_logged_when_enabled(self):
+        self.assertIn("bi-mat", str(self.slowest(LOG_PARAMS=True)))
+
+    @override_settings(REQUEST_PROFILING={'SAMPLE_RATE': 1, 'SLOW_REQUEST_MS': 0, 'EXPLAIN': False})
+    def test_streamed_export_is_measured_until_body_is_read(self):
+        AdvisoryRegistration.objects.create(full_name="Người gửi", phone_number="0912345678",
+                                            email="a@example.com", major_of_interest=self.major)
+        token = Token.objects.create(user=User.objects.create_superuser("root", "root@example.com", "x"))
+        with mock.patch.object(profiling.logger, 'warning') as warning:
+            response = self.client.get(reverse('export-registrations', args=['csv']),
+                                       HTTP_AUTHORIZATION=f"Token {token.key}")
+            warning.assert_not_called()  # SQL của body chưa chạy
+            self.assertIn('stream;', response['Server-Timing'])
+            body = b''.join(response.streaming_content)
+        self.assertIn("Người gửi".encode(), body)
+        self.assertGreater(warning.call_args.kwargs['extra']['profile']['queries'], 0)
+
+
+class BenchmarkScenarioTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seeding.seed(seeding.get_scale('tiny'))
+
+    def test_every_scenario_succeeds(self):
+        fixtures = benchmark.Fixtures()
+        transport = benchmark.InProcessTransport(host='testserver')
+        for name in benchmark.SCENARIOS:
+            result = benchmark.run_scenario(transport, fixtures, name, 2)
+            self.assertEqual(result['errors'], 0, (name, result['statuses']))
+            self.assertGreater(result['queries']['mean'], 0)
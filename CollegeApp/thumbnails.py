@@ -0,0 +1,254 @@
+# CollegeApp/thumbnails.py
+"""
+Ảnh thu nhỏ (thumbnail) cố định kích thước cho Image.image_file và User.user_photo.
+
+Hai trường này lưu đường dẫn tương đối trong SOURCE_ROOT (mặc định MEDIA_ROOT),
+đường dẫn bắt đầu bằng MEDIA_URL, hoặc URL bên ngoài. Chỉ ảnh nằm trong
+SOURCE_ROOT mới được thu nhỏ; URL bên ngoài được trả lại nguyên vẹn.
+
+Mỗi biến thể được lưu trên đĩa theo khóa băm nội dung ảnh gốc:
+    CACHE_DIR/<2 ký tự đầu>/<blake2b nội dung>-<biến thể>.<đuôi>
+nên ảnh trùng nội dung dùng chung thumbnail, và thay ảnh gốc thì tự có khóa mới.
+Băm nội dung được nhớ theo (đường dẫn, kích thước, mtime) để không đọc lại file.
+
+Việc thu nhỏ (Pillow) chạy trong pool tiến trình như hashing.py; các yêu cầu trùng
+cho cùng một thumbnail đang tạo dùng chung một Future. Nếu thumbnail chưa có,
+thumbnail_url() trả URL của view tạo ngay khi được gọi tới (lazy) và gửi việc tạo
+vào pool để lần sau dùng thẳng file tĩnh. Lệnh generate_thumbnails tạo trước hàng loạt.
+
+Cấu hình trong settings:
+    THUMBNAILS = {
+        'SOURCE_ROOT': MEDIA_ROOT,
+        'CACHE_DIR': MEDIA_ROOT / 'thumbs',
+        'CACHE_URL': MEDIA_URL + 'thumbs/',
+        'WORKERS': None,          # None = số lõi CPU, 0 = tạo ngay trong tiến trình hiện tại
+        'VARIANTS': {'small': (50, 50, 'crop'), ...},   # (rộng, cao, 'crop' | 'fit')
+        'FORMAT': 'JPEG',
+        'QUALITY': 82,
+    }
+Không cài Pillow thì mọi URL trả về ảnh gốc.
+"""
+import atexit
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from django.conf import settings
+from django.urls import reverse
+
+try:
+    from PIL import Image as PILImage
+except ImportError:  # Pillow là phụ thuộc tùy chọn
+    PILImage = None
+
+DEFAULT_VARIANTS = {
+    'small': (50, 50, 'crop'),
+    'medium': (320, 320, 'fit'),
+    'large': (1024, 1024, 'fit'),
+}
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff'}
+
+
+def get_config():
+    media_root = Path(getattr(settings, 'MEDIA_ROOT', '') or settings.BASE_DIR / 'media')
+    media_url = getattr(settings, 'MEDIA_URL', '') or '/media/'
+    config = {
+        'SOURCE_ROOT': media_root,
+        'CACHE_DIR': media_root / 'thumbs',
+        'CACHE_URL': media_url.rstrip('/') + '/thumbs/',
+        'WORKERS': None,
+        'VARIANTS': DEFAULT_VARIANTS,
+        'FORMAT': 'JPEG',
+        'QUALITY': 82,
+    }
+    config.update(getattr(settings, 'THUMBNAILS', {}))
+    config['SOURCE_ROOT'] = Path(config['SOURCE_ROOT']).resolve()
+    config['CACHE_DIR'] = Path(config['CACHE_DIR'])
+    return config
+
+
+def _render(source, target, width, height, mode, image_format, quality):
+    """Chạy trong tiến trình con: đọc ảnh gốc, thu nhỏ và ghi nguyên tử vào target."""
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        if mode == 'crop':
+            image = ImageOps.fit(image, (width, height), Image.LANCZOS)
+        else:
+            image.thumbnail((width, height), Image.LANCZOS)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temporary = f'{target}.{os.getpid()}.tmp'
+        image.save(temporary, image_format, quality=quality, optimize=True)
+    os.replace(temporary, target)
+    return target
+
+
+class ThumbnailService:
+    def __init__(self, config):
+        self.config = config
+        self.workers = (os.cpu_count() or 1) if config['WORKERS'] is None else max(0, int(config['WORKERS']))
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = {}  # đường dẫn thumbnail -> Future
+        self._digests = {}  # (đường dẫn gốc, kích thước, mtime) -> băm nội dung
+        self._failed = set()  # thumbnail không tạo được (ảnh gốc hỏng), không thử lại
+
+    # -- Tìm ảnh gốc và khóa ----------------------------------------------------
+
+    def resolve_source(self, value):
+        """Đường dẫn tuyệt đối của ảnh gốc trong SOURCE_ROOT, hoặc None."""
+        if not value or '://' in value or value.startswith('//'):
+            return None
+        media_url = getattr(settings, 'MEDIA_URL', '') or '/media/'
+        relative = value[len(media_url):] if media_url != '/' and value.startswith(media_url) else value
+        root = self.config['SOURCE_ROOT']
+        path = (root / relative.lstrip('/')).resolve()
+        if root not in path.parents or path.suffix.lower() not in IMAGE_SUFFIXES or not path.is_file():
+            return None
+        return path
+
+    def digest(self, path):
+        stat = path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(key)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(path, 'rb') as handle:
+                for chunk in iter(lambda: handle.read(1 << 20), b''):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            if len(self._digests) > 10000:
+                self._digests.clear()
+            self._digests[key] = digest
+        return digest
+
+    def relative_name(self, digest, variant):
+        return f"{digest[:2]}/{digest}-{variant}.{EXTENSIONS.get(self.config['FORMAT'], 'img')}"
+
+    # -- Tạo thumbnail ----------------------------------------------------------
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, source, variant):
+        """Future cho đường dẫn thumbnail (đã có sẵn thì hoàn thành ngay)."""
+        width, height, mode = self.config['VARIANTS'][variant]
+        target = self.config['CACHE_DIR'] / self.relative_name(self.digest(source), variant)
+        if target.exists():
+            done = Future()
+            done.set_result(str(target))
+            return done
+        key = str(target)
+        args = (str(source), key, width, height, mode, self.config['FORMAT'], self.config['QUALITY'])
+        if self.workers == 0:
+            future = Future()
+            try:
+                future.set_result(_render(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        executor = self._get_executor()
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                try:
+                    future = executor.submit(_render, *args)
+                except (BrokenProcessPool, RuntimeError) as exc:
+                    future = Future()
+                    future.set_exception(exc)
+                else:
+                    self._pending[key] = future
+        if future.done() and isinstance(future.exception(), (BrokenProcessPool, RuntimeError)):
+            self._reset_executor()
+            return future
+        future.add_done_callback(lambda f: self._on_done(key, f))
+        return future
+
+    def _on_done(self, key, future):
+        exc = future.exception()
+        if isinstance(exc, BrokenProcessPool):
+            self._reset_executor()
+        elif exc is not None:
+            self._failed.add(key)
+        self._forget(key)
+
+    def _forget(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    # -- URL --------------------------------------------------------------------
+
+    def url(self, value, variant):
+        """
+        URL của biến thể cho giá trị trường ảnh: file tĩnh nếu đã tạo, URL của view
+        tạo-khi-cần nếu chưa (đồng thời gửi việc tạo vào pool), ảnh gốc nếu không thể
+        thu nhỏ (URL ngoài, không có Pillow, biến thể lạ).
+        """
+        if PILImage is None or variant not in self.config['VARIANTS']:
+            return value or ''
+        source = self.resolve_source(value)
+        if source is None:
+            return value or ''
+        name = self.relative_name(self.digest(source), variant)
+        if (self.config['CACHE_DIR'] / name).exists():
+            return self.config['CACHE_URL'] + name
+        if str(self.config['CACHE_DIR'] / name) in self._failed:
+            return value
+        if self.workers:
+            self.submit(source, variant)
+        relative = source.relative_to(self.config['SOURCE_ROOT']).as_posix()
+        return reverse('thumbnail', kwargs={'variant': variant, 'source': relative})
+
+    def generate(self, value, variant, timeout=None):
+        """Tạo (nếu cần) và trả về URL tĩnh của biến thể; None nếu không thu nhỏ được ảnh."""
+        source = self.resolve_source(value) if PILImage is not None else None
+        if source is None or variant not in self.config['VARIANTS']:
+            return None
+        target = Path(self.submit(source, variant).result(timeout=timeout))
+        return self.config['CACHE_URL'] + target.relative_to(self.config['CACHE_DIR']).as_posix()
+
+    def shutdown(self):
+        self._reset_executor()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_thumbnail_service():
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ThumbnailService(get_config())
+                atexit.register(_service.shutdown)
+    return _service
+
+
+def thumbnail_url(value, variant):
+    return get_thumbnail_service().url(value, variant)
+
+
+def thumbnail_urls(value, variants=None):
+    service = get_thumbnail_service()
+    return {variant: service.url(value, variant) for variant in (variants or service.config['VARIANTS'])}
@@ -0,0 +1,216 @@
+# CollegeApp/timetable.py
+"""
+Xếp thời khóa biểu tự động cho một học kỳ.
+
+Tuần được chia thành các ca: mỗi thứ (2-7) có BLOCKS ca 3 tiết (1-3, 4-6, 7-9,
+10-12). Mỗi lớp học phần cần một số buổi mỗi tuần (theo số tín chỉ), mỗi buổi
+là một ca trong một phòng đủ sức chứa (capacity >= max_students). Ràng buộc:
+một phòng / một giảng viên không có hai buổi trong cùng ca, các buổi của cùng
+lớp học phần rơi vào các thứ khác nhau và cùng một phòng (CourseOffering.room
+chỉ có một phòng, OfferingTimeSlot lấy phòng từ đó).
+
+Thuật toán tham lam theo độ khó: lớp học phần khó xếp trước (giảng viên dạy
+nhiều lớp, sĩ số lớn). Với mỗi phòng đủ chỗ, các buổi lấy những ca ít bị chiếm
+nhất mà cả giảng viên và phòng đều rảnh; chọn phòng cho tổng độ chiếm thấp nhất,
+hòa thì phòng nhỏ nhất (dừng sớm khi một phòng đạt được các ca tốt nhất có thể).
+Lớp học phần không xếp được được báo lại thay vì làm hỏng lịch của lớp khác.
+
+Chế độ tăng dần (solve_semester(..., only=[...])) giữ nguyên lịch của các lớp
+còn lại, chỉ xếp lại các lớp được chỉ định.
+"""
+import bisect
+import math
+import time
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+
+from .models import CourseOffering, OfferingTimeSlot, Room
+from .schedule import TimeSlot, format_schedule, room_key
+
+DAYS = (2, 3, 4, 5, 6, 7)
+BLOCK_LENGTH = 3
+BLOCKS = 4
+SLOTS = [(day, block) for day in DAYS for block in range(BLOCKS)]
+SLOT_INDEX = {slot: index for index, slot in enumerate(SLOTS)}
+
+RoomInfo = namedtuple('RoomInfo', ['id', 'code', 'capacity'])
+OfferingInfo = namedtuple('OfferingInfo', ['id', 'size', 'lecturer_id', 'sessions'])
+Session = namedtuple('Session', ['day', 'block', 'room_id'])
+
+
+def block_periods(block):
+    start = block * BLOCK_LENGTH + 1
+    return start, start + BLOCK_LENGTH - 1
+
+
+def sessions_for_credits(credits):
+    """Số buổi mỗi tuần: 3 tiết mỗi buổi, khoảng 1 buổi cho mỗi 3 tín chỉ."""
+    return max(1, math.ceil(float(credits or 0) / BLOCK_LENGTH))
+
+
+class TimetableSolver:
+    def __init__(self, rooms):
+        self.rooms = {room.id: room for room in rooms}
+        # Phòng sắp theo (capacity, id) để tìm nhị phân phòng nhỏ nhất đủ chỗ
+        self.room_entries = sorted((room.capacity, room.id) for room in rooms)
+        # Mỗi phòng: bitmask các ca đã có buổi (bit SLOT_INDEX[ca])
+        self.room_busy = {room.id: 0 for room in rooms}
+        self.lecturer_busy = defaultdict(set)
+        self.slot_load = {slot: 0 for slot in SLOTS}
+        self.assignments = {}
+        self.unassigned = []
+
+    def occupy(self, slot, room_id=None, lecturer_id=None):
+        """Đánh dấu ca đã bị chiếm (lịch có sẵn khi xếp tăng dần)."""
+        if slot not in self.slot_load:
+            return
+        if room_id in self.room_busy:
+            self.room_busy[room_id] |= 1 << SLOT_INDEX[slot]
+        if lecturer_id is not None:
+            self.lecturer_busy[lecturer_id].add(slot)
+        self.slot_load[slot] += 1
+
+    def _place(self, offering):
+        """Chọn một phòng và các ca cho mọi buổi của lớp học phần; None nếu không xếp được."""
+        busy = self.lecturer_busy[offering.lecturer_id] if offering.lecturer_id is not None else set()
+        open_slots = sorted((self.slot_load[slot], slot) for slot in SLOTS if slot not in busy)
+        # Tổng độ chiếm nhỏ nhất khi không vướng phòng: phòng nào đạt được thì dừng
+        bound = self._pick(open_slots, offering.sessions, 0)
+        if bound is None:
+            return None
+        best, tried = None, set()
+        for _, room_id in self.room_entries[bisect.bisect_left(self.room_entries, (offering.size, -1)):]:
+            room_busy = self.room_busy[room_id]
+            if room_busy in tried:
+                continue  # phòng lớn hơn có cùng ca trống không cho kết quả tốt hơn
+            tried.add(room_busy)
+            chosen = self._pick(open_slots, offering.sessions, room_busy)
+            if chosen is not None and (best is None or chosen[0] < best[0]):
+                best = (chosen[0], room_id, chosen[1])
+                if chosen[0] == bound[0]:
+                    break
+        if best is None:
+            return None
+        _, room_id, slots = best
+        for slot in slots:
+            self.room_busy[room_id] |= 1 << SLOT_INDEX[slot]
+            busy.add(slot)
+            self.slot_load[slot] += 1
+        return [Session(slot[0], slot[1], room_id) for slot in slots]
+
+    @staticmethod
+    def _pick(open_slots, sessions, room_busy):
+        """Các ca ít bị chiếm nhất mà phòng còn trống, mỗi thứ một ca: (tổng độ chiếm, [ca]) hoặc None."""
+        load, slots, days = 0, [], set()
+        for slot_load, slot in open_slots:
+            if slot[0] in days or room_busy >> SLOT_INDEX[slot] & 1:
+                continue
+            load += slot_load
+            slots.append(slot)
+            days.add(slot[0])
+            if len(slots) == sessions:
+                return load, slots
+        return None
+
+    def solve(self, offerings):
+        """Xếp lịch cho các lớp học phần; trả về ({id: [Session]}, [id không xếp được])."""
+        lecturer_load = defaultdict(int)
+        for offering in offerings:
+            if offering.lecturer_id is not None:
+                lecturer_load[offering.lecturer_id] += offering.sessions
+        ordered = sorted(offerings, key=lambda o: (-o.size, -lecturer_load.get(o.lecturer_id, 0), o.id))
+        for offering in ordered:
+            sessions = self._place(offering) if offering.sessions <= len(DAYS) else None
+            if sessions is None:
+                self.unassigned.append(offering.id)
+                continue
+            self.assignments[offering.id] = sessions
+        return self.assignments, self.unassigned
+
+
+def check_timetable(assignments, offerings):
+    """
+    Danh sách vi phạm (phòng/giảng viên trùng ca, lớp học phần chia nhiều phòng) của một
+    lời giải; rỗng nếu hợp lệ.
+    """
+    lecturers = {offering.id: offering.lecturer_id for offering in offerings}
+    seen_rooms, seen_lecturers, problems = {}, {}, []
+    for offering_id, sessions in assignments.items():
+        if len({session.room_id for session in sessions}) > 1:
+            problems.append(('split', None, offering_id, offering_id))
+        for session in sessions:
+            slot = (session.day, session.block)
+            other = seen_rooms.setdefault((slot, session.room_id), offering_id)
+            if other != offering_id:
+                problems.append(('room', slot, other, offering_id))
+            lecturer_id = lecturers.get(offering_id)
+            if lecturer_id is not None:
+                other = seen_lecturers.setdefault((slot, lecturer_id), offering_id)
+                if other != offering_id:
+                    problems.append(('lecturer', slot, other, offering_id))
+    return problems
+
+
+# -- Đọc / ghi cơ sở dữ liệu ---------------------------------------------------
+
+Timetable = namedtuple('Timetable', ['assignments', 'unassigned', 'offerings', 'rooms', 'elapsed'])
+
+
+def solve_semester(semester_id, only=None):
+    """
+    Xếp lịch cho các lớp học phần đang mở của học kỳ. Với `only` (danh sách id), chỉ
+    xếp lại các lớp đó; lịch đã có của các lớp khác được giữ nguyên làm ràng buộc.
+    """
+    began = time.perf_counter()
+    rooms = [RoomInfo(*row) for row in Room.objects.filter(is_active=True).values_list('id', 'code', 'capacity')]
+    rows = (CourseOffering.objects.filter(semester_id=semester_id, is_active=True)
+            .values_list('id', 'max_students', 'lecturer_id', 'course__credits'))
+    offerings = [OfferingInfo(pk, size, lecturer_id, sessions_for_credits(credits))
+                 for pk, size, lecturer_id, credits in rows]
+    solver = TimetableSolver(rooms)
+
+    if only is not None:
+        only = set(only)
+        offerings = [offering for offering in offerings if offering.id in only]
+        room_ids = {room_key(room.code): room.id for room in rooms}
+        fixed = (OfferingTimeSlot.objects.filter(semester_id=semester_id)
+                 .exclude(offering_id__in=only)
+                 .values_list('day', 'start_period', 'end_period', 'room_key', 'lecturer_id'))
+        for day, start, end, key, lecturer_id in fixed:
+            for block in range(BLOCKS):
+                first, last = block_periods(block)
+                if start <= last and end >= first:
+                    solver.occupy((day, block), room_ids.get(key), lecturer_id)
+
+    assignments, unassigned = solver.solve(offerings)
+    return Timetable(assignments, unassigned, offerings, {room.id: room for room in rooms},
+                     time.perf_counter() - began)
+
+
+def apply_timetable(timetable):
+    """
+    Ghi lời giải vào CourseOffering.schedule / room và OfferingTimeSlot trong một transaction.
+    Lớp học phần không xếp được bị xóa lịch để lịch còn lại không có trùng.
+    """
+    ids = list(timetable.assignments) + list(timetable.unassigned)
+    offerings = CourseOffering.objects.in_bulk(ids)
+    changed, items = [], []
+    for offering_id, sessions in timetable.assignments.items():
+        offering = offerings[offering_id]
+        offering_slots = [TimeSlot(session.day, *block_periods(session.block)) for session in sessions]
+        offering.schedule = format_schedule(offering_slots)
+        # Mọi buổi cùng một phòng (TimetableSolver._place), nên khung giờ lấy phòng từ offering.room
+        offering.room = timetable.rooms[sessions[0].room_id].code
+        changed.append(offering)
+        items.append((offering, offering_slots))
+    for offering_id in timetable.unassigned:
+        offering = offerings[offering_id]
+        offering.schedule, offering.room = '', ''
+        changed.append(offering)
+        items.append((offering, []))
+
+    with transaction.atomic():
+        CourseOffering.objects.bulk_update(changed, ['schedule', 'room'], batch_size=500)
+        OfferingTimeSlot.sync(items)
+    return len(changed)
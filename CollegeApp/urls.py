@@ -13,8 +13,33 @@ r.register('creat_faculty_account', views.FacultyCreateAPIView, basename='creat_
 r.register('create-registrations', views.AdvisoryRegistrationCreateView, basename='create-registrations')
 r.register('view-registrations', views.AdvisoryRegistrationListView, basename='view-registrations')
 r.register('detail-registrations', views.AdvisoryRegistrationDetailView, basename='detail-registrations')
+r.register('course-graph', views.CourseGraphViewSet, basename='course-graph')
+r.register('curriculum', views.CurriculumViewSet, basename='curriculum')
+r.register('enrollments', views.EnrollmentViewSet, basename='enrollments')
+r.register('classes', views.ClassViewSet, basename='classes')
+r.register('student-directory', views.StudentDirectoryViewSet, basename='student-directory')
+r.register('catalog/departments', views.DepartmentCatalogViewSet, basename='catalog-departments')
+r.register('catalog/programs', views.ProgramCatalogViewSet, basename='catalog-programs')
+r.register('catalog/majors', views.MajorCatalogViewSet, basename='catalog-majors')
+r.register('catalog/courses', views.CourseCatalogViewSet, basename='catalog-courses')
+r.register('catalog/admission-requirements', views.AdmissionRequirementCatalogViewSet,
+           basename='catalog-admission-requirements')
+r.register('catalog/admission-methods', views.AdmissionMethodCatalogViewSet, basename='catalog-admission-methods')
+r.register('gallery/albums', views.AlbumGalleryViewSet, basename='gallery-albums')
 
 urlpatterns = [
     path('', include(r.urls)),
     path('auth/login/', LoginAPIView.as_view(), name='login'),
+    path('auth/change-password/', ChangePasswordAPIView.as_view({'put': 'update', 'patch': 'partial_update'}),
+         name='change-password'),
+    path('thumbnails/<str:variant>/<path:source>', ThumbnailAPIView.as_view(), name='thumbnail'),
+    path('users/search/', UserSearchAPIView.as_view(), name='user-search'),
+    path('schedule-conflicts/', ScheduleConflictAPIView.as_view(), name='schedule-conflicts'),
+    path('accounts/import/', AccountImportAPIView.as_view(), name='import-accounts'),
+    path('exports/students.<str:file_format>', StudentExportAPIView.as_view(), name='export-students'),
+    path('exports/registrations.<str:file_format>', AdvisoryRegistrationExportAPIView.as_view(),
+         name='export-registrations'),
+    path('analytics/standing/', StandingAnalyticsAPIView.as_view(), name='standing-analytics'),
+    path('metrics/password-hashing/', PasswordHashingStatsAPIView.as_view(), name='password-hashing-stats'),
+    path('metrics/token-cache/', TokenCacheStatsAPIView.as_view(), name='token-cache-stats'),
 ]
\ No newline at end of file
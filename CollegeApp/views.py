@@ -1,15 +1,39 @@
 # your_app_name/views.py
 
+import uuid
+
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.http import HttpResponseRedirect
+from drf_yasg.utils import swagger_auto_schema
+
 from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from django.contrib.auth.hashers import make_password, check_password  # Cần cho việc đổi mật khẩu
 from rest_framework.authtoken.models import Token  # Import cho Token Authentication
 
 # Import tất cả serializers và models bạn đã có
 from .serializers import *
 from .models import *  # Đảm bảo import các models cần thiết
+from .bulk_import import ACCOUNT_KINDS, AccountImporter, guess_format, iter_rows, open_text
+from .authentication import token_cache
+from .filters import AdvisoryRegistrationFilter, StudentFilter
+from .pagination import KeysetPagination
+from .hashing import get_hashing_service
+from .ingest import get_spool, known_major_ids, write_behind_enabled
+from .search import search_users
+from .curriculum import get_graph
+from . import enrollment as enrollment_service
+from .conflicts import describe_conflicts, find_conflicts, offering_conflicts
+from .schedule import ScheduleParseError, parse_schedule, room_key
+from .analytics import GROUPS, standing_by_group
+from . import classes as class_service
+from .catalog import CatalogCacheMixin
+from .thumbnails import get_thumbnail_service
+from .exports import FORMATS, REGISTRATION_COLUMNS, STUDENT_COLUMNS, export_response
 
 
 class StudentCreateAPIView(viewsets.ViewSet, generics.CreateAPIView):
@@ -29,6 +53,98 @@ class FacultyCreateAPIView(viewsets.ViewSet, generics.CreateAPIView):
     permission_classes = [IsAdminUser]  # Chỉ Admin mới được tạo tài khoản cán bộ
 
 
+class AccountImportAPIView(APIView):
+    """
+    API để Admin nhập hàng loạt tài khoản từ file CSV/JSONL (trường `file`).
+    Tham số: `kind` (student/faculty), `format` (csv/jsonl, mặc định đoán theo tên file),
+    `chunk_size`. Trả về số dòng đã tạo, lỗi theo từng dòng và tốc độ xử lý.
+    """
+    parser_classes = [MultiPartParser]
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        kind = request.data.get('kind')
+        if upload is None or kind not in ACCOUNT_KINDS:
+            return Response({"error": "Cần có file và kind (student/faculty)."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = request.data.get('format') or guess_format(upload.name)
+        if fmt not in ('csv', 'jsonl'):
+            return Response({"error": "format phải là csv hoặc jsonl."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            chunk_size = int(request.data.get('chunk_size', 500))
+        except ValueError:
+            return Response({"error": "chunk_size không hợp lệ."}, status=status.HTTP_400_BAD_REQUEST)
+
+        importer = AccountImporter(kind, chunk_size=chunk_size)
+        report = importer.run(iter_rows(open_text(upload.file), fmt))
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
+
+
+class PasswordHashingStatsAPIView(APIView):
+    """Số liệu của pool băm mật khẩu: hàng đợi và số mật khẩu băm mỗi giây."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_hashing_service().stats(), status=status.HTTP_200_OK)
+
+
+class TokenCacheStatsAPIView(APIView):
+    """Số liệu cache xác thực token: hit/miss, kích thước, số lần loại bỏ."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(token_cache.stats(), status=status.HTTP_200_OK)
+
+
+class ThumbnailAPIView(APIView):
+    """
+    Tạo thumbnail khi được gọi lần đầu (URL do thumbnails.thumbnail_url trả về khi
+    biến thể chưa có) rồi chuyển hướng tới file tĩnh theo khóa băm nội dung.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    generate_timeout = 30
+
+    def get(self, request, variant, source):
+        try:
+            url = get_thumbnail_service().generate(source, variant, timeout=self.generate_timeout)
+        except Exception:
+            # Ảnh hỏng / không đọc được hoặc pool quá tải: để client dùng ảnh gốc
+            url = None
+        if url is None:
+            return Response({"error": "Không tạo được ảnh thu nhỏ."}, status=status.HTTP_404_NOT_FOUND)
+        response = HttpResponseRedirect(url)
+        response['Cache-Control'] = 'public, max-age=3600'
+        return response
+
+
+class UserSearchAPIView(generics.ListAPIView):
+    """
+    API tìm người dùng theo họ tên, email, CCCD hoặc mã (không phân biệt dấu, khớp tiền tố,
+    gần đúng khi không có kết quả). Tham số: `q`, `role`, `limit` (mặc định 20, tối đa 100).
+    """
+    serializer_class = UserSearchResultSerializer
+    permission_classes = [IsAdminUser]
+    default_limit = 20
+    max_limit = 100
+
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = User.objects.select_related('student', 'faculty', 'admin')
+        if params.get('role'):
+            queryset = queryset.filter(role=params['role'])
+        if not params.get('q', '').strip():
+            return queryset.none()
+        try:
+            limit = int(params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+        return search_users(params['q'], queryset).order_by('last_name', 'first_name', 'id')[:limit]
+
+
 class LoginAPIView(APIView):
 
     def post(self, request, *args, **kwargs):
@@ -80,15 +196,425 @@ class ChangePasswordAPIView(viewsets.ViewSet, generics.UpdateAPIView):
 
 
 class AdvisoryRegistrationCreateView(viewsets.ViewSet,generics.CreateAPIView):
+    """
+    Đăng ký tư vấn công khai. Người gửi chỉ nhận lại mã biên nhận: đăng ký trùng bị
+    gộp vào bản cũ, nên trả lại bản ghi sẽ lộ thông tin của người khác. Khi bật
+    REGISTRATION_WRITE_BEHIND, đăng ký được ghi vào spool và trả về 202; dữ liệu
+    được INSERT theo lô sau đó.
+    """
     queryset = AdvisoryRegistration.objects.all()
     serializer_class = AdvisoryRegistrationSerializer
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if write_behind_enabled():
+            # Kiểm tra ngành theo tập id trong bộ nhớ, không truy vấn Major mỗi đăng ký
+            context['related_cache'] = {
+                'major_of_interest_id': {pk: Major(pk=pk) for pk in known_major_ids()},
+            }
+        return context
+
+    @swagger_auto_schema(responses={201: AdvisoryRegistrationReceiptSerializer,
+                                    202: AdvisoryRegistrationReceiptSerializer})
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if write_behind_enabled():
+            receipt, code = get_spool().append(serializer.validated_data), status.HTTP_202_ACCEPTED
+        else:
+            serializer.save()
+            receipt, code = serializer.receipt, status.HTTP_201_CREATED
+        response = AdvisoryRegistrationReceiptSerializer({
+            "message": "Đã nhận đăng ký tư vấn.",
+            "receipt": receipt,
+        })
+        return Response(response.data, status=code)
+
 
 class AdvisoryRegistrationListView(viewsets.ViewSet,generics.ListAPIView):
     queryset = AdvisoryRegistration.objects.all()
     serializer_class = AdvisoryRegistrationSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-registration_date', '-id')
+    filter_backends = [AdvisoryRegistrationFilter]
 
 
 class AdvisoryRegistrationDetailView(viewsets.ViewSet,generics.RetrieveUpdateDestroyAPIView):
     queryset = AdvisoryRegistration.objects.all()
     serializer_class = AdvisoryRegistrationSerializer
+
+
+class ExportAPIView(generics.GenericAPIView):
+    """
+    Xuất toàn bộ kết quả đã lọc ra file CSV/XLSX dạng luồng (exports.py), định dạng
+    lấy từ đuôi URL. Bộ lọc giống API danh sách tương ứng.
+    """
+    permission_classes = [IsAdminUser]
+    export_columns = ()
+    export_name = 'export'
+
+    def perform_content_negotiation(self, request, force=False):
+        # Accept: text/csv không được làm hỏng thương lượng của DRF
+        return super().perform_content_negotiation(request, force=True)
+
+    @swagger_auto_schema(responses={200: "File CSV hoặc XLSX (tải về dạng luồng)"})
+    def get(self, request, file_format):
+        if file_format not in FORMATS:
+            return Response({"detail": f"Định dạng hỗ trợ: {', '.join(FORMATS)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(queryset, self.export_columns, file_format, self.export_name)
+
+
+class StudentExportAPIView(ExportAPIView):
+    queryset = Student.objects.all()
+    filter_backends = [StudentFilter]
+    export_columns = STUDENT_COLUMNS
+    export_name = 'sinh-vien'
+
+
+class AdvisoryRegistrationExportAPIView(ExportAPIView):
+    queryset = AdvisoryRegistration.objects.all()
+    filter_backends = [AdvisoryRegistrationFilter]
+    export_columns = REGISTRATION_COLUMNS
+    export_name = 'dang-ky-tu-van'
+
+
+class CourseGraphViewSet(viewsets.ViewSet):
+    """
+    Quan hệ tiên quyết của một môn học, lấy từ đồ thị đã biên dịch (curriculum.py):
+    môn tiên quyết trực tiếp / tất cả, môn phụ thuộc trực tiếp / tất cả và độ sâu.
+    """
+
+    def retrieve(self, request, pk=None):
+        graph = get_graph()
+        try:
+            course_id = int(pk)
+        except (TypeError, ValueError):
+            course_id = None
+        if course_id not in graph:
+            return Response({"error": "Không tìm thấy môn học."}, status=status.HTTP_404_NOT_FOUND)
+
+        groups = {
+            'prerequisites': graph.prerequisites(course_id),
+            'all_prerequisites': graph.prerequisites(course_id, transitive=True),
+            'dependants': graph.dependants(course_id),
+            'all_dependants': graph.dependants(course_id, transitive=True),
+        }
+        ids = {course_id}.union(*groups.values())
+        courses = Course.objects.in_bulk(ids)
+        data = {
+            name: CourseBriefSerializer([courses[i] for i in group if i in courses], many=True).data
+            for name, group in groups.items()
+        }
+        data['course'] = CourseBriefSerializer(courses[course_id]).data if course_id in courses else None
+        data['depth'] = graph.depth_of(course_id)
+        return Response(data)
+
+
+class CurriculumViewSet(viewsets.ViewSet):
+    """
+    Lộ trình học của một ngành (pk là id ngành): các môn theo thứ tự tiên quyết,
+    kèm độ sâu (level) và các môn tiên quyết thuộc cùng ngành.
+    """
+
+    def retrieve(self, request, pk=None):
+        major = Major.objects.filter(pk=pk).first() if str(pk).isdigit() else None
+        if major is None:
+            return Response({"error": "Không tìm thấy ngành học."}, status=status.HTTP_404_NOT_FOUND)
+        plan = get_graph().curriculum(major.pk)
+        courses = Course.objects.in_bulk([course_id for course_id, _, _ in plan])
+        items = []
+        for course_id, level, prerequisites in plan:
+            if course_id in courses:
+                item = CourseBriefSerializer(courses[course_id]).data
+                item.update({'level': level, 'prerequisites': prerequisites})
+                items.append(item)
+        return Response({'major': MajorSerializer(major).data, 'courses': items})
+
+
+class EnrollmentViewSet(viewsets.ViewSet):
+    """
+    Đăng ký lớp học phần của sinh viên đang đăng nhập.
+    POST {offering} giữ chỗ (gửi kèm header Idempotency-Key để gửi lại an toàn):
+    201 khi đăng ký mới, 200 khi là yêu cầu đã xử lý, 409 khi lớp đã đủ.
+    DELETE /enrollments/<id>/ hủy đăng ký và trả lại chỗ.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def _student_id(self, request):
+        if not Student.objects.filter(pk=request.user.pk).exists():
+            return None
+        return request.user.pk
+
+    def list(self, request):
+        enrollments = (Enrollment.objects.filter(student_id=request.user.pk)
+                       .select_related('offering__course'))
+        return Response(EnrollmentSerializer(enrollments, many=True).data)
+
+    def create(self, request):
+        student_id = self._student_id(request)
+        if student_id is None:
+            return Response({"error": "Chỉ sinh viên mới được đăng ký lớp học phần."},
+                            status=status.HTTP_403_FORBIDDEN)
+        serializer = EnrollmentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        key = request.headers.get('Idempotency-Key') or request.data.get('idempotency_key')
+        if key:
+            try:
+                key = uuid.UUID(str(key))
+            except ValueError:
+                return Response({"error": "Idempotency-Key phải là UUID."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            enrollment, created = enrollment_service.enroll(
+                student_id, serializer.validated_data['offering'].pk, idempotency_key=key or None)
+        except enrollment_service.OfferingFull as exc:
+            return Response({"error": exc.message, "code": exc.code}, status=status.HTTP_409_CONFLICT)
+        except enrollment_service.EnrollmentError as exc:
+            return Response({"error": exc.message, "code": exc.code}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(EnrollmentSerializer(enrollment).data,
+                        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    def destroy(self, request, pk=None):
+        enrollment = Enrollment.objects.filter(pk=pk, student_id=request.user.pk).first() if str(pk).isdigit() else None
+        if enrollment is None:
+            return Response({"error": "Không tìm thấy đăng ký."}, status=status.HTTP_404_NOT_FOUND)
+        enrollment_service.drop(enrollment.student_id, enrollment.offering_id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ClassViewSet(viewsets.ModelViewSet):
+    """
+    Lớp sinh hoạt (chỉ quản trị viên). number_of_students do hệ thống tự duy trì.
+    - GET  /classes/<id>/students/: danh sách lớp, phân trang keyset theo mã sinh viên.
+    - POST /classes/<id>/add-students/ {students: [id...]}: xếp sinh viên vào lớp.
+    - POST /classes/<id>/remove-students/ {students: [id...]}: rút sinh viên khỏi lớp.
+    """
+    queryset = Class.objects.all().order_by('class_name')
+    serializer_class = ClassSerializer
+    permission_classes = [IsAdminUser]
+    keyset_ordering = ('student_code',)
+
+    @action(detail=True, methods=['get'])
+    def students(self, request, pk=None):
+        class_obj = self.get_object()
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(Student.objects.filter(student_class=class_obj), request, view=self)
+        return paginator.get_paginated_response(ClassRosterSerializer(page, many=True).data)
+
+    def _change_members(self, request, change):
+        class_obj = self.get_object()
+        serializer = ClassMembershipSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        changed = change(class_obj, serializer.validated_data['students'])
+        class_obj.refresh_from_db(fields=['number_of_students'])
+        return Response({'changed': changed, 'number_of_students': class_obj.number_of_students})
+
+    @action(detail=True, methods=['post'], url_path='add-students')
+    def add_students(self, request, pk=None):
+        return self._change_members(request, class_service.assign_students)
+
+    @action(detail=True, methods=['post'], url_path='remove-students')
+    def remove_students(self, request, pk=None):
+        return self._change_members(request, class_service.remove_students)
+
+
+class StudentDirectoryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Danh bạ sinh viên từ bảng đọc phẳng StudentDirectoryEntry (directory.py): mỗi
+    trang là một truy vấn trên một bảng, không JOIN.
+    Lọc: major, academic_year, department, student_class (id), status, q (tiền tố
+    mã sinh viên hoặc họ). Phân trang keyset theo mã sinh viên.
+    """
+    queryset = StudentDirectoryEntry.objects.all()
+    serializer_class = StudentDirectorySerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('student_code',)
+    id_filters = ('major', 'academic_year', 'department', 'student_class')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        for name in self.id_filters:
+            value = params.get(name)
+            if value is not None:
+                if not value.isdigit():
+                    return queryset.none()
+                queryset = queryset.filter(**{f'{name}_id': value})
+        if params.get('status'):
+            queryset = queryset.filter(student_status=params['status'])
+        query = params.get('q', '').strip()
+        if query:
+            queryset = queryset.filter(Q(student_code__startswith=query.upper()) | Q(last_name__startswith=query))
+        return queryset
+
+
+class ScheduleConflictAPIView(APIView):
+    """
+    Kiểm tra trùng lịch trong học kỳ.
+    - `offering`: trùng phòng/giảng viên của một lớp học phần đã có (kèm `student` để
+      kiểm tra với các lớp sinh viên đang học).
+    - hoặc `semester`, `schedule` (vd. "Thứ 2, Tiết 1-3"), `room`, `lecturer`, `student`
+      để kiểm tra một lịch dự kiến.
+    Sinh viên chỉ kiểm tra được lịch của chính mình.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        student_id = params.get('student')
+        if not request.user.is_staff:
+            student_id = request.user.pk
+        try:
+            student_id = int(student_id) if student_id else None
+            lecturer_id = int(params['lecturer']) if params.get('lecturer') else None
+        except ValueError:
+            return Response({"error": "student/lecturer phải là số."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if params.get('offering'):
+            offering = CourseOffering.objects.filter(pk=params['offering']).first() \
+                if params['offering'].isdigit() else None
+            if offering is None:
+                return Response({"error": "Không tìm thấy lớp học phần."}, status=status.HTTP_404_NOT_FOUND)
+            conflicts = offering_conflicts(offering, student_id=student_id)
+        else:
+            if not params.get('semester', '').isdigit():
+                return Response({"error": "Cần offering hoặc semester."}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                slots = parse_schedule(params.get('schedule', ''))
+            except ScheduleParseError as exc:
+                return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            conflicts = find_conflicts(int(params['semester']), slots, room_key=room_key(params.get('room')),
+                                       lecturer_id=lecturer_id, student_id=student_id)
+
+        return Response({
+            'has_conflicts': bool(conflicts),
+            'conflicts': [
+                {'reason': conflict.reason, 'offering': conflict.slot.offering_id,
+                 'class_code': conflict.slot.offering.class_code, 'day': conflict.slot.day,
+                 'start_period': conflict.slot.start_period, 'end_period': conflict.slot.end_period}
+                for conflict in conflicts
+            ],
+            'messages': describe_conflicts(conflicts),
+        })
+
+
+class StandingAnalyticsAPIView(APIView):
+    """
+    Thống kê học lực theo nhóm: `group_by` (major, academic_year, department),
+    `status` (tình trạng sinh viên, nhiều giá trị cách nhau bởi dấu phẩy).
+    Kết quả được cache vài phút.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        group_by = request.query_params.get('group_by', 'major')
+        if group_by not in GROUPS:
+            return Response({"error": f"group_by phải là một trong: {', '.join(GROUPS)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        statuses = [v for v in request.query_params.get('status', '').split(',') if v]
+        allowed = {key for key, _ in Student.STUDENT_STATUS_CHOICES}
+        if any(value not in allowed for value in statuses):
+            return Response({"error": "status không hợp lệ."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(standing_by_group(group_by, statuses or None))
+
+
+# -- Danh mục công khai: chỉ đọc, ETag/304 và cache theo số thế hệ (catalog.py) ------
+
+class CatalogViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
+    # Công khai và giống nhau cho mọi người: không cần xác thực token
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    pagination_class = None
+    filter_fields = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        for name in self.filter_fields:
+            value = self.request.query_params.get(name)
+            if value is not None:
+                if not value.isdigit():
+                    return queryset.none()
+                queryset = queryset.filter(**{name: value})
+        return queryset
+
+
+class DepartmentCatalogViewSet(CatalogViewSet):
+    queryset = Department.objects.all()
+    serializer_class = DepartmentCatalogSerializer
+
+
+class ProgramCatalogViewSet(CatalogViewSet):
+    queryset = Program.objects.all()
+    serializer_class = ProgramCatalogSerializer
+
+
+class MajorCatalogViewSet(CatalogViewSet):
+    queryset = Major.objects.all()
+    serializer_class = MajorCatalogSerializer
+    filter_fields = ('department', 'program')
+
+
+class CourseCatalogViewSet(CatalogViewSet):
+    """Môn học kèm id môn tiên quyết và ngành; lọc theo ?major= / ?department=."""
+    queryset = Course.objects.prefetch_related('prerequisites', 'major')
+    serializer_class = CourseCatalogSerializer
+    filter_fields = ('major', 'department')
+
+    def get_queryset(self):
+        # Lọc theo M2M major có thể nhân bản dòng
+        return super().get_queryset().distinct()
+
+
+class AdmissionRequirementCatalogViewSet(CatalogViewSet):
+    queryset = AdmissionRequirement.objects.all()
+    serializer_class = AdmissionRequirementCatalogSerializer
+
+
+class AdmissionMethodCatalogViewSet(CatalogViewSet):
+    queryset = AdmissionMethod.objects.filter(is_active=True)
+    serializer_class = AdmissionMethodCatalogSerializer
+
+
+# -- Thư viện ảnh: album của ngành, ảnh của album ------------------------------------
+
+class AlbumGalleryViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    - GET /gallery/albums/?major=<id>: album (của một ngành), mới nhất trước.
+    - GET /gallery/albums/<id>/images/: ảnh của album theo uploaded_at giảm dần.
+    Cả hai phân trang keyset, số truy vấn không phụ thuộc kích thước album, và có
+    ETag/Last-Modified theo số thế hệ của Album/Image (catalog.py).
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    serializer_class = AlbumSerializer
+    pagination_class = KeysetPagination
+    catalog_models = (Album, Image, Major)
+
+    @property
+    def keyset_ordering(self):
+        return ('-uploaded_at', '-id') if self.action == 'images' else ('-created_at', '-id')
+
+    def get_queryset(self):
+        cover = (Image.objects.filter(albums=OuterRef('pk')).order_by('-uploaded_at', '-id')
+                 .values('image_file')[:1])
+        queryset = Album.objects.annotate(
+            image_count=Count('images', distinct=True), cover_file=Subquery(cover))
+        major = self.request.query_params.get('major')
+        if major is not None and self.action == 'list':
+            queryset = queryset.filter(major=major) if major.isdigit() else queryset.none()
+        return queryset
+
+    @action(detail=True, methods=['get'])
+    def images(self, request, pk=None):
+        return self.cached_response(lambda: self._images(request))
+
+    def _images(self, request):
+        album = self.get_object()
+        images = Image.objects.filter(albums=album).prefetch_related(
+            Prefetch('albums', queryset=Album.objects.only('pk')))
+        page = self.paginate_queryset(images)
+        return self.get_paginated_response(
+            GalleryImageSerializer(page, many=True, context=self.get_serializer_context()).data)